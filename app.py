@@ -2,7 +2,9 @@
 マイソク物確自動化アプリ - Flask版（超軽量）
 Vercel用の軽量Webアプリ
 """
-from flask import Flask, request, render_template_string, jsonify
+from flask import Flask, Response, abort, request, render_template_string, jsonify
+import io
+import json
 import time
 import sys
 import os
@@ -11,6 +13,11 @@ from pathlib import Path
 # srcディレクトリをパスに追加
 sys.path.append(str(Path(__file__).parent / "src"))
 
+from src.job_manager import JobManager
+from src.site_search import run_site_searches
+from src.batch_processor import BatchLimitError, BatchProcessor, expand_batch_uploads
+from config.settings import BATCH_CONFIG
+
 try:
     from src.simple_pdf_analyzer import SimplePDFAnalyzer, PropertyData
     from src.real_browser_checker import RealBrowserPropertyChecker
@@ -36,6 +43,9 @@ except ImportError as e:
             self.age = data.get('age', '')
     
     class RealBrowserPropertyChecker:
+        def __init__(self, force_refresh=False):
+            self.property_data = None
+        
         def perform_bukkaku(self, property_data):
             return {
                 'total': 3,
@@ -49,10 +59,25 @@ except ImportError as e:
             }
 
 app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB制限
+UPLOAD_LIMIT = 50 * 1024 * 1024  # 50MB制限
+BATCH_UPLOAD_LIMIT = BATCH_CONFIG["max_total_mb"] * 1024 * 1024  # 一括物確（/api/batch）のみ合計サイズの上限まで許可
+app.config['MAX_CONTENT_LENGTH'] = max(UPLOAD_LIMIT, BATCH_UPLOAD_LIMIT)
+
+@app.before_request
+def limit_upload_size():
+    """リクエストサイズの上限を適用（一括物確以外は50MBまで）"""
+    limit = BATCH_UPLOAD_LIMIT if request.path == '/api/batch' else UPLOAD_LIMIT
+    if request.content_length is not None and request.content_length > limit:
+        abort(413)
+
+# 物確ジョブ実行用（WSGIワーカーを占有せずにバックグラウンドで4ステップを実行）
+job_manager = JobManager()
 
 @app.errorhandler(413)
 def too_large(e):
+    if request.path.startswith('/api/'):
+        limit_mb = (BATCH_UPLOAD_LIMIT if request.path == '/api/batch' else UPLOAD_LIMIT) // (1024 * 1024)
+        return jsonify({"error": f"ファイルが大きすぎます。合計{limit_mb}MB以下にしてください。"}), 413
     return render_template_string(HTML_TEMPLATE, error="ファイルが大きすぎます。50MB以下のPDFファイルを選択してください。"), 413
 
 @app.errorhandler(500)
@@ -585,6 +610,19 @@ HTML_TEMPLATE = """
             font-size: 0.9rem;
         }
         
+        .cached-at {
+            margin-top: 4px;
+            color: var(--color-muted);
+            font-size: 0.8rem;
+        }
+        
+        .refresh-option {
+            display: block;
+            margin-bottom: 15px;
+            color: var(--color-muted);
+            font-size: 0.9rem;
+        }
+        
         .final-verdict {
             background: rgba(255,255,255,0.9);
             border-radius: 16px;
@@ -676,6 +714,11 @@ HTML_TEMPLATE = """
                     </label>
                 </div>
                 
+                <label class="refresh-option">
+                    <input type="checkbox" name="force_refresh" value="1">
+                    保存済みの確認結果を使わずに再確認する
+                </label>
+                
                 <button type="submit" class="start-btn" id="startBtn">
                     🔍 物確実行
                 </button>
@@ -762,6 +805,9 @@ HTML_TEMPLATE = """
                         信頼度: {{ "%.1f"|format(results.itandi.confidence * 100) }}%
                     </div>
                     {% endif %}
+                    {% if results.itandi.cached_at %}
+                    <div class="cached-at">💾 {{ results.itandi.cached_at }} の確認結果</div>
+                    {% endif %}
                 </div>
                 
                 <div class="site-card {{ 'found' if results.ierabu.found else 'not-found' }}">
@@ -790,6 +836,9 @@ HTML_TEMPLATE = """
                         信頼度: {{ "%.1f"|format(results.suumo.confidence * 100) }}%
                     </div>
                     {% endif %}
+                    {% if results.suumo.cached_at %}
+                    <div class="cached-at">💾 {{ results.suumo.cached_at }} の確認結果</div>
+                    {% endif %}
                 </div>
             </div>
             
@@ -963,46 +1012,17 @@ def index():
 def upload_pdf():
     """4ステップ物確システム"""
     try:
-        # システム状態の確認
-        if not PDF_ANALYZER_AVAILABLE:
-            return render_template_string(HTML_TEMPLATE, error="PDF解析機能が利用できません。管理者にお問い合わせください。")
-        
-        # ファイル検証
-        if 'pdf_file' not in request.files:
-            return render_template_string(HTML_TEMPLATE, error="PDFファイルが選択されていません。")
-        
-        file = request.files['pdf_file']
-        if not file or file.filename == '' or not file.filename.lower().endswith('.pdf'):
-            return render_template_string(HTML_TEMPLATE, error="有効なPDFファイルを選択してください。")
+        file, error = validate_pdf_upload()
+        if error:
+            return render_template_string(HTML_TEMPLATE, error=error)
         
         print(f"📁 ファイル受信: {file.filename}")
         
-        # Step 1: マイソクPDF解析と物件情報抽出
-        print("📋 Step 1: マイソク解析開始...")
-        step1_result = perform_step1_extraction(file)
-        if not step1_result['success']:
-            return render_template_string(HTML_TEMPLATE, error=step1_result['error'])
-        
-        property_data = step1_result['property_data']
-        property_obj = step1_result['property_obj']
-        
-        # Step 2: ATBB検索
-        print("🌐 Step 2: ATBB検索開始...")
-        step2_result = perform_step2_atbb_search(property_data)
-        
-        # Step 3: ITANDI検索
-        print("🌐 Step 3: ITANDI検索開始...")
-        step3_result = perform_step3_itandi_search(property_data)
-        
-        # Step 4: 電話確認準備
-        print("📞 Step 4: 電話確認準備...")
-        step4_result = perform_step4_phone_preparation(property_data, step2_result, step3_result)
+        outcome = run_bukkatsu_steps(file, force_refresh=is_force_refresh())
+        if not outcome['success']:
+            return render_template_string(HTML_TEMPLATE, error=outcome['error'])
         
-        # 総合結果をまとめる
-        results = compile_final_results(property_obj, step2_result, step3_result, step4_result)
-        
-        print("✅ 4ステップ物確完了")
-        return render_template_string(HTML_TEMPLATE, results=results)
+        return render_template_string(HTML_TEMPLATE, results=outcome['results'])
         
     except Exception as e:
         print(f"❌ システムエラー: {str(e)}")
@@ -1010,6 +1030,175 @@ def upload_pdf():
         traceback.print_exc()
         return render_template_string(HTML_TEMPLATE, error=f"予期しないエラーが発生しました: {str(e)}")
 
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """4ステップ物確をバックグラウンドジョブとして登録し、ジョブIDを即座に返す"""
+    file, error = validate_pdf_upload()
+    if error:
+        return jsonify({"error": error}), 400
+    
+    # リクエスト終了後も読めるよう、アップロード内容をメモリに移す
+    upload = io.BytesIO(file.read())
+    upload.filename = file.filename
+    
+    job_id = job_manager.submit(run_bukkatsu_job, upload, is_force_refresh())
+    print(f"📥 ジョブ登録: {job_id} ({file.filename})")
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/jobs/{job_id}"
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """ジョブの状態と途中結果を返す"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "ジョブが見つかりません"}), 404
+    return jsonify(job)
+
+@app.route('/api/batch', methods=['POST'])
+def create_batch():
+    """
+    複数PDF（pdf_files に複数指定、またはPDFをまとめたzip）の一括物確
+    
+    進捗は1行1イベントのJSON（application/x-ndjson）で順次返す。
+    mode=job を指定した場合はバックグラウンドジョブとして登録し、ジョブIDを返す
+    """
+    if not PDF_ANALYZER_AVAILABLE:
+        return jsonify({"error": "PDF解析機能が利用できません。管理者にお問い合わせください。"}), 400
+    
+    uploads = [
+        (file.filename, file.read())
+        for file in request.files.getlist('pdf_files') + request.files.getlist('pdf_file')
+        if file and file.filename
+    ]
+    try:
+        pdfs, skipped = expand_batch_uploads(uploads)
+    except BatchLimitError as e:
+        return jsonify({"error": str(e)}), 400
+    if not pdfs:
+        return jsonify({"error": "有効なPDFファイルがありません。", "skipped": skipped}), 400
+    
+    force_refresh = is_force_refresh()
+    print(f"📥 一括物確: PDF {len(pdfs)}件（除外 {len(skipped)}件）")
+    
+    if request.form.get('mode', request.args.get('mode')) == 'job':
+        job_id = job_manager.submit(run_batch_job, pdfs, force_refresh)
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "files": len(pdfs),
+            "skipped": skipped,
+            "status_url": f"/api/jobs/{job_id}"
+        }), 202
+    
+    def generate():
+        yield json.dumps({"event": "accepted", "files": len(pdfs), "skipped": skipped}, ensure_ascii=False) + "\n"
+        for event in iter_batch_events(pdfs, force_refresh):
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+def validate_pdf_upload():
+    """アップロードされたPDFを検証し、(ファイル, エラーメッセージ)を返す"""
+    # システム状態の確認
+    if not PDF_ANALYZER_AVAILABLE:
+        return None, "PDF解析機能が利用できません。管理者にお問い合わせください。"
+    
+    # ファイル検証
+    if 'pdf_file' not in request.files:
+        return None, "PDFファイルが選択されていません。"
+    
+    file = request.files['pdf_file']
+    if not file or file.filename == '' or not file.filename.lower().endswith('.pdf'):
+        return None, "有効なPDFファイルを選択してください。"
+    
+    return file, None
+
+def is_force_refresh():
+    """保存済みの確認結果を使わず再確認するか（フォームの force_refresh）"""
+    return request.form.get('force_refresh', '').lower() in ('1', 'true', 'on', 'yes')
+
+def run_bukkatsu_steps(file, report=None, force_refresh=False):
+    """
+    4ステップ物確を実行
+    
+    Args:
+        file: PDFファイル（read/seek可能なオブジェクト）
+        report: 各ステップ完了時に report(ステップ名, 結果) で呼ばれるコールバック
+        force_refresh: Trueなら保存済みの確認結果を使わずサイトを再確認
+        
+    Returns:
+        dict: success と results（成功時）または error（失敗時）
+    """
+    report = report or (lambda step, result: None)
+    
+    # Step 1: マイソクPDF解析と物件情報抽出
+    print("📋 Step 1: マイソク解析開始...")
+    step1_result = perform_step1_extraction(file)
+    if not step1_result['success']:
+        return {'success': False, 'error': step1_result['error']}
+    
+    property_data = step1_result['property_data']
+    property_obj = step1_result['property_obj']
+    report('step1_extraction', property_data)
+    
+    # Step 2・3: ATBB・ITANDI検索（独立したサイトなので並列実行）
+    print("🌐 Step 2・3: ATBB・ITANDI検索開始...")
+    site_results = run_site_searches({
+        'ATBB': lambda: perform_step2_atbb_search(property_data, force_refresh),
+        'ITANDI': lambda: perform_step3_itandi_search(property_data, force_refresh),
+    })
+    step2_result = site_results['ATBB']
+    step3_result = site_results['ITANDI']
+    report('step2_atbb', step2_result)
+    report('step3_itandi', step3_result)
+    
+    # Step 4: 電話確認準備
+    print("📞 Step 4: 電話確認準備...")
+    step4_result = perform_step4_phone_preparation(property_data, step2_result, step3_result)
+    report('step4_phone', step4_result)
+    
+    # 総合結果をまとめる
+    results = compile_final_results(property_obj, step2_result, step3_result, step4_result)
+    
+    print("✅ 4ステップ物確完了")
+    return {'success': True, 'results': results}
+
+def run_bukkatsu_job(report, file, force_refresh=False):
+    """ジョブ用の4ステップ物確（結果はJSONで返せる形に変換）"""
+    outcome = run_bukkatsu_steps(file, report, force_refresh)
+    if not outcome['success']:
+        raise Exception(outcome['error'])
+    
+    results = dict(outcome['results'])
+    results['property'] = vars(results['property'])
+    return results
+
+def iter_batch_events(pdfs, force_refresh=False):
+    """一括物確の進捗イベントを返すジェネレーター（物確はATBB・ITANDIを並列検索）"""
+    def check_property(property_data):
+        return run_site_searches({
+            'ATBB': lambda: perform_step2_atbb_search(property_data, force_refresh),
+            'ITANDI': lambda: perform_step3_itandi_search(property_data, force_refresh),
+        })
+    
+    return BatchProcessor(check_property).run(pdfs)
+
+def run_batch_job(report, pdfs, force_refresh=False):
+    """ジョブ用の一括物確（抽出・物確の完了ごとに途中結果を記録）"""
+    checked = []
+    for event in iter_batch_events(pdfs, force_refresh):
+        if event['event'] == 'extracted':
+            report(f"extracted:{event['file']}", event)
+        elif event['event'] == 'checked':
+            report(f"checked:{event['fingerprint']}", event)
+            checked.append(event)
+        else:
+            return {'summary': event['summary'], 'properties': checked}
+
 def perform_step1_extraction(file):
     """Step 1: マイソク物件情報抽出"""
     try:
@@ -1045,12 +1234,12 @@ def perform_step1_extraction(file):
             'error': f"Step 1エラー: {str(e)}"
         }
 
-def perform_step2_atbb_search(property_data):
-    """Step 2: ATBB検索実行"""
+def perform_step2_atbb_search(property_data, force_refresh=False):
+    """Step 2: ATBB検索実行（有効期間内の確認結果があれば再利用）"""
     try:
-        browser_checker = RealBrowserPropertyChecker()
+        browser_checker = RealBrowserPropertyChecker(force_refresh=force_refresh)
         browser_checker.property_data = property_data
-        result = browser_checker._check_atbb_real()
+        result = browser_checker.check_site('ATBB')
         
         print(f"✅ Step 2完了 - ATBB: {'発見' if result['found'] else '未発見'}")
         return result
@@ -1064,12 +1253,12 @@ def perform_step2_atbb_search(property_data):
             'notes': 'ATBB検索でエラーが発生しました'
         }
 
-def perform_step3_itandi_search(property_data):
-    """Step 3: ITANDI検索実行"""
+def perform_step3_itandi_search(property_data, force_refresh=False):
+    """Step 3: ITANDI検索実行（有効期間内の確認結果があれば再利用）"""
     try:
-        browser_checker = RealBrowserPropertyChecker()
+        browser_checker = RealBrowserPropertyChecker(force_refresh=force_refresh)
         browser_checker.property_data = property_data
-        result = browser_checker._check_itandi_real()
+        result = browser_checker.check_site('ITANDI')
         
         print(f"✅ Step 3完了 - ITANDI: {'発見' if result['found'] else '未発見'}")
         return result
@@ -7,6 +7,8 @@ import random
 import hashlib
 import re
 
+from src.site_search import run_site_searches, search_cancelled
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB
 
@@ -64,6 +66,9 @@ def extract_property_from_text(text):
 
 def simulate_site_search(site_name, property_data):
     """サイト検索のシミュレーション（改良版）"""
+    if search_cancelled():
+        return {'found': False, 'confidence': 0.0, 'notes': f'{site_name}検索は打ち切られました'}
+    
     # 住所の詳細度による発見率
     address = property_data.get('address', '')
     rent = property_data.get('rent', '')
@@ -325,13 +330,14 @@ def upload_pdf():
         property_obj = step1_result['property_obj']
         print(f"✅ Step 1成功: 物件情報抽出完了")
         
-        # Step 2: ATBB検索
-        print("🌐 Step 2: ATBB検索開始...")
-        step2_result = perform_step2_atbb_search(property_data)
-        
-        # Step 3: ITANDI検索
-        print("🌐 Step 3: ITANDI検索開始...")
-        step3_result = perform_step3_itandi_search(property_data)
+        # Step 2・3: ATBB・ITANDI検索（並列実行）
+        print("🌐 Step 2・3: ATBB・ITANDI検索開始...")
+        site_results = run_site_searches({
+            'ATBB': lambda: perform_step2_atbb_search(property_data),
+            'ITANDI': lambda: perform_step3_itandi_search(property_data),
+        })
+        step2_result = site_results['ATBB']
+        step3_result = site_results['ITANDI']
         
         # Step 4: 電話確認準備
         print("📞 Step 4: 電話確認準備...")
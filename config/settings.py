@@ -12,6 +12,7 @@ DATA_DIR = BASE_DIR / "data"
 UPLOAD_DIR = DATA_DIR / "uploads"
 EXTRACTED_DIR = DATA_DIR / "extracted"
 REPORTS_DIR = DATA_DIR / "reports"
+CACHE_DIR = DATA_DIR / "cache"
 
 # Streamlit設定
 STREAMLIT_CONFIG = {
@@ -25,18 +26,105 @@ STREAMLIT_CONFIG = {
 PDF_CONFIG = {
     "max_file_size": 50 * 1024 * 1024,  # 50MB
     "allowed_extensions": [".pdf"],
-    "extract_images": False
+    "extract_images": False,
+    "max_workers": os.cpu_count() or 1,  # 複数PDF解析のワーカープロセス数（1で逐次処理）
+    "pages_per_task": 10,  # 大きなPDFをワーカーに分割する際の1タスクあたりのページ数
+    "process_start_method": "spawn",  # ワーカープロセスの起動方式（スレッド実行中のWebプロセスをforkするとロックを引き継いでデッドロックするため）
+    "stop_when_complete": False,  # 単一物件解析で全項目が揃ったら残りのページを読まない（後続ページの項目は使われない）
+    "extraction_mode": "text",  # "text": 平文テキストを正規表現で解析 / "layout": 単語座標・表から項目と値を対応付け
+    "layout_page_cache_size": 1024,  # レイアウト解析結果を保持するページ数
+    "block_workers": 1  # 複数物件PDFの物件ブロック抽出のワーカープロセス数（1で逐次処理）
+}
+
+# PDF抽出キャッシュ設定
+EXTRACTION_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": CACHE_DIR / "extraction",
+    "max_size_mb": 256  # 超過時は最終アクセスの古いエントリから削除
 }
 
 # 物確設定
 BUKKATSU_CONFIG = {
     "timeout_seconds": 30,
     "retry_count": 3,
-    "wait_time": 2,
+    "concurrent_pages": 4,  # 1サイトで同時に開く検索タブ数（1で逐次検索）
+    "request_burst": 2,  # 連続して送れる検索リクエスト数の上限
+    "cloud_max_concurrency": 16,  # クラウド版物確で同時に実行する検索数（全サイト合計）
+    "cloud_site_concurrency": 4,  # クラウド版物確で1サイトに同時に実行する検索数
+    "pacing": {  # サイトごとの検索リクエスト数（件/秒）の自動調整
+        "max_rate": 2.0,  # 開始時・回復時の上限
+        "min_rate": 0.1,  # 減速時の下限
+        "throttle_backoff": 0.5,  # HTTP 429・CAPTCHA検知時に掛ける係数
+        "latency_backoff": 0.8,  # 応答時間の悪化検知時に掛ける係数
+        "latency_factor": 2.0,  # 平均応答時間のこの倍を超えたら悪化とみなす
+        "recovery_step": 0.1  # 正常応答ごとに戻す量
+    },
     "headless": True,  # ブラウザをヘッドレスモードで実行
     "sites_order": ["itandi", "ierabu"]  # 物確実行順序
 }
 
+# 物確結果キャッシュ設定（同じ物件・サイトの確認結果を有効期間内は再利用）
+RESULT_CACHE_CONFIG = {
+    "enabled": True,
+    "db_path": CACHE_DIR / "site_results.sqlite3",
+    "ttl_seconds": {  # サイトごとの有効期間（秒）
+        "ITANDI": 30 * 60,
+        "いえらぶBB": 30 * 60,
+        "ATBB": 60 * 60,
+        "default": 30 * 60
+    }
+}
+
+# ITANDI HTTP検索設定（検索画面が呼び出すJSON APIを直接利用）
+# エンドポイント・キー名はサイト側の変更に合わせ、ブラウザの通信内容から確認して更新すること
+ITANDI_API_CONFIG = {
+    "site_url": "https://itandibb.com",
+    "search_endpoint": "https://itandibb.com/api/search",
+    "keyword_param": "keyword",
+    "items_key": "rooms",  # 物件リストのキー
+    "total_key": "total_count",  # 検索件数のキー
+    "url_key": "url",
+    "rent_key": "rent",
+    "status_key": "status",
+    "timeout_seconds": 10,
+    "pool_size": 8,  # 接続プールの最大接続数
+    "concurrency": 8  # 同時に実行する検索数
+}
+
+# ログインセッション保存設定
+SESSION_CONFIG = {
+    "enabled": True,
+    "session_dir": DATA_DIR / "sessions",
+    "max_age_seconds": 12 * 3600,  # 保存から一定時間経過したセッションは再ログイン
+    "probe_timeout": 10000  # セッション有効確認のタイムアウト（ミリ秒）
+}
+
+# セレクタ解決キャッシュ設定
+SELECTOR_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_file": CACHE_DIR / "selectors.json"  # サイトごとに前回成功したセレクタを保存
+}
+
+# 住所正規化設定
+ADDRESS_CONFIG = {
+    "cache_size": 8192,  # 正規化結果を保持する住所数（LRU）
+    "gazetteer_path": BASE_DIR / "config" / "gazetteer.tsv"  # 都道府県・市区町村の住所辞書
+}
+
+# 一括物確設定（/api/batch）
+BATCH_CONFIG = {
+    "max_files": 500,  # 1リクエストで受け付けるPDF数（zip展開後）
+    "max_total_mb": 500,  # 1リクエストで受け付けるPDFの合計サイズ（zip展開後）
+    "extract_workers": os.cpu_count() or 1,  # PDF抽出のワーカープロセス数（1でスレッド1本）
+    "check_concurrency": 4  # 同時に物確する物件数
+}
+
+# バックグラウンドジョブ設定
+JOB_CONFIG = {
+    "max_workers": 4,  # 同時に実行する物確ジョブ数
+    "retention_seconds": 3600  # 完了したジョブの結果を保持する時間
+}
+
 # ログ設定
 LOG_CONFIG = {
     "level": "INFO",
@@ -48,6 +136,22 @@ LOG_CONFIG = {
 PLAYWRIGHT_CONFIG = {
     "browser_type": "chromium",
     "headless": True,
-    "slow_mo": 1000,  # アクション間の待機時間（ミリ秒）
-    "timeout": 30000   # タイムアウト（ミリ秒）
+    "slow_mo": 0,  # アクション間の待機時間（ミリ秒、デバッグ時のみ設定。間隔は物確設定の pacing で調整）
+    "timeout": 30000,   # タイムアウト（ミリ秒）
+    "max_pages_per_browser": 200,  # ブラウザプールでこのページ数を開いたらブラウザを入れ替える
+    "resource_blocking": {  # 物確ではテキストのみ使うため、不要なリソースの読み込みを遮断
+        "enabled": True,
+        "blocked_resource_types": ["image", "media", "font"],
+        "blocked_domains": [
+            "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+            "googlesyndication.com", "facebook.net", "hotjar.com", "clarity.ms"
+        ],
+        "allowed_domains": [],  # 種別・ドメインに関わらず常に許可するドメイン
+        "estimated_sizes": {  # 削減バイト数の推定に使う種別ごとの平均サイズ
+            "image": 60 * 1024,
+            "media": 500 * 1024,
+            "font": 40 * 1024,
+            "script": 30 * 1024
+        }
+    }
 }
\ No newline at end of file
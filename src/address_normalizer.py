@@ -0,0 +1,137 @@
+"""
+住所正規化モジュール
+住所を (都道府県, 市区町村, 町域, 丁目, 番地) に分解した正規形に変換し、結果をLRUキャッシュで再利用
+（同じ住所が何度もアップロードされるため、正規表現・文字変換は住所ごとに1回だけ実行）
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
+from config.settings import ADDRESS_CONFIG
+from src.gazetteer import load_gazetteer
+
+# 括弧書き（建物名・補足）と、対になっていない括弧以降
+BRACKET_PATTERN = re.compile(r"（[^）]*）|\([^)]*\)|「[^」]*」|【[^】]*】|[（(「【].*")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# 番地と部屋番号の間の空白（「3-5 101」）。番地の終わりとして残す
+ROOM_SEPARATOR_PATTERN = re.compile(r"(?<=\d)\s+(?=\d)")
+# 数字の後のハイフン類（長音記号・マイナス記号など）
+HYPHEN_PATTERN = re.compile(r"(?<=\d)[ー−‐‑–—―ｰ-](?=\d)")
+KANJI_DIGITS = {"〇": 0, "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+KANJI_CHOME_PATTERN = re.compile(r"([一二三四五六七八九十]+)(?=丁目)")
+
+# 住所辞書にない市区町村の推定（郡部の町村、政令市の区を含む）
+CITY_PATTERN = re.compile(r"^((?:[^\d]+?郡)?[^\d]+?[市区町村](?:[^\d]+?区)?)")
+# 町域（最初の数字まで）・丁目・番地（「1番1号」「1番地1」「1-1」）
+TOWN_PATTERN = re.compile(r"^(\D*)")
+CHOME_PATTERN = re.compile(r"^(\d+)丁目")
+BANCHI_PATTERN = re.compile(r"^\d+(?:(?:番地?|号|-)\d+)*")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+
+class CanonicalAddress(NamedTuple):
+    """住所の正規形（該当部分がなければ空文字）"""
+    prefecture: str
+    city: str
+    town: str
+    chome: str
+    banchi: str
+
+    @property
+    def text(self) -> str:
+        """比較・検索用の正規化済み住所文字列（例：東京都新宿区西新宿1-1-1）"""
+        numbers = "-".join(part for part in (self.chome, self.banchi) if part)
+        return f"{self.prefecture}{self.city}{self.town}{numbers}"
+
+
+def _kanji_to_number(kanji: str) -> str:
+    """丁目の漢数字（一〜九十九）を算用数字に変換"""
+    if "十" not in kanji:
+        return "".join(str(KANJI_DIGITS[char]) for char in kanji)
+    tens, _, ones = kanji.partition("十")
+    return str((KANJI_DIGITS[tens] if tens else 1) * 10 + (KANJI_DIGITS[ones] if ones else 0))
+
+
+def _clean(address: str) -> str:
+    """全角→半角・括弧書きと空白の除去・ハイフン類と丁目の漢数字の統一"""
+    address = unicodedata.normalize("NFKC", address)
+    address = BRACKET_PATTERN.sub("", address)
+    address = ROOM_SEPARATOR_PATTERN.sub("/", address)
+    address = WHITESPACE_PATTERN.sub("", address)
+    address = HYPHEN_PATTERN.sub("-", address)
+    return KANJI_CHOME_PATTERN.sub(lambda match: _kanji_to_number(match.group(1)), address)
+
+
+def parse_address(address: str) -> CanonicalAddress:
+    """住所を正規形に変換（キャッシュなし）"""
+    rest = _clean(address or "")
+    gazetteer = load_gazetteer()
+
+    # 都道府県・市区町村は住所辞書の最長一致（辞書にない市区町村のみ表記から推定）
+    prefecture, length = gazetteer.match_prefecture(rest)
+    rest = rest[length:]
+
+    city, length = gazetteer.match_city(rest, prefecture=prefecture)
+    if not city:
+        match = CITY_PATTERN.match(rest)
+        if match:
+            city, length = match.group(1), match.end()
+    rest = rest[length:]
+
+    town = TOWN_PATTERN.match(rest).group(1)
+    rest = rest[len(town):]
+
+    chome = ""
+    match = CHOME_PATTERN.match(rest)
+    if match:
+        chome = match.group(1)
+        rest = rest[match.end():]
+
+    # 番地以降（建物名・部屋番号）は含めない。丁目の表記がなければ「1-2-3」の先頭を丁目とみなす
+    match = BANCHI_PATTERN.match(rest)
+    parts = DIGITS_PATTERN.findall(match.group(0)) if match else []
+    if not chome and len(parts) >= 2:
+        chome, parts = parts[0], parts[1:]
+    return CanonicalAddress(prefecture, city, town, chome, "-".join(parts))
+
+
+class AddressNormalizer:
+    """住所正規化（結果を件数上限つきのLRUキャッシュに保持）"""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = cache_size if cache_size is not None else ADDRESS_CONFIG["cache_size"]
+        self._canonicalize = lru_cache(maxsize=self.cache_size)(parse_address)
+
+    def canonicalize(self, address: str) -> CanonicalAddress:
+        """住所を正規形に変換（同じ住所はキャッシュから返す）"""
+        return self._canonicalize(address or "")
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュのヒット・ミス件数"""
+        info = self._canonicalize.cache_info()
+        total = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hit_rate": info.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """キャッシュを消去"""
+        self._canonicalize.cache_clear()
+
+
+# プロセス内で共有する既定のインスタンス
+_default_normalizer = AddressNormalizer()
+
+
+def canonicalize_address(address: str) -> CanonicalAddress:
+    """住所を正規形に変換（プロセス内共有のキャッシュを使用）"""
+    return _default_normalizer.canonicalize(address)
+
+
+def address_cache_stats() -> Dict[str, Any]:
+    """プロセス内共有キャッシュのヒット・ミス件数"""
+    return _default_normalizer.stats()
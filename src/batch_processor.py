@@ -0,0 +1,256 @@
+"""
+一括物確モジュール
+複数のマイソクPDF（zip内のPDFを含む）から全物件を抽出し、重複を除いて物確を並列実行
+（抽出・物確の完了ごとに進捗イベントを返す）
+"""
+import io
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import PurePosixPath
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from config.settings import BATCH_CONFIG, PDF_CONFIG
+from src.result_cache import property_fingerprint
+
+# 抽出できなかった項目の代替値（この値を含む物件は別物件同士が同じ識別キーになるため重複除去しない）
+PLACEHOLDER_VALUES = {"address": ("", "住所不明"), "rent": ("", "要相談"), "layout": ("", "間取り不明")}
+
+
+class BatchLimitError(ValueError):
+    """1リクエストのPDF数・合計サイズの上限超過"""
+
+
+class _BatchBudget:
+    """展開済みのPDF一覧と、PDF数・合計サイズの上限"""
+
+    def __init__(self, max_files: int, max_total_bytes: int):
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes
+        self.pdfs: List[Tuple[str, bytes]] = []
+        self.total_bytes = 0
+
+    @property
+    def remaining_bytes(self) -> int:
+        return self.max_total_bytes - self.total_bytes
+
+    def add(self, name: str, data: bytes):
+        if len(self.pdfs) >= self.max_files:
+            raise BatchLimitError(f"PDFは1回に{self.max_files}件までです")
+        if len(data) > self.remaining_bytes:
+            raise BatchLimitError(f"PDFの合計サイズは1回に{self.max_total_bytes // (1024 * 1024)}MBまでです")
+        self.pdfs.append((name, data))
+        self.total_bytes += len(data)
+
+
+def expand_batch_uploads(uploads: List[Tuple[str, bytes]], max_files: Optional[int] = None,
+                         max_total_bytes: Optional[int] = None) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+    """
+    アップロードされたファイルを (ファイル名, PDFバイト列) の一覧に展開（zipは中のPDFを取り出す）
+
+    PDF数・合計サイズ（zip展開後）は展開しながら確認し、上限を超えた時点で読み込みをやめる
+
+    Returns:
+        (PDF一覧, 除外したファイルの理由一覧)
+
+    Raises:
+        BatchLimitError: PDF数・合計サイズが上限を超えた場合
+    """
+    budget = _BatchBudget(max_files or BATCH_CONFIG["max_files"],
+                          max_total_bytes or BATCH_CONFIG["max_total_mb"] * 1024 * 1024)
+    skipped: List[str] = []
+
+    for name, data in uploads:
+        lower_name = name.lower()
+        if lower_name.endswith(".pdf"):
+            budget.add(name, data)
+        elif lower_name.endswith(".zip"):
+            _extract_zip_pdfs(name, data, skipped, budget)
+        else:
+            skipped.append(f"{name}: PDF・zip以外のファイル")
+
+    return budget.pdfs, skipped
+
+
+def _extract_zip_pdfs(archive_name: str, data: bytes, skipped: List[str], budget: _BatchBudget):
+    """
+    zip内のPDFを取り出す（サイズ上限を超えるもの・PDF以外は除外）
+
+    申告サイズ（file_size）は信用せず、1ファイルにつき上限（ファイル・合計の小さい方）＋1バイトまでしか展開しない
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                name = f"{archive_name}/{PurePosixPath(info.filename).name}"
+                if not info.filename.lower().endswith(".pdf"):
+                    skipped.append(f"{name}: PDF以外のファイル")
+                    continue
+                if info.file_size > PDF_CONFIG["max_file_size"]:
+                    skipped.append(f"{name}: ファイルサイズ上限超過")
+                    continue
+
+                read_limit = min(PDF_CONFIG["max_file_size"], budget.remaining_bytes)
+                with archive.open(info) as member:
+                    pdf_bytes = member.read(read_limit + 1)
+                if len(pdf_bytes) > PDF_CONFIG["max_file_size"]:
+                    skipped.append(f"{name}: ファイルサイズ上限超過")
+                    continue
+                budget.add(name, pdf_bytes)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, RuntimeError):
+        skipped.append(f"{archive_name}: zipファイルを読み込めません")
+
+
+def extract_pdf_properties(file_name: str, pdf_bytes: bytes) -> Dict[str, Any]:
+    """1ファイル分の物件情報を抽出（ワーカープロセスで実行するためモジュール関数）"""
+    from src.simple_pdf_analyzer import SimplePDFAnalyzer
+
+    # 複数物件をまとめたPDFも全件必要なので、先頭の物件で読み取りを打ち切らない
+    pdf_results = SimplePDFAnalyzer(stop_when_complete=False).analyze_pdf(io.BytesIO(pdf_bytes))
+    properties = pdf_results.get("properties", []) if pdf_results.get("success") else []
+    for prop in properties:
+        prop["source_file"] = file_name
+
+    return {
+        "file": file_name,
+        "success": bool(pdf_results.get("success")),
+        "properties": properties,
+        "error": pdf_results.get("error"),
+    }
+
+
+class BatchProcessor:
+    """
+    複数PDFの一括物確
+
+    - PDFの抽出はワーカープール（extract_workers が2以上ならプロセスプール）で実行
+    - 抽出できた物件から順に物確を開始し、同時実行数は check_concurrency まで
+    - 同じ物件（住所・賃料・間取りが一致）は1回だけ物確し、掲載元ファイルをまとめる
+    """
+
+    def __init__(self, check_property: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 extract: Callable[[str, bytes], Dict[str, Any]] = extract_pdf_properties,
+                 extract_workers: Optional[int] = None, check_concurrency: Optional[int] = None):
+        self.check_property = check_property
+        self.extract = extract
+        self.extract_workers = extract_workers or BATCH_CONFIG["extract_workers"]
+        self.check_concurrency = check_concurrency or BATCH_CONFIG["check_concurrency"]
+
+    def run(self, pdfs: List[Tuple[str, bytes]]) -> Iterator[Dict[str, Any]]:
+        """
+        一括物確を実行し、進捗イベントを順次返すジェネレーター
+
+        イベント（event キー）:
+            extracted: 1ファイルの抽出完了（物件数・重複数）
+            checked: 1物件の物確完了（サイトごとの結果・掲載元ファイル）
+            done: 全件完了（集計）
+        """
+        start = time.time()
+        summary = {"files": len(pdfs), "failed_files": 0, "properties": 0, "unique_properties": 0,
+                   "duplicates": 0, "checked": 0, "found": 0, "errors": 0}
+        sources: Dict[str, List[str]] = {}
+
+        extract_pool = self._create_extract_pool()
+        check_pool = ThreadPoolExecutor(max_workers=self.check_concurrency, thread_name_prefix="batch-check")
+        extract_futures: Dict[Future, str] = {}
+        check_futures: Dict[Future, Tuple[str, Dict[str, Any]]] = {}
+
+        try:
+            for file_name, pdf_bytes in pdfs:
+                extract_futures[extract_pool.submit(self.extract, file_name, pdf_bytes)] = file_name
+            pending = set(extract_futures)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in extract_futures:
+                        event = self._handle_extracted(future, extract_futures[future], summary, sources)
+                        for fingerprint, prop in event.pop("new_properties"):
+                            check_future = check_pool.submit(self.check_property, prop)
+                            check_futures[check_future] = (fingerprint, prop)
+                            pending.add(check_future)
+                    else:
+                        fingerprint, prop = check_futures[future]
+                        event = self._handle_checked(future, fingerprint, prop, summary, sources)
+                    yield event
+        finally:
+            extract_pool.shutdown(wait=False, cancel_futures=True)
+            check_pool.shutdown(wait=False, cancel_futures=True)
+
+        summary["execution_time"] = round(time.time() - start, 2)
+        print(f"✅ 一括物確完了: {summary}")
+        yield {"event": "done", "summary": summary}
+
+    def _create_extract_pool(self) -> Executor:
+        if self.extract_workers <= 1:
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-extract")
+        return ProcessPoolExecutor(max_workers=self.extract_workers,
+                                   mp_context=multiprocessing.get_context(PDF_CONFIG["process_start_method"]))
+
+    def _handle_extracted(self, future: Future, file_name: str, summary: Dict[str, Any],
+                          sources: Dict[str, List[str]]) -> Dict[str, Any]:
+        """抽出結果を集計し、初めて出てきた物件を物確対象として返す"""
+        try:
+            extracted = future.result()
+        except Exception as e:
+            extracted = {"file": file_name, "success": False, "properties": [], "error": str(e)}
+
+        if not extracted["success"]:
+            summary["failed_files"] += 1
+            print(f"❌ {file_name}: 抽出エラー {extracted['error']}")
+            return {"event": "extracted", "file": file_name, "properties": 0, "duplicates": 0,
+                    "error": extracted["error"], "new_properties": []}
+
+        new_properties = []
+        duplicates = 0
+        for index, prop in enumerate(extracted["properties"]):
+            if _has_placeholder(prop):
+                fingerprint = f"{file_name}#{index}"
+            else:
+                fingerprint = property_fingerprint(prop)
+            if fingerprint in sources:
+                sources[fingerprint].append(file_name)
+                duplicates += 1
+            else:
+                sources[fingerprint] = [file_name]
+                new_properties.append((fingerprint, prop))
+
+        summary["properties"] += len(extracted["properties"])
+        summary["unique_properties"] += len(new_properties)
+        summary["duplicates"] += duplicates
+        print(f"📋 {file_name}: {len(extracted['properties'])}件抽出（重複 {duplicates}件）")
+        return {"event": "extracted", "file": file_name, "properties": len(extracted["properties"]),
+                "duplicates": duplicates, "error": None, "new_properties": new_properties}
+
+    def _handle_checked(self, future: Future, fingerprint: str, prop: Dict[str, Any],
+                        summary: Dict[str, Any], sources: Dict[str, List[str]]) -> Dict[str, Any]:
+        """物確結果を集計してイベントにまとめる"""
+        summary["checked"] += 1
+        try:
+            site_results = future.result()
+            error = None
+        except Exception as e:
+            site_results = {}
+            error = f"物確エラー: {str(e)}"
+
+        found_sites = [site for site, result in site_results.items() if result.get("found")]
+        if found_sites:
+            summary["found"] += 1
+        if error or any(result.get("error") for result in site_results.values()):
+            summary["errors"] += 1
+
+        return {
+            "event": "checked",
+            "fingerprint": fingerprint,
+            "property": prop,
+            "source_files": list(sources[fingerprint]),
+            "found_sites": found_sites,
+            "results": site_results,
+            "error": error,
+        }
+
+
+def _has_placeholder(prop: Dict[str, Any]) -> bool:
+    """住所・賃料・間取りのいずれかが抽出できていない（代替値・空）かを判定"""
+    return any(str(prop.get(field) or "").strip() in values for field, values in PLACEHOLDER_VALUES.items())
@@ -5,6 +5,7 @@ Chrome MCPを使用してITANDI・いえらぶBB等を実際に巡回
 import time
 import re
 from typing import Dict, List, Optional, Any
+from src.address_normalizer import canonicalize_address
 
 class BrowserPropertyChecker:
     """ブラウザ自動化による物確システム"""
@@ -417,8 +418,8 @@ class BrowserPropertyChecker:
             return 0.0
         
         # 正規化
-        addr1_clean = re.sub(r'[０-９]', lambda x: chr(ord(x.group()) - ord('０') + ord('0')), addr1)
-        addr2_clean = re.sub(r'[０-９]', lambda x: chr(ord(x.group()) - ord('０') + ord('0')), addr2)
+        addr1_clean = canonicalize_address(addr1).text
+        addr2_clean = canonicalize_address(addr2).text
         
         # 共通部分の長さで判定
         common_length = 0
@@ -430,6 +431,9 @@ class BrowserPropertyChecker:
             else:
                 break
         
+        if max(len(addr1_clean), len(addr2_clean)) == 0:
+            return 0.0
+        
         return common_length / max(len(addr1_clean), len(addr2_clean))
     
     def _rent_similarity(self, rent1: str, rent2: str) -> float:
@@ -472,12 +476,8 @@ class BrowserPropertyChecker:
         if not address:
             return ""
         
-        # 全角→半角変換
-        address = address.replace('　', ' ')
-        
-        # 余分な文字削除
-        address = re.sub(r'[（）()「」【】].*', '', address)
-        address = re.sub(r'\s+', ' ', address).strip()
+        # 全角→半角・括弧書きの除去・番地表記の統一
+        address = canonicalize_address(address).text
         
         return address[:50]  # 長すぎる場合は切り詰め
     
@@ -0,0 +1,236 @@
+"""
+Playwrightブラウザプールモジュール
+Chromiumを起動したまま保持し、サイトごとにログイン状態を引き継いだBrowserContextを払い出す
+"""
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Dict, Optional, Set, Tuple, TypeVar
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from config.settings import PLAYWRIGHT_CONFIG
+from src.session_store import SessionStore
+
+T = TypeVar("T")
+
+
+class BrowserPool:
+    """
+    常駐ブラウザプール
+
+    - Chromiumプロセスは1つを使い回し、サイトごとに BrowserContext を払い出す
+    - 返却時にストレージ状態（Cookie等）をサイト・アカウントごとに保存し、次回のコンテキストに引き継ぐ
+      （ディスクにも保存するため、プロセス再起動後もログインを省略できる）
+    - 接続が切れたブラウザは再起動し、一定ページ数を開いたブラウザは入れ替える
+    - Playwrightのオブジェクトはイベントループに紐づくため、同じループ内で使うこと
+    """
+
+    def __init__(self, max_pages_per_browser: Optional[int] = None, headless: Optional[bool] = None,
+                 session_store: Optional[SessionStore] = None):
+        self.max_pages_per_browser = max_pages_per_browser or PLAYWRIGHT_CONFIG["max_pages_per_browser"]
+        self.headless = PLAYWRIGHT_CONFIG["headless"] if headless is None else headless
+        self.pages_served = 0
+        self.launch_count = 0
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._active_contexts: Dict[Browser, int] = {}
+        self._context_browsers: Dict[BrowserContext, Browser] = {}
+        self._retiring: Set[Browser] = set()
+        self.session_store = session_store or SessionStore()
+        self._storage_states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        """Playwrightを起動（ブラウザは最初のコンテキスト取得時に起動）"""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+    async def close(self):
+        """全ブラウザとPlaywrightを終了"""
+        async with self._lock:
+            browsers = set(self._active_contexts) | self._retiring
+            if self._browser:
+                browsers.add(self._browser)
+            for browser in browsers:
+                try:
+                    await browser.close()
+                except Exception as e:
+                    print(f"ブラウザ終了エラー: {e}")
+            self._browser = None
+            self._active_contexts.clear()
+            self._context_browsers.clear()
+            self._retiring.clear()
+
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def acquire_context(self, site: str, username: str = "") -> BrowserContext:
+        """サイト用のコンテキストを取得（保存済みのログイン状態があれば引き継ぐ）"""
+        async with self._lock:
+            browser = await self._ensure_browser()
+            context = await browser.new_context(storage_state=self._get_storage_state(site, username))
+            context.set_default_timeout(PLAYWRIGHT_CONFIG["timeout"])
+            context.on("page", self._on_page)
+            self._context_browsers[context] = browser
+            self._active_contexts[browser] = self._active_contexts.get(browser, 0) + 1
+            return context
+
+    async def release_context(self, site: str, context: BrowserContext, save_state: bool = True,
+                              username: str = ""):
+        """コンテキストを返却（ログイン状態を保存して閉じる）"""
+        try:
+            if save_state:
+                storage_state = await context.storage_state()
+                self._storage_states[(site, username)] = storage_state
+                self.session_store.save(site, username, storage_state)
+        except Exception as e:
+            print(f"{site}: ストレージ状態の保存エラー: {e}")
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"{site}: コンテキスト終了エラー: {e}")
+
+            async with self._lock:
+                browser = self._context_browsers.pop(context, None)
+                if browser is not None:
+                    self._active_contexts[browser] -= 1
+                    if browser in self._retiring and self._active_contexts[browser] <= 0:
+                        await self._close_browser(browser)
+
+    def has_storage_state(self, site: str, username: str = "") -> bool:
+        """サイトのログイン状態が保存済みかどうか"""
+        return self._get_storage_state(site, username) is not None
+
+    def discard_storage_state(self, site: str, username: str = ""):
+        """保存済みのログイン状態を破棄（セッション切れ時など）"""
+        self._storage_states.pop((site, username), None)
+        self.session_store.discard(site, username)
+
+    def _get_storage_state(self, site: str, username: str) -> Optional[Dict[str, Any]]:
+        """メモリ上のログイン状態を返す（なければディスクから読み込む）"""
+        key = (site, username)
+        if key not in self._storage_states:
+            storage_state = self.session_store.load(site, username)
+            if storage_state is None:
+                return None
+            self._storage_states[key] = storage_state
+        return self._storage_states[key]
+
+    def is_healthy(self) -> bool:
+        """現在のブラウザが接続中かどうか"""
+        return self._browser is not None and self._browser.is_connected()
+
+    def stats(self) -> Dict[str, int]:
+        """プールの利用状況を取得"""
+        return {
+            "launch_count": self.launch_count,
+            "pages_served": self.pages_served,
+            "active_contexts": sum(self._active_contexts.values()),
+            "retiring_browsers": len(self._retiring),
+        }
+
+    def _on_page(self, page: Page):
+        self.pages_served += 1
+
+    async def _ensure_browser(self) -> Browser:
+        """接続中で入れ替え不要なブラウザを返す（必要なら起動・入れ替え）"""
+        await self.start()
+
+        if self._browser is not None and not self._browser.is_connected():
+            print("⚠️ ブラウザ接続が切れたため再起動します")
+            self._active_contexts.pop(self._browser, None)
+            self._browser = None
+
+        if self._browser is not None and self.pages_served >= self.max_pages_per_browser:
+            print(f"♻️ {self.pages_served}ページ使用したためブラウザを入れ替えます")
+            old_browser = self._browser
+            self._browser = None
+            if self._active_contexts.get(old_browser, 0) > 0:
+                self._retiring.add(old_browser)  # 使用中のコンテキストが返却されたら閉じる
+            else:
+                await self._close_browser(old_browser)
+
+        if self._browser is None:
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                slow_mo=PLAYWRIGHT_CONFIG["slow_mo"]
+            )
+            self._active_contexts[self._browser] = 0
+            self.pages_served = 0
+            self.launch_count += 1
+
+        return self._browser
+
+    async def _close_browser(self, browser: Browser):
+        self._retiring.discard(browser)
+        self._active_contexts.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            print(f"ブラウザ終了エラー: {e}")
+
+
+_POOL: Optional[BrowserPool] = None
+_POOL_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_POOL_THREAD: Optional[threading.Thread] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool_loop() -> asyncio.AbstractEventLoop:
+    """共有プール専用のイベントループを取得（初回に常駐スレッドで起動）"""
+    global _POOL_LOOP, _POOL_THREAD
+    with _POOL_LOCK:
+        if _POOL_LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            thread.start()
+            _POOL_LOOP, _POOL_THREAD = loop, thread
+        return _POOL_LOOP
+
+
+async def in_browser_pool(coro: Awaitable[T]) -> T:
+    """
+    コルーチンを共有プールのイベントループで実行して結果を待つ
+
+    Playwrightのオブジェクトは作成したループでしか使えないため、呼び出し側の
+    ループ（asyncio.run ごとに変わる）ではなく常駐ループでプールを使う
+    """
+    loop = _get_pool_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def get_browser_pool() -> BrowserPool:
+    """共有ブラウザプールを取得（in_browser_pool で実行したコルーチンから呼ぶこと）"""
+    global _POOL
+    if asyncio.get_running_loop() is not _get_pool_loop():
+        raise RuntimeError("共有ブラウザプールは in_browser_pool で実行したコルーチンから使用してください")
+    if _POOL is None:
+        _POOL = BrowserPool()
+    await _POOL.start()
+    return _POOL
+
+
+def close_browser_pool():
+    """共有ブラウザプールと常駐ループを終了（プロセス終了時に atexit で実行）"""
+    global _POOL, _POOL_LOOP, _POOL_THREAD
+    with _POOL_LOCK:
+        pool, loop, thread = _POOL, _POOL_LOOP, _POOL_THREAD
+        _POOL, _POOL_LOOP, _POOL_THREAD = None, None, None
+    if loop is None:
+        return
+
+    if pool is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result(timeout=30)
+        except Exception as e:
+            print(f"ブラウザプール終了エラー: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not thread.is_alive():
+        loop.close()
+
+
+atexit.register(close_browser_pool)
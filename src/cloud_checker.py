@@ -2,10 +2,15 @@
 クラウド版物確チェッカー
 requestsベースのスクレイピングで物確を実行
 """
+import asyncio
+import threading
 import requests
-import time
 from bs4 import BeautifulSoup
 import urllib.parse
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from config.settings import BUKKATSU_CONFIG
+
+SITES = ('itandi', 'ierabu', 'suumo')
 
 class CloudPropertyChecker:
     """クラウド環境での物確チェッカー"""
@@ -153,12 +158,73 @@ class CloudPropertyChecker:
         return min(score, 0.95)  # 最大95%
     
     def perform_bukkatsu_check(self, properties):
-        """複数物件の一括物確チェック"""
-        results = []
+        """
+        複数物件の一括物確チェック（全物件・全サイトを並列実行し、入力順で返す）
         
-        for i, prop in enumerate(properties):
-            st.write(f"🔍 物件 {i+1}/{len(properties)} を検索中...")
-            
+        イベントループ内からは perform_bukkatsu_check_ordered を await すること
+        （実行中のループがあれば asyncio.run は使えないため、別スレッドのループで実行する）
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.perform_bukkatsu_check_ordered(properties))
+        
+        outcome = {}
+        
+        def run_in_thread():
+            try:
+                outcome['results'] = asyncio.run(self.perform_bukkatsu_check_ordered(properties))
+            except BaseException as e:
+                outcome['error'] = e
+        
+        thread = threading.Thread(target=run_in_thread, name="cloud-bukkatsu")
+        thread.start()
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['results']
+    
+    async def perform_bukkatsu_check_ordered(self, properties) -> List[Dict]:
+        """複数物件の一括物確チェック（非同期版・全件の完了後に入力順で返す）"""
+        indexed = [item async for item in self._iter_bukkatsu_checks(properties)]
+        return [result for _, result in sorted(indexed, key=lambda item: item[0])]
+    
+    async def perform_bukkatsu_check_async(self, properties, max_concurrency: Optional[int] = None,
+                                           site_concurrency: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        複数物件の一括物確チェック（非同期版）
+        
+        全物件の各サイト検索を同時に実行し、物件ごとに全サイトの検索が終わった順に結果を返す
+        
+        Args:
+            properties: 物件データ（property_id, address, rent, layout, station_info を持つ）のリスト
+            max_concurrency: 全サイト合計の同時検索数（省略時は BUKKATSU_CONFIG["cloud_max_concurrency"]）
+            site_concurrency: 1サイトあたりの同時検索数（省略時は BUKKATSU_CONFIG["cloud_site_concurrency"]）
+        """
+        async for _, result in self._iter_bukkatsu_checks(properties, max_concurrency, site_concurrency):
+            yield result
+    
+    async def _iter_bukkatsu_checks(self, properties, max_concurrency: Optional[int] = None,
+                                    site_concurrency: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict]]:
+        """物件ごとに全サイトの検索が終わった順に (入力順の位置, 結果) を返す"""
+        total_semaphore = asyncio.Semaphore(max_concurrency or BUKKATSU_CONFIG["cloud_max_concurrency"])
+        site_semaphores = {
+            site: asyncio.Semaphore(site_concurrency or BUKKATSU_CONFIG["cloud_site_concurrency"])
+            for site in SITES
+        }
+        searches = {
+            'itandi': self.search_itandi,
+            'ierabu': self.search_ierabu,
+            'suumo': self.search_suumo,
+        }
+        
+        async def search_site(site: str, prop_dict: Dict) -> Dict:
+            # サイトの枠を確保してから全体の枠を確保（全体の枠を持ったまま待たない）
+            async with site_semaphores[site]:
+                async with total_semaphore:
+                    return await asyncio.to_thread(searches[site], prop_dict)
+        
+        async def check_property(index: int, prop) -> Tuple[int, Dict]:
             # 物件情報を辞書形式に変換
             prop_dict = {
                 'address': prop.address,
@@ -167,20 +233,12 @@ class CloudPropertyChecker:
                 'station_info': prop.station_info
             }
             
-            # ITANDI検索
-            itandi_result = self.search_itandi(prop_dict)
-            time.sleep(1)  # レート制限
-            
-            # いえらぶBB検索
-            ierabu_result = self.search_ierabu(prop_dict)
-            time.sleep(1)
-            
-            # SUUMO検索
-            suumo_result = self.search_suumo(prop_dict)
-            time.sleep(1)
+            itandi_result, ierabu_result, suumo_result = await asyncio.gather(
+                *(search_site(site, prop_dict) for site in SITES)
+            )
             
             # 結果統合
-            result = {
+            return index, {
                 'property_id': prop.property_id,
                 'property': prop,
                 'itandi': itandi_result,
@@ -192,11 +250,14 @@ class CloudPropertyChecker:
                     suumo_result.get('found', False)
                 ])
             }
-            
-            results.append(result)
-            
-            # 進捗表示
-            progress = (i + 1) / len(properties)
-            st.progress(progress)
         
-        return results
\ No newline at end of file
+        tasks = [asyncio.create_task(check_property(index, prop)) for index, prop in enumerate(properties)]
+        try:
+            for i, finished in enumerate(asyncio.as_completed(tasks)):
+                index, result = await finished
+                # 進捗表示
+                print(f"🔍 物件 {i+1}/{len(properties)} 完了: {result['property_id']}")
+                yield index, result
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,143 @@
+"""
+PDF抽出結果キャッシュモジュール
+PDFバイト列のSHA-256をキーに、抽出テキストと物件情報をディスクに保存
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+from config.settings import EXTRACTION_CACHE_CONFIG
+
+
+def hash_pdf_bytes(pdf_bytes: bytes) -> str:
+    """PDFバイト列からキャッシュキー（SHA-256）を生成"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def pattern_version(patterns) -> str:
+    """正規表現パターン定義からバージョンキーを生成（パターン変更で値が変わる）"""
+    serialized = json.dumps(patterns, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """
+    PDF抽出結果のディスクキャッシュ
+
+    - 1エントリ1JSONファイル（{namespace}_{sha256}.json）
+    - テキスト・物件情報ともバージョンキーが一致する場合のみ有効（テキストの形式・パターンの変更で無効になる）
+    - 合計サイズが上限を超えたら最終アクセスの古い順に削除（LRU）
+    """
+
+    def __init__(self, namespace: str, version: str, cache_dir: Optional[Path] = None,
+                 max_size_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        self.namespace = namespace
+        self.version = version
+        self.cache_dir = Path(cache_dir or EXTRACTION_CACHE_CONFIG["cache_dir"])
+        self.max_size_bytes = max_size_bytes or EXTRACTION_CACHE_CONFIG["max_size_mb"] * 1024 * 1024
+        self.enabled = EXTRACTION_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_text(self, key: str) -> Optional[str]:
+        """キャッシュ済みの抽出テキストを取得（バージョンが異なれば無効）"""
+        entry = self._load(key)
+        if entry is None or entry.get("version") != self.version or entry.get("text") is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["text"]
+
+    def get_properties(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """キャッシュ済みの物件情報を取得（パターンのバージョンが異なれば無効）"""
+        entry = self._load(key)
+        if entry is None or entry.get("version") != self.version or entry.get("properties") is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [dict(prop) for prop in entry["properties"]]
+
+    def put_text(self, key: str, text: str):
+        """抽出テキストを保存"""
+        entry = self._load(key) or {}
+        if entry.get("version") != self.version:
+            entry = {}
+        entry.update({"version": self.version, "text": text})
+        self._store(key, entry)
+
+    def put_properties(self, key: str, properties: List[Dict[str, str]]):
+        """物件情報を保存（同じバージョンのテキストが保存済みでない場合は物件情報のみ）"""
+        entry = self._load(key) or {}
+        if entry.get("version") != self.version:
+            entry = {}
+        entry.update({"version": self.version, "properties": properties})
+        self._store(key, entry)
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット・ミス回数を取得"""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{self.namespace}_{key}.json"
+
+    def _load(self, key: str) -> Optional[Dict]:
+        """エントリを読み込み、LRU用にアクセス時刻を更新"""
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"キャッシュ読み込みエラー: {e}")
+            return None
+
+    def _store(self, key: str, entry: Dict):
+        """エントリを書き込み（一時ファイル経由で置き換え）、上限超過分を削除"""
+        if not self.enabled:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._entry_path(key)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._evict()
+        except Exception as e:
+            print(f"キャッシュ書き込みエラー: {e}")
+
+    def _evict(self):
+        """合計サイズが上限以下になるまで最終アクセスの古いエントリを削除"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for item in os.scandir(self.cache_dir):
+                if not item.name.endswith(".json"):
+                    continue
+                stat = item.stat()
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_size_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                if total_size <= self.max_size_bytes:
+                    break
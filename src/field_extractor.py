@@ -0,0 +1,47 @@
+"""
+物件フィールド抽出エンジン
+正規表現パターンをインポート時に一度だけコンパイルし、全フィールドをまとめて抽出
+"""
+import re
+from typing import List, Dict, Union
+
+
+class FieldExtractor:
+    """
+    コンパイル済みパターンによるフィールド抽出エンジン
+
+    field_patterns はフィールド名 → パターン（または優先順の候補パターンのリスト）。
+    各フィールドについて、最初にマッチした候補パターンの最左マッチを返す
+    （re.search を候補順に試す従来処理と同じ結果）。
+    """
+
+    def __init__(self, field_patterns: Dict[str, Union[str, List[str]]], flags: int = 0):
+        self.fields = list(field_patterns.keys())
+        self.compiled_patterns = {
+            field: [re.compile(pattern, flags) for pattern in self._as_list(patterns)]
+            for field, patterns in field_patterns.items()
+        }
+
+    @staticmethod
+    def _as_list(patterns: Union[str, List[str]]) -> List[str]:
+        return [patterns] if isinstance(patterns, str) else list(patterns)
+
+    def extract(self, text: str) -> Dict[str, re.Match]:
+        """テキストから全フィールドを抽出（マッチしなかったフィールドは含めない）"""
+        matches = {}
+
+        for field, patterns in self.compiled_patterns.items():
+            for pattern in patterns:
+                match = pattern.search(text)
+                if match:
+                    matches[field] = match
+                    break  # 最初にマッチしたパターンで確定
+
+        return matches
+
+    def matched_fields(self, text: str, fields: List[str]) -> List[str]:
+        """指定フィールドのうち、いずれかの候補パターンがマッチするものを返す"""
+        return [
+            field for field in fields
+            if any(pattern.search(text) for pattern in self.compiled_patterns[field])
+        ]
@@ -0,0 +1,132 @@
+"""
+住所辞書（ガゼッティア）モジュール
+都道府県・市区町村の一覧（config/gazetteer.tsv）を起動時に1回だけトライ木へ読み込み、住所の先頭から最長一致で切り出す
+（住所の文字数に比例する1回の走査で済み、「四日市市」「東村山市」のように名前に市・町・村を含む地名も正しく区切れる）
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from config.settings import ADDRESS_CONFIG
+
+# 表記ゆれの多い文字は同じ文字として照合（茅ヶ崎市・茅ケ崎市、鎌ケ谷市・鎌ヶ谷市 など）
+FOLD_CHARS = {"ヶ": "ケ", "が": "ケ", "ガ": "ケ", "ヵ": "カ"}
+# 郡部の町村（郡名を省いた表記でも照合する）。「大和郡山市」のような市は対象外
+COUNTY_TOWN_PATTERN = re.compile(r"^.+?郡(.+[町村])$")
+
+
+class _Node:
+    """トライ木の節（子の節と、ここで終わる登録値）"""
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.value: Optional[str] = None
+
+
+class AddressTrie:
+    """地名のトライ木（文字単位）"""
+
+    def __init__(self):
+        self._root = _Node()
+        self.size = 0
+
+    def add(self, key: str, value: str):
+        """地名を登録（同じ表記が既にあれば先に登録した値を優先）"""
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(FOLD_CHARS.get(char, char), _Node())
+        if node.value is None:
+            node.value = value
+            self.size += 1
+
+    def longest_match(self, text: str, start: int = 0) -> Tuple[Optional[str], int]:
+        """
+        text[start:] の先頭に最長一致する地名を検索
+
+        Returns:
+            (登録値, 一致した文字数): 一致しなければ (None, 0)
+        """
+        node = self._root
+        value, length = None, 0
+        for index in range(start, len(text)):
+            char = text[index]
+            node = node.children.get(FOLD_CHARS.get(char, char))
+            if node is None:
+                break
+            if node.value is not None:
+                value, length = node.value, index - start + 1
+        return value, length
+
+
+class Gazetteer:
+    """
+    都道府県・市区町村の住所辞書
+
+    - 都道府県ごとの市区町村と、都道府県を省いた住所用の全国の市区町村をそれぞれトライ木で保持
+    - 郡部の町村は郡名を省いた表記（伊奈町 → 北足立郡伊奈町）も同じ都道府県内でのみ照合
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str]]):
+        self.prefectures: List[str] = []
+        self._prefecture_trie = AddressTrie()
+        self._city_tries: Dict[str, AddressTrie] = {}
+        self._any_city_trie = AddressTrie()
+
+        for prefecture, city in rows:
+            if prefecture not in self._city_tries:
+                self.prefectures.append(prefecture)
+                self._prefecture_trie.add(prefecture, prefecture)
+                self._city_tries[prefecture] = AddressTrie()
+            if city:
+                self._add_city(prefecture, city)
+
+    def _add_city(self, prefecture: str, city: str):
+        city_trie = self._city_tries[prefecture]
+        city_trie.add(city, city)
+        self._any_city_trie.add(city, city)
+
+        # 他の都道府県に同名の町村があるため、郡名を省いた表記は都道府県内でのみ登録
+        match = COUNTY_TOWN_PATTERN.match(city)
+        if match:
+            city_trie.add(match.group(1), city)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Gazetteer":
+        """TSVファイル（都道府県<TAB>市区町村、# 以降はコメント）から読み込み"""
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    prefecture, _, city = line.partition("\t")
+                    rows.append((prefecture.strip(), city.strip()))
+
+        gazetteer = cls(rows)
+        print(f"🗾 住所辞書を読み込み: {len(gazetteer.prefectures)}都道府県・{gazetteer._any_city_trie.size}市区町村")
+        return gazetteer
+
+    def match_prefecture(self, text: str, start: int = 0) -> Tuple[str, int]:
+        """先頭の都道府県を検索（なければ ("", 0)）"""
+        prefecture, length = self._prefecture_trie.longest_match(text, start)
+        return prefecture or "", length
+
+    def match_city(self, text: str, start: int = 0, prefecture: str = "") -> Tuple[str, int]:
+        """
+        先頭の市区町村（政令指定都市は区まで）を検索
+
+        Args:
+            prefecture: 住所の都道府県（分かっていればその都道府県の市区町村だけを照合）
+
+        Returns:
+            (正式な市区町村名, 一致した文字数): 辞書になければ ("", 0)
+        """
+        trie = self._city_tries.get(prefecture, self._any_city_trie)
+        city, length = trie.longest_match(text, start)
+        return city or "", length
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path: Optional[str] = None) -> Gazetteer:
+    """住所辞書を読み込み（プロセス内で1回だけ読み込んで共有）"""
+    return Gazetteer.load(path or ADDRESS_CONFIG["gazetteer_path"])
@@ -4,10 +4,15 @@
 import asyncio
 import re
 from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import BrowserContext, Page
 from dataclasses import dataclass
 from config.credentials import CredentialsManager
-from config.settings import PLAYWRIGHT_CONFIG, BUKKATSU_CONFIG
+from config.settings import PLAYWRIGHT_CONFIG, BUKKATSU_CONFIG, SESSION_CONFIG
+from src.browser_pool import BrowserPool, get_browser_pool, in_browser_pool
+from src.rate_limiter import get_rate_limiter
+from src.selector_cache import get_selector_cache
+from src.page_readiness import detect_captcha, mark_page, wait_for_login, wait_for_results
+from src.resource_blocker import ResourceBlocker
 
 @dataclass
 class IerabuSearchResult:
@@ -24,19 +29,38 @@ class IerabuSearchResult:
 class IerabuChecker:
     """いえらぶBB物確自動化クラス"""
     
-    def __init__(self):
-        self.credentials = CredentialsManager().get_credentials("ierabu")
-        self.browser: Optional[Browser] = None
+    # 検索結果の物件要素（結果表示の判定と解析で共通）
+    RESULT_SELECTORS = [
+        '.bukken-list', '.property-list', '.search-result',
+        '.bukken-item', '.property-item', '.listing-item',
+        '[class*="bukken"]', '[class*="property"]', '[class*="listing"]',
+        'tr.bukken', 'div.bukken', '.result-item'
+    ]
+    NO_RESULT_TEXTS = [
+        "検索結果がありません", "物件が見つかりません", 
+        "該当する物件はありません", "0件", "見つかりませんでした"
+    ]
+    
+    SITE = "ierabu"
+    
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        self.credentials = CredentialsManager().get_credentials(self.SITE)
+        self.pool = pool
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.logged_in = False
+        self.selector_cache = get_selector_cache(self.SITE)
+        self.resource_blocker = ResourceBlocker()
+        self.rate_limiter = get_rate_limiter(self.SITE)
     
     async def __aenter__(self):
-        """非同期コンテキストマネージャー開始"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=PLAYWRIGHT_CONFIG["headless"],
-            slow_mo=PLAYWRIGHT_CONFIG["slow_mo"]
-        )
-        self.page = await self.browser.new_page()
+        """非同期コンテキストマネージャー開始（常駐ブラウザプールからコンテキストを取得）"""
+        if self.pool is None:
+            self.pool = await get_browser_pool()
+        self.context = await self.pool.acquire_context(self.SITE, self.credentials.username)
+        await self.resource_blocker.install(self.context)
+        self.context.on("response", self._on_response)
+        self.page = await self.context.new_page()
         
         # タイムアウト設定
         self.page.set_default_timeout(PLAYWRIGHT_CONFIG["timeout"])
@@ -44,15 +68,32 @@ class IerabuChecker:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """非同期コンテキストマネージャー終了"""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """非同期コンテキストマネージャー終了（ログイン成功時のみセッションを保存して返却）"""
+        if self.context:
+            print(f"いえらぶBBリソース遮断: {self.resource_blocker.summary()}")
+            print(f"いえらぶBBリクエスト間隔: {self.rate_limiter.stats()}")
+            await self.pool.release_context(
+                self.SITE, self.context, save_state=self.logged_in, username=self.credentials.username
+            )
+            self.context = None
+    
+    def _on_response(self, response):
+        """アクセス制限（HTTP 429）の応答を検知したら減速"""
+        if response.status == 429:
+            self.rate_limiter.record_throttle("HTTP 429")
     
     async def login(self) -> bool:
         """いえらぶBBにログイン"""
         try:
+            # 保存済みセッションが有効ならログインを省略
+            if self.pool.has_storage_state(self.SITE, self.credentials.username):
+                if await self._probe_session():
+                    print("いえらぶBB: 保存済みセッションを再利用")
+                    self.logged_in = True
+                    return True
+                print("いえらぶBB: 保存済みセッションが無効のため再ログイン")
+                self.pool.discard_storage_state(self.SITE, self.credentials.username)
+            
             print("いえらぶBBにログイン中...")
             
             # ログインページにアクセス
@@ -105,13 +146,13 @@ class IerabuChecker:
                 except:
                     continue
             
-            # ログイン完了まで待機
-            await self.page.wait_for_load_state("networkidle", timeout=15000)
+            # ログイン後の画面に遷移するまで待機
+            await wait_for_login(self.page, self._is_logged_in_url, timeout=15000, label="いえらぶBBログイン")
             
             # ログイン成功の確認
-            current_url = self.page.url
-            if "login" not in current_url.lower() or "main" in current_url.lower() or "top" in current_url.lower():
+            if self._is_logged_in_url(self.page.url):
                 print("いえらぶBBログイン成功")
+                self.logged_in = True
                 return True
             else:
                 print("ログインに失敗した可能性があります")
@@ -121,8 +162,28 @@ class IerabuChecker:
             print(f"いえらぶBBログインエラー: {e}")
             return False
     
-    async def search_property(self, search_keywords: str) -> IerabuSearchResult:
-        """物件を検索"""
+    @staticmethod
+    def _is_logged_in_url(url: str) -> bool:
+        """ログイン後の画面のURLかどうか（ログイン画面以外またはメイン・トップ画面）"""
+        url = url.lower()
+        return "login" not in url or "main" in url or "top" in url
+    
+    async def _probe_session(self) -> bool:
+        """ログイン後のページにアクセスし、ログイン画面に戻されなければセッション有効と判定"""
+        try:
+            await self.page.goto(
+                self.credentials.search_url or self.credentials.login_url,
+                wait_until="domcontentloaded",
+                timeout=SESSION_CONFIG["probe_timeout"]
+            )
+            return "login" not in self.page.url.lower()
+        except Exception as e:
+            print(f"セッション確認エラー: {e}")
+            return False
+    
+    async def search_property(self, search_keywords: str, page: Optional[Page] = None) -> IerabuSearchResult:
+        """物件を検索（page を省略した場合はログインに使ったページで検索）"""
+        page = page or self.page
         result = IerabuSearchResult(
             property_id="",
             found=False,
@@ -145,10 +206,11 @@ class IerabuChecker:
             search_filled = False
             
             # 現在のページで検索ボックスを探す
-            for selector in search_selectors:
+            for selector in self.selector_cache.order("search_box", search_selectors):
                 try:
-                    await self.page.wait_for_selector(selector, timeout=5000)
-                    await self.page.fill(selector, search_keywords)
+                    await page.wait_for_selector(selector, timeout=5000)
+                    await page.fill(selector, search_keywords)
+                    self.selector_cache.remember("search_box", selector)
                     search_filled = True
                     break
                 except:
@@ -164,14 +226,15 @@ class IerabuChecker:
                 
                 for search_url in search_urls:
                     try:
-                        await self.page.goto(search_url)
-                        await self.page.wait_for_load_state("domcontentloaded")
+                        await page.goto(search_url)
+                        await page.wait_for_load_state("domcontentloaded")
                         
                         # 再度検索ボックスを探す
-                        for selector in search_selectors:
+                        for selector in self.selector_cache.order("search_box", search_selectors):
                             try:
-                                await self.page.wait_for_selector(selector, timeout=5000)
-                                await self.page.fill(selector, search_keywords)
+                                await page.wait_for_selector(selector, timeout=5000)
+                                await page.fill(selector, search_keywords)
+                                self.selector_cache.remember("search_box", selector)
                                 search_filled = True
                                 break
                             except:
@@ -186,28 +249,40 @@ class IerabuChecker:
                 result.error_message = "検索ボックスが見つかりません"
                 return result
             
-            # 検索実行
+            # 検索実行（実行前の画面に目印を付け、結果表示の判定に使う）
+            ready_token = await mark_page(page)
             search_button_selectors = [
                 'button[type="submit"]', 'input[type="submit"]',
                 'button:has-text("検索")', 'input[value*="検索"]',
                 '.search-btn', '.search-button', '#search-btn'
             ]
             
-            for selector in search_button_selectors:
+            for selector in self.selector_cache.order("search_button", search_button_selectors):
                 try:
-                    await self.page.click(selector)
+                    await page.click(selector)
+                    self.selector_cache.remember("search_button", selector)
                     break
                 except:
                     continue
             else:
                 # ボタンがない場合はEnterキーで検索
-                await self.page.keyboard.press('Enter')
-            
-            # 検索結果の読み込み待機
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
+                await page.keyboard.press('Enter')
+            
+            # 検索結果（物件要素または「結果なし」表示）が出るまで待機
+            elapsed = await wait_for_results(
+                page, self.RESULT_SELECTORS, self.NO_RESULT_TEXTS, ready_token,
+                timeout=10000, label="いえらぶBB検索結果"
+            )
+            
+            # アクセス制限画面なら減速し、それ以外は応答時間でレートを調整
+            if await detect_captcha(page):
+                self.rate_limiter.record_throttle("CAPTCHA")
+                result.error_message = "CAPTCHA（アクセス制限）が表示されました"
+                return result
+            self.rate_limiter.record_response(elapsed)
             
             # 検索結果の解析
-            await self._analyze_search_results(result)
+            await self._analyze_search_results(result, page)
             
         except Exception as e:
             result.error_message = f"検索エラー: {str(e)}"
@@ -215,21 +290,14 @@ class IerabuChecker:
         
         return result
     
-    async def _analyze_search_results(self, result: IerabuSearchResult):
+    async def _analyze_search_results(self, result: IerabuSearchResult, page: Page):
         """検索結果を解析"""
         try:
-            # 物件リストの要素を探す
-            property_selectors = [
-                '.bukken-list', '.property-list', '.search-result',
-                '.bukken-item', '.property-item', '.listing-item',
-                '[class*="bukken"]', '[class*="property"]', '[class*="listing"]',
-                'tr.bukken', 'div.bukken', '.result-item'
-            ]
-            
+            # 物件リストの要素を探す（広いセレクタほど後ろにあるため、キャッシュせず常に優先順で探す）
             property_elements = []
-            for selector in property_selectors:
+            for selector in self.RESULT_SELECTORS:
                 try:
-                    elements = await self.page.query_selector_all(selector)
+                    elements = await page.query_selector_all(selector)
                     if elements:
                         property_elements = elements
                         break
@@ -238,13 +306,9 @@ class IerabuChecker:
             
             if not property_elements:
                 # "検索結果なし"の表示をチェック
-                no_results_texts = [
-                    "検索結果がありません", "物件が見つかりません", 
-                    "該当する物件はありません", "0件", "見つかりませんでした"
-                ]
-                page_content = await self.page.content()
+                page_content = await page.content()
                 
-                for text in no_results_texts:
+                for text in self.NO_RESULT_TEXTS:
                     if text in page_content:
                         result.found = False
                         result.notes = "検索結果なし"
@@ -321,8 +385,15 @@ class IerabuChecker:
         except Exception as e:
             result.error_message = f"結果解析エラー: {str(e)}"
     
-    async def check_multiple_properties(self, search_combinations: List[Dict[str, str]]) -> List[IerabuSearchResult]:
-        """複数物件の物確を実行"""
+    async def check_multiple_properties(self, search_combinations: List[Dict[str, str]],
+                                        concurrency: Optional[int] = None) -> List[IerabuSearchResult]:
+        """
+        複数物件の物確を実行
+        
+        Args:
+            search_combinations: property_id と keywords を持つ検索条件のリスト
+            concurrency: 同時に開く検索タブ数（省略時は BUKKATSU_CONFIG["concurrent_pages"]）
+        """
         results = []
         
         # ログイン
@@ -342,22 +413,50 @@ class IerabuChecker:
                 results.append(error_result)
             return results
         
-        # 各物件の検索
-        for i, combo in enumerate(search_combinations):
-            print(f"物件 {i+1}/{len(search_combinations)}: {combo['property_id']}")
-            
-            result = await self.search_property(combo["keywords"])
-            result.property_id = combo["property_id"]
-            results.append(result)
-            
-            # リクエスト間隔を空ける
-            if i < len(search_combinations) - 1:
-                await asyncio.sleep(BUKKATSU_CONFIG["wait_time"])
+        concurrency = max(1, min(concurrency or BUKKATSU_CONFIG["concurrent_pages"], len(search_combinations)))
+        
+        # ログイン済みコンテキストで検索タブを開く（ログインに使ったページも利用）
+        pages = [self.page]
+        for _ in range(concurrency - 1):
+            page = await self.context.new_page()
+            page.set_default_timeout(PLAYWRIGHT_CONFIG["timeout"])
+            await page.goto(self.page.url, wait_until="domcontentloaded")
+            pages.append(page)
         
-        return results
+        idle_pages: asyncio.Queue = asyncio.Queue()
+        for page in pages:
+            idle_pages.put_nowait(page)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def search_one(i: int, combo: Dict[str, str]) -> IerabuSearchResult:
+            async with semaphore:
+                page = await idle_pages.get()
+                try:
+                    # 固定スリープの代わりにサイトごとのリクエスト数で間隔を制御
+                    await self.rate_limiter.acquire()
+                    print(f"物件 {i+1}/{len(search_combinations)}: {combo['property_id']}")
+                    result = await self.search_property(combo["keywords"], page)
+                    result.property_id = combo["property_id"]
+                    return result
+                finally:
+                    idle_pages.put_nowait(page)
+        
+        # 各物件の検索（結果は入力順）
+        try:
+            results = await asyncio.gather(*(
+                search_one(i, combo) for i, combo in enumerate(search_combinations)
+            ))
+        finally:
+            for page in pages[1:]:
+                await page.close()
+        
+        return list(results)
 
 # 非同期ラッパー関数
 async def check_properties_ierabu(search_combinations: List[Dict[str, str]]) -> List[IerabuSearchResult]:
-    """いえらぶBB物確の実行（外部から呼び出し用）"""
-    async with IerabuChecker() as checker:
-        return await checker.check_multiple_properties(search_combinations)
\ No newline at end of file
+    """いえらぶBB物確の実行（外部から呼び出し用。常駐ブラウザプールのループで実行）"""
+    async def check() -> List[IerabuSearchResult]:
+        async with IerabuChecker() as checker:
+            return await checker.check_multiple_properties(search_combinations)
+    
+    return await in_browser_pool(check())
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+ITANDI HTTP検索クライアント
+ブラウザでログインしたセッションのCookieを引き継ぎ、検索画面が呼び出すJSON APIを直接利用
+（検索結果カードをDOMから読み取る代わりに、1回のログインで多数の軽量な検索を実行）
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import ITANDI_API_CONFIG
+from src.browser_pool import in_browser_pool
+from src.itandi_checker import ITANDIChecker, ITANDISearchResult
+from src.rate_limiter import get_rate_limiter
+
+VACANT_KEYWORDS = ["空室", "募集中", "入居可"]
+OCCUPIED_KEYWORDS = ["満室", "入居中", "成約"]
+
+
+class ITANDIApiClient:
+    """ITANDIの検索APIクライアント（接続はセッションで使い回す）"""
+
+    def __init__(self, search_endpoint: Optional[str] = None, session: Optional[requests.Session] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.config = {**ITANDI_API_CONFIG, **(config or {})}
+        self.search_endpoint = search_endpoint or self.config["search_endpoint"]
+        self.session = session or self._create_session()
+        self.rate_limiter = get_rate_limiter(ITANDIChecker.SITE)
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config["pool_size"])
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Accept": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        return session
+
+    @classmethod
+    def from_storage_state(cls, storage_state: Dict[str, Any], **kwargs) -> "ITANDIApiClient":
+        """Playwrightの storage_state（ログイン済みCookie）からクライアントを作成"""
+        client = cls(**kwargs)
+        for cookie in storage_state.get("cookies", []):
+            client.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", "").lstrip("."),
+                path=cookie.get("path", "/")
+            )
+        return client
+
+    def search(self, keywords: str, property_id: str = "") -> ITANDISearchResult:
+        """キーワードで物件を検索し、ITANDISearchResult に変換"""
+        result = ITANDISearchResult(
+            property_id=property_id,
+            found=False,
+            availability_status="unknown",
+            listing_url="",
+            rent_displayed="",
+            notes="",
+        )
+
+        try:
+            response = self.session.get(
+                self.search_endpoint,
+                params={self.config["keyword_param"]: keywords},
+                timeout=self.config["timeout_seconds"]
+            )
+        except requests.RequestException as e:
+            result.error_message = f"検索エラー: {str(e)}"
+            return result
+
+        if response.status_code == 429:
+            self.rate_limiter.record_throttle("HTTP 429")
+            result.error_message = "アクセス制限（HTTP 429）"
+            return result
+        if response.status_code in (401, 403):
+            result.error_message = "セッションが無効です（再ログインが必要）"
+            return result
+        if response.status_code != 200:
+            result.error_message = f"検索エラー: HTTP {response.status_code}"
+            return result
+
+        self.rate_limiter.record_response(response.elapsed.total_seconds())
+
+        try:
+            data = response.json()
+        except ValueError:
+            result.error_message = "検索結果の解析ができませんでした"
+            return result
+
+        self._apply_search_response(result, data)
+        return result
+
+    def _apply_search_response(self, result: ITANDISearchResult, data: Dict[str, Any]):
+        """検索APIのJSONを検索結果に反映（先頭の物件を採用）"""
+        items = data.get(self.config["items_key"]) or []
+        if not items:
+            result.notes = "検索結果なし"
+            return
+
+        first_item = items[0]
+        url = str(first_item.get(self.config["url_key"]) or "")
+        if url.startswith("/"):
+            url = f"{self.config['site_url'].rstrip('/')}{url}"
+        result.listing_url = url
+        result.rent_displayed = str(first_item.get(self.config["rent_key"]) or "")
+
+        status = str(first_item.get(self.config["status_key"]) or "")
+        if any(keyword in status for keyword in VACANT_KEYWORDS):
+            result.availability_status = "vacant"
+        elif any(keyword in status for keyword in OCCUPIED_KEYWORDS):
+            result.availability_status = "occupied"
+        else:
+            result.availability_status = "unknown"
+
+        result.found = True
+        result.notes = f"検索結果: {data.get(self.config['total_key'], len(items))}件"
+
+    async def search_many(self, search_combinations: List[Dict[str, str]],
+                          concurrency: Optional[int] = None) -> List[ITANDISearchResult]:
+        """複数物件を並列検索（サイトごとのリクエスト間隔制御を共有）"""
+        semaphore = asyncio.Semaphore(concurrency or self.config["concurrency"])
+
+        async def search_one(i: int, combo: Dict[str, str]) -> ITANDISearchResult:
+            async with semaphore:
+                await self.rate_limiter.acquire()
+                print(f"物件 {i+1}/{len(search_combinations)}: {combo['property_id']}（HTTP検索）")
+                return await asyncio.to_thread(self.search, combo["keywords"], combo["property_id"])
+
+        return list(await asyncio.gather(*(
+            search_one(i, combo) for i, combo in enumerate(search_combinations)
+        )))
+
+
+async def check_properties_itandi_http(search_combinations: List[Dict[str, str]]) -> List[ITANDISearchResult]:
+    """ブラウザで1回ログインし、以降の検索はHTTP APIで実行（外部から呼び出し用）"""
+    async def login() -> Optional[Dict[str, Any]]:
+        # ログインは常駐ブラウザプールのループで実行し、以降のHTTP検索は呼び出し側のループで実行
+        async with ITANDIChecker() as checker:
+            if not await checker.login():
+                return None
+            return await checker.context.storage_state()
+
+    storage_state = await in_browser_pool(login())
+    if storage_state is None:
+        return [
+            ITANDISearchResult(
+                property_id=combo["property_id"],
+                found=False,
+                availability_status="unknown",
+                listing_url="",
+                rent_displayed="",
+                notes="",
+                error_message="ログインに失敗しました"
+            )
+            for combo in search_combinations
+        ]
+
+    client = ITANDIApiClient.from_storage_state(storage_state)
+    start = time.time()
+    results = await client.search_many(search_combinations)
+    print(f"ITANDI HTTP検索: {len(results)}件 {time.time() - start:.1f}秒")
+    return results
@@ -0,0 +1,87 @@
+"""
+バックグラウンドジョブ管理モジュール
+物確処理をリクエストから切り離し、スレッドプールで実行して進捗を保持
+"""
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from config.settings import JOB_CONFIG
+
+
+class JobManager:
+    """物確ジョブの投入・状態管理を行うクラス"""
+
+    def __init__(self, max_workers: Optional[int] = None, retention_seconds: Optional[int] = None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or JOB_CONFIG["max_workers"],
+            thread_name_prefix="bukkatsu-job"
+        )
+        self.retention_seconds = retention_seconds or JOB_CONFIG["retention_seconds"]
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, **kwargs) -> str:
+        """
+        ジョブを投入してジョブIDを返す
+
+        func は第1引数に進捗報告用の report(step, result) を受け取り、最終結果を返すこと
+        """
+        self._cleanup()
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "steps": {},
+                "result": None,
+                "error": None,
+            }
+
+        self.executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """ジョブの状態（途中結果を含む）を取得"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            return {**job, "steps": dict(job["steps"])}
+
+    def _run(self, job_id: str, func: Callable, args, kwargs):
+        """ワーカースレッドでジョブを実行"""
+        self._update(job_id, status="running", started_at=time.time())
+
+        def report(step: str, result: Any):
+            with self._lock:
+                self.jobs[job_id]["steps"][step] = result
+
+        try:
+            result = func(report, *args, **kwargs)
+            self._update(job_id, status="completed", result=result, finished_at=time.time())
+        except Exception as e:
+            print(f"❌ ジョブ {job_id} エラー: {e}")
+            traceback.print_exc()
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    def _cleanup(self):
+        """保持期間を過ぎた完了済みジョブを削除"""
+        expire_before = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job["finished_at"] and job["finished_at"] < expire_before
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
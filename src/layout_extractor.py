@@ -0,0 +1,251 @@
+"""
+レイアウト解析モジュール
+pdfplumberの単語座標・表セルから「項目名 → 値」を空間的に対応付けて抽出
+（2段組み・表形式のマイソクで列が混ざるのを防ぐ）
+"""
+import io
+import re
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import pdfplumber
+from config.settings import PDF_CONFIG
+
+# 項目名ラベル（長いものから照合）
+LAYOUT_LABELS = {
+    "property_number": ["物件番号", "物件No.", "物件No", "物件№"],
+    "rent": ["賃料", "家賃"],
+    "address": ["所在地", "住所"],
+    "station": ["最寄り駅", "最寄駅", "交通", "アクセス"],
+    "layout": ["間取り", "間取"],
+    "area": ["専有面積", "面積"],
+    "age": ["築年数", "築年月"],
+    "management_fee": ["管理費", "共益費"],
+}
+
+_LABEL_LOOKUP = sorted(
+    ((label, field) for field, labels in LAYOUT_LABELS.items() for label in labels),
+    key=lambda item: len(item[0]),
+    reverse=True
+)
+
+_LABEL_SEPARATOR = re.compile(r"^[\s:：]+")
+
+# 値の正規化パターン（正規表現ベースの抽出と同じ形式にそろえる）
+_RENT_VALUE = re.compile(r"([0-9,\.]+)\s*(万円|万|円)")
+_AGE_BUILT_YEARS = re.compile(r"築\s*([0-9]+)\s*年")
+_AGE_BUILT_ERA = re.compile(r"([平昭令和]*[0-9]+)\s*年\s*築")
+_AREA_VALUE = re.compile(r"([0-9]+\.?[0-9]*)\s*(?:㎡|m²|m2|平米)")
+_FEE_VALUE = re.compile(r"([0-9,]+)\s*円")
+_LAYOUT_VALUE = re.compile(r"([0-9]?[SLDK]+|ワンルーム)", re.IGNORECASE)
+_WALK_VALUE = re.compile(r"徒歩\s*([0-9]+)\s*分")
+_NUMBER_VALUE = re.compile(r"([A-Za-z0-9\-]+)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def match_label(text: str) -> Optional[Tuple[str, str]]:
+    """テキストが項目名で始まる場合、(フィールド名, 項目名以降の文字列)を返す"""
+    text = text.strip()
+    for label, field in _LABEL_LOOKUP:
+        if text.startswith(label):
+            return field, _LABEL_SEPARATOR.sub("", text[len(label):])
+    return None
+
+
+def normalize_value(field: str, value: str) -> str:
+    """レイアウトから取得した値をフィールドごとの形式に正規化"""
+    value = _WHITESPACE.sub(" ", value).strip()
+    if not value:
+        return ""
+
+    if field == "rent":
+        match = _RENT_VALUE.search(value)
+        if not match:
+            return ""
+        rent_str = match.group(1).replace(",", "")
+        try:
+            return f"{float(rent_str)}万円" if "万" in match.group(2) else f"{rent_str}円"
+        except ValueError:
+            return ""
+
+    if field == "age":
+        match = _AGE_BUILT_YEARS.search(value)
+        if match:
+            return f"築{match.group(1)}年"
+        match = _AGE_BUILT_ERA.search(value)
+        return f"{match.group(1)}年築" if match else value
+
+    patterns = {
+        "area": _AREA_VALUE,
+        "management_fee": _FEE_VALUE,
+        "layout": _LAYOUT_VALUE,
+        "property_number": _NUMBER_VALUE,
+    }
+    if field in patterns:
+        match = patterns[field].search(value)
+        return match.group(1) if match else ""
+
+    return value
+
+
+class LayoutExtractor:
+    """単語座標と表セルから項目名と値を対応付けるクラス"""
+
+    def __init__(self, y_tolerance: float = 3.0, column_gap: float = 24.0, cache_size: Optional[int] = None):
+        self.y_tolerance = y_tolerance  # 同じ行とみなす上端座標の差
+        self.column_gap = column_gap  # これ以上離れた単語は別の段とみなす
+        self.cache_size = cache_size or PDF_CONFIG["layout_page_cache_size"]
+        self._page_cache: "OrderedDict[Tuple[str, int], Tuple[str, Dict[str, str]]]" = OrderedDict()
+
+    def extract_pages(self, pdf_bytes: bytes, cache_key: str, start: int = 0,
+                      end: Optional[int] = None) -> List[Tuple[str, Dict[str, str]]]:
+        """PDFの各ページについて(ページテキスト, 項目→値)を取得（ページ単位でキャッシュ）"""
+        results = []
+
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            for page_index, page in enumerate(pdf.pages[start:end], start=start):
+                page_key = (cache_key, page_index)
+                if page_key in self._page_cache:
+                    self._page_cache.move_to_end(page_key)
+                    results.append(self._page_cache[page_key])
+                    continue
+
+                page_result = (page.extract_text() or "", self.extract_page_fields(page))
+                self._page_cache[page_key] = page_result
+                if len(self._page_cache) > self.cache_size:
+                    self._page_cache.popitem(last=False)
+                results.append(page_result)
+
+        return results
+
+    def extract_page_fields(self, page) -> Dict[str, str]:
+        """1ページ分の単語・表を一度だけ読み取り、項目名 → 値の対応を作成"""
+        fields = {}
+
+        # 表セルを優先（構造が明確なため）
+        for table in page.extract_tables() or []:
+            for field, value in self._fields_from_table(table):
+                fields.setdefault(field, value)
+
+        # 表以外の項目は単語の位置関係から補完
+        for field, value in self._fields_from_words(page.extract_words() or []):
+            fields.setdefault(field, value)
+
+        normalized = {}
+        for field, value in fields.items():
+            value = normalize_value(field, value)
+            if value:
+                normalized[field] = value
+
+        # 徒歩分数は交通欄から取得
+        if "station" in fields:
+            walk_match = _WALK_VALUE.search(fields["station"])
+            if walk_match:
+                normalized["walk_time"] = walk_match.group(1)
+
+        return normalized
+
+    def _fields_from_table(self, table: List[List[Optional[str]]]) -> List[Tuple[str, str]]:
+        """表の行から「項目名セル → 右隣（なければ真下）のセル」を取得"""
+        pairs = []
+
+        for row_index, row in enumerate(table):
+            for col_index, cell in enumerate(row):
+                label_match = match_label(cell or "")
+                if not label_match:
+                    continue
+
+                field, rest = label_match
+                value = rest
+                if not value:
+                    value = next((c for c in row[col_index + 1:] if c and c.strip()), "")
+                    if value and match_label(value):
+                        value = ""
+                if not value and row_index + 1 < len(table):
+                    below_row = table[row_index + 1]
+                    if col_index < len(below_row) and below_row[col_index]:
+                        value = below_row[col_index]
+                        if match_label(value):
+                            value = ""
+
+                if value:
+                    pairs.append((field, value))
+
+        return pairs
+
+    def _fields_from_words(self, words: List[Dict]) -> List[Tuple[str, str]]:
+        """単語の座標から「項目名 → 右側（なければ下の行）の単語列」を取得"""
+        lines = self._group_lines(words)
+        pairs = []
+
+        for line_index, line in enumerate(lines):
+            for word_index, word in enumerate(line):
+                label_match = match_label(word["text"])
+                if not label_match:
+                    continue
+
+                field, rest = label_match
+                value_words = self._collect_right(line, word_index)
+                value = " ".join(([rest] if rest else []) + [w["text"] for w in value_words])
+
+                if not value and line_index + 1 < len(lines):
+                    value = " ".join(w["text"] for w in self._collect_below(lines[line_index + 1], word))
+
+                if value:
+                    pairs.append((field, value))
+
+        return pairs
+
+    def _group_lines(self, words: List[Dict]) -> List[List[Dict]]:
+        """単語を上端座標の近いものごとに行へまとめる（各行は左から右の順）"""
+        lines: List[List[Dict]] = []
+
+        for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+            if lines and abs(lines[-1][0]["top"] - word["top"]) <= self.y_tolerance:
+                lines[-1].append(word)
+            else:
+                lines.append([word])
+
+        return [sorted(line, key=lambda w: w["x0"]) for line in lines]
+
+    def _collect_right(self, line: List[Dict], label_index: int) -> List[Dict]:
+        """項目名の右側で、段の切れ目か次の項目名までの単語を取得"""
+        collected = []
+        previous = line[label_index]
+
+        for word in line[label_index + 1:]:
+            if word["x0"] - previous["x1"] > self.column_gap or match_label(word["text"]):
+                break
+            collected.append(word)
+            previous = word
+
+        return collected
+
+    def _collect_below(self, line: List[Dict], label: Dict) -> List[Dict]:
+        """項目名の真下から始まる同じ段の単語を取得"""
+        collected = []
+        previous = None
+
+        for word in line:
+            if previous is None:
+                if word["x1"] < label["x0"] or word["x0"] > label["x1"] + self.column_gap:
+                    continue
+            elif word["x0"] - previous["x1"] > self.column_gap:
+                break
+            if match_label(word["text"]):
+                break
+            collected.append(word)
+            previous = word
+
+        return collected
+
+
+_WORKER_EXTRACTOR: Optional[LayoutExtractor] = None
+
+
+def extract_layout_page_range(pdf_bytes: bytes, cache_key: str, start: int,
+                              end: Optional[int]) -> List[Tuple[str, Dict[str, str]]]:
+    """指定ページ範囲のレイアウト解析（プロセスプールのワーカー用）"""
+    global _WORKER_EXTRACTOR
+    if _WORKER_EXTRACTOR is None:
+        _WORKER_EXTRACTOR = LayoutExtractor()
+    return _WORKER_EXTRACTOR.extract_pages(pdf_bytes, cache_key, start, end)
@@ -0,0 +1,108 @@
+"""
+ページ準備完了判定モジュール
+networkidle（通信が止まるまで待機）の代わりに、サイトごとのDOM条件で検索結果・ログイン完了を判定
+"""
+import time
+import uuid
+from typing import Callable, List
+from playwright.async_api import Page
+
+# 判定条件（いずれかの結果要素または「結果なし」表示があり、検索前の画面から変化していること）
+_RESULTS_READY_JS = """
+(args) => {
+    const body = document.body;
+    if (!body) return false;
+    const hasResult = args.selectors.some(selector => {
+        try { return document.querySelector(selector) !== null; } catch (e) { return false; }
+    });
+    const text = body.innerText || "";
+    if (!hasResult && !args.texts.some(marker => text.includes(marker))) return false;
+    // ページ遷移した場合は新しいドキュメントなのでそのまま準備完了
+    if (body.dataset.readinessToken !== args.token) return true;
+    // 同一ドキュメント内で描画される場合（SPA）は検索前から内容が変わっていること
+    return String(text.length) !== body.dataset.readinessLength;
+}
+"""
+
+# CAPTCHA（アクセス制限）の表示判定
+_CAPTCHA_JS = """
+() => {
+    if (document.querySelector('iframe[src*="recaptcha"], iframe[src*="hcaptcha"], iframe[src*="turnstile"], [class*="captcha"], [id*="captcha"]')) {
+        return true;
+    }
+    const text = (document.body && document.body.innerText) || "";
+    return ["ロボットではありません", "アクセスが集中", "too many requests"].some(marker => text.toLowerCase().includes(marker));
+}
+"""
+
+_MARK_PAGE_JS = """
+(token) => {
+    if (!document.body) return;
+    document.body.dataset.readinessToken = token;
+    document.body.dataset.readinessLength = String((document.body.innerText || "").length);
+}
+"""
+
+
+async def mark_page(page: Page) -> str:
+    """検索実行前の画面に目印を付け、目印のトークンを返す"""
+    token = uuid.uuid4().hex
+    try:
+        await page.evaluate(_MARK_PAGE_JS, token)
+    except Exception as e:
+        print(f"画面の目印設定エラー: {e}")
+    return token
+
+
+async def wait_for_results(page: Page, selectors: List[str], texts: List[str], token: str,
+                           timeout: int = 10000, label: str = "検索結果") -> float:
+    """
+    検索結果（結果要素または「結果なし」表示）が表示されるまで待機
+
+    タイムアウトしても例外にはせず、その時点の画面で解析を続ける
+
+    Returns:
+        float: 待機時間（秒）
+    """
+    start = time.time()
+    try:
+        await page.wait_for_function(
+            _RESULTS_READY_JS,
+            arg={"selectors": selectors, "texts": texts, "token": token},
+            timeout=timeout,
+            polling=100
+        )
+        elapsed = time.time() - start
+        print(f"⏱️ {label}: 表示完了まで {elapsed:.2f}秒")
+    except Exception as e:
+        elapsed = time.time() - start
+        print(f"⚠️ {label}: {elapsed:.2f}秒待機しても表示を確認できませんでした ({e})")
+    return elapsed
+
+
+async def detect_captcha(page: Page) -> bool:
+    """CAPTCHA・アクセス制限画面が表示されているかどうか"""
+    try:
+        return await page.evaluate(_CAPTCHA_JS)
+    except Exception as e:
+        print(f"CAPTCHA判定エラー: {e}")
+        return False
+
+
+async def wait_for_login(page: Page, is_logged_in: Callable[[str], bool],
+                         timeout: int = 15000, label: str = "ログイン") -> float:
+    """
+    ログイン後の画面に遷移するまで待機（URLで判定）
+
+    Returns:
+        float: 待機時間（秒）
+    """
+    start = time.time()
+    try:
+        await page.wait_for_url(is_logged_in, wait_until="domcontentloaded", timeout=timeout)
+        elapsed = time.time() - start
+        print(f"⏱️ {label}: 遷移完了まで {elapsed:.2f}秒")
+    except Exception as e:
+        elapsed = time.time() - start
+        print(f"⚠️ {label}: {elapsed:.2f}秒待機しても遷移を確認できませんでした ({e})")
+    return elapsed
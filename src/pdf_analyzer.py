@@ -3,76 +3,152 @@ PDF解析モジュール
 マイソクPDFからテキストを抽出し、物件情報を構造化
 """
 import io
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 import pdfplumber
 import PyPDF2
 import pandas as pd
+from config.settings import PDF_CONFIG
+from src.extraction_cache import ExtractionCache, hash_pdf_bytes, pattern_version
+from src.field_extractor import FieldExtractor
+from src.layout_extractor import LayoutExtractor, extract_layout_page_range
+from src.property_table import PropertyTable
+
+# 物件情報抽出用の正規表現パターン
+PROPERTY_PATTERNS = {
+    # 物件番号（例：P-001、物件№123、No.456）
+    "property_number": r"(?:物件[№No\.]*|P-|№|No\.)\s*([A-Za-z0-9\-]+)",
+    
+    # 賃料（例：12.5万円、125,000円）
+    "rent": r"(?:賃料|家賃)[:：]\s*([0-9,\.]+)\s*(?:万円|円)",
+    
+    # 住所（例：東京都新宿区...）
+    "address": r"(?:所在地|住所)[:：]\s*([^\n\r]+)",
+    
+    # 駅（例：JR山手線「新宿」駅）
+    # 最左マッチは文頭・括弧/改行の直後・「】の位置のいずれかで始まるため、そこに限定して試行する
+    "station": r"(?:^|(?<=[「」\n\r])|(?=[「】]))([^「」\n\r]*[線])?[「】]([^「」\n\r]+)[」】]\s*(?:駅|駅前)",
+    
+    # 徒歩分数（例：徒歩5分、徒歩10分）
+    "walk_time": r"徒歩\s*([0-9]+)\s*分",
+    
+    # 間取り（例：1K、2DK、3LDK）
+    "layout": r"([0-9]?[SLDK]+)",
+    
+    # 面積（例：25.5㎡、30.0m²）
+    "area": r"([0-9]+\.?[0-9]*)\s*(?:㎡|m²|平米)",
+    
+    # 築年数（例：築15年、平成20年築）
+    "age": r"(?:築\s*([0-9]+)\s*年|([平昭令和]*[0-9]+)\s*年\s*築)",
+    
+    # 管理費（例：管理費5,000円）
+    "management_fee": r"(?:管理費|共益費)[:：]\s*([0-9,]+)\s*円",
+}
+
+FIELD_EXTRACTOR = FieldExtractor(PROPERTY_PATTERNS, re.IGNORECASE)
+
+# 物件番号の直前で分割するパターン
+PROPERTY_SPLIT_PATTERN = re.compile(r"(?=(?:物件[№No\.]*|P-|№|No\.)\s*[A-Za-z0-9\-]+)")
+# 物件番号の書きかけ（番号の前まで）に使われる文字。末尾がこの文字の並びなら次の断片とつなげて分割し直す
+ANCHOR_PREFIX_CHARS = frozenset("物件№No.P-")
+
+# レイアウト解析で物件ごとにページをまとめる際、1物件に1回だけ出てくる項目（2回目が出たら次の物件）
+LAYOUT_LISTING_FIELDS = ("address", "rent")
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, end: Optional[int]) -> List[str]:
+    """指定ページ範囲のテキストを抽出（プロセスプールのワーカー用）"""
+    page_texts = []
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages[start:end]:
+            page_texts.append(page.extract_text() or "")
+    return page_texts
+
 
 class PDFAnalyzer:
     """PDFファイルを解析し、物件情報を抽出するクラス"""
     
-    def __init__(self):
+    def __init__(self, extraction_mode: Optional[str] = None):
         self.property_patterns = self._init_patterns()
+        self.field_extractor = FIELD_EXTRACTOR
+        
+        # "layout"モードでは単語座標・表から取得した項目を優先し、不足分のみ正規表現で補う
+        self.extraction_mode = extraction_mode or PDF_CONFIG["extraction_mode"]
+        self.layout_extractor = LayoutExtractor() if self.extraction_mode == "layout" else None
+        
+        if self.layout_extractor:
+            # ページのまとめ方が変わると物件の件数も変わるため、バージョンに含める
+            self.cache = ExtractionCache("full_layout", pattern_version({
+                'fields': self.property_patterns,
+                'listing_fields': LAYOUT_LISTING_FIELDS
+            }))
+        else:
+            self.cache = ExtractionCache("full", pattern_version(self.property_patterns))
     
     def _init_patterns(self) -> Dict[str, str]:
         """物件情報抽出用の正規表現パターンを定義"""
-        return {
-            # 物件番号（例：P-001、物件№123、No.456）
-            "property_number": r"(?:物件[№No\.]*|P-|№|No\.)\s*([A-Za-z0-9\-]+)",
-            
-            # 賃料（例：12.5万円、125,000円）
-            "rent": r"(?:賃料|家賃)[:：]\s*([0-9,\.]+)\s*(?:万円|円)",
-            
-            # 住所（例：東京都新宿区...）
-            "address": r"(?:所在地|住所)[:：]\s*([^\n\r]+)",
-            
-            # 駅（例：JR山手線「新宿」駅）
-            "station": r"([^「」\n\r]*[線])?[「】]([^「」\n\r]+)[」】]\s*(?:駅|駅前)",
-            
-            # 徒歩分数（例：徒歩5分、徒歩10分）
-            "walk_time": r"徒歩\s*([0-9]+)\s*分",
-            
-            # 間取り（例：1K、2DK、3LDK）
-            "layout": r"([0-9]?[SLDK]+)",
-            
-            # 面積（例：25.5㎡、30.0m²）
-            "area": r"([0-9]+\.?[0-9]*)\s*(?:㎡|m²|平米)",
-            
-            # 築年数（例：築15年、平成20年築）
-            "age": r"(?:築\s*([0-9]+)\s*年|([平昭令和]*[0-9]+)\s*年\s*築)",
-            
-            # 管理費（例：管理費5,000円）
-            "management_fee": r"(?:管理費|共益費)[:：]\s*([0-9,]+)\s*円",
-        }
+        return dict(PROPERTY_PATTERNS)
     
     def extract_text_from_pdf(self, pdf_file) -> str:
-        """PDFファイルからテキストを抽出"""
-        text = ""
+        """PDFファイルからテキストを抽出（同一内容のPDFはキャッシュから返す）"""
+        pdf_bytes = self._read_pdf_bytes(pdf_file)
+        return self._extract_text_cached(pdf_bytes, hash_pdf_bytes(pdf_bytes))
+    
+    def _extract_text_cached(self, pdf_bytes: bytes, cache_key: str) -> str:
+        """キャッシュを確認し、なければPDFから抽出して保存"""
+        text = self.cache.get_text(cache_key)
+        if text is not None:
+            return text
+        
+        text = self._extract_text_uncached(io.BytesIO(pdf_bytes))
+        if text.strip():
+            self.cache.put_text(cache_key, text)
+        
+        return text
+    
+    def _extract_text_uncached(self, pdf_file) -> str:
+        """PDFファイルからテキストを抽出（pdfplumber → PyPDF2）"""
+        return "".join(page_text + "\n" for page_text in self.iter_page_texts(pdf_file))
+    
+    def iter_page_texts(self, pdf_file) -> Iterator[str]:
+        """PDFのページテキストを1ページずつ返すジェネレーター"""
+        pages_done = 0
         
         try:
             # pdfplumberを使用してテキスト抽出
             with pdfplumber.open(pdf_file) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
+                    pages_done += 1
                     if page_text:
-                        text += page_text + "\n"
+                        yield page_text
         
         except Exception as e:
             print(f"pdfplumberでの抽出に失敗: {e}")
             
-            # PyPDF2をフォールバックとして使用
+            # PyPDF2をフォールバックとして使用（pdfplumberで処理済みのページは飛ばす）
             try:
                 pdf_file.seek(0)  # ファイルポインタをリセット
                 reader = PyPDF2.PdfReader(pdf_file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
+                for page in reader.pages[pages_done:]:
+                    yield page.extract_text()
             except Exception as e2:
                 print(f"PyPDF2での抽出にも失敗: {e2}")
-                return ""
+    
+    def iter_properties(self, pdf_file) -> Iterator[Dict[str, str]]:
+        """PDFをページ単位で読み進め、物件ブロックが確定するたびに物件情報を返す"""
+        page_texts = (page_text + "\n" for page_text in self.iter_page_texts(pdf_file))
         
-        return text
+        for i, block in enumerate(self.iter_property_blocks(page_texts)):
+            if not block.strip():
+                continue
+            
+            property_info = self._extract_single_property(block, i + 1)
+            if property_info:
+                yield property_info
     
     def extract_property_info(self, text: str) -> List[Dict[str, str]]:
         """テキストから物件情報を抽出"""
@@ -91,33 +167,128 @@ class PDFAnalyzer:
         
         return properties
     
+    def extract_properties_from_layout(self, pages: List[Tuple[str, Dict[str, str]]]) -> List[Dict[str, str]]:
+        """レイアウト解析結果（ページテキスト, 項目→値）をページのまとまりごとに1物件として物件情報を抽出"""
+        properties = []
+        
+        for i, (listing_text, layout_fields) in enumerate(self._group_layout_pages(pages)):
+            property_info = self._extract_single_property(listing_text, i + 1, layout_fields)
+            if property_info:
+                properties.append(property_info)
+        
+        return properties
+    
+    def _group_layout_pages(self, pages: List[Tuple[str, Dict[str, str]]]) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        複数ページにまたがる物件をまとめる
+        
+        物件番号のあるページ、または所在地・賃料が同じまとまりで2回目に出てきたページから次の物件とし、
+        それ以外のページ（設備・間取り図など）は直前の物件の続きとして項目を補う
+        """
+        listing_fields = set(LAYOUT_LISTING_FIELDS)
+        groups: List[Tuple[List[str], Dict[str, str], set]] = []  # (ページテキスト, 項目→値, 出てきた項目)
+        
+        for page_text, layout_fields in pages:
+            if not page_text.strip() and not layout_fields:
+                continue
+            
+            seen = set(layout_fields) | set(self.field_extractor.matched_fields(page_text, list(LAYOUT_LISTING_FIELDS)))
+            if groups:
+                texts, fields, group_seen = groups[-1]
+                starts_listing = ("property_number" in seen and group_seen & (listing_fields | {"property_number"})) \
+                    or seen & group_seen & listing_fields
+                if not starts_listing:
+                    texts.append(page_text)
+                    for field, value in layout_fields.items():
+                        fields.setdefault(field, value)
+                    group_seen |= seen
+                    continue
+            
+            groups.append(([page_text], dict(layout_fields), seen))
+        
+        return [("\n".join(texts), fields) for texts, fields, _ in groups]
+    
     def _split_into_property_blocks(self, text: str) -> List[str]:
         """テキストを物件ブロックに分割"""
-        # 物件番号パターンで分割
-        property_pattern = r"(?=(?:物件[№No\.]*|P-|№|No\.)\s*[A-Za-z0-9\-]+)"
-        blocks = re.split(property_pattern, text)
+        return list(self.iter_property_blocks([text]))
+    
+    def iter_property_blocks(self, text_chunks: Iterable[str]) -> Iterator[str]:
+        """
+        ページ等のテキスト断片を順に受け取り、確定した物件ブロックから返す
         
-        # 空のブロックを除去
-        blocks = [block.strip() for block in blocks if block.strip()]
+        次の物件番号が現れた時点で直前のブロックを確定させる。
+        物件番号で2ブロック以上に分割できなかった場合は全体を1つの物件として返す。
+        """
+        pending: List[str] = []  # 未確定の末尾ブロックのうち、物件番号を含まないことが確定した断片
+        tail = ""  # 未確定の末尾ブロックの残り（物件番号の書きかけの可能性がある部分）
+        head_chunks: List[str] = []  # 2ブロック目が見つかるまでの全文（分割できなかった場合用）
+        first_block = None
+        block_count = 0
         
-        # 分割できなかった場合、全体を1つの物件として扱う
-        if len(blocks) <= 1:
-            blocks = [text]
+        def complete(part: str) -> Iterator[str]:
+            nonlocal first_block, block_count
+            # 空のブロックを除去
+            block = part.strip()
+            if not block:
+                return
+            block_count += 1
+            if block_count == 1:
+                first_block = block
+            elif block_count == 2:
+                yield first_block
+                yield block
+            else:
+                yield block
         
-        return blocks
+        for chunk in text_chunks:
+            if block_count < 2:
+                head_chunks.append(chunk)
+            
+            # 新しい断片（と書きかけの末尾）だけを物件番号パターンで分割し、末尾以外のブロックを確定
+            # （確定済みの断片は再走査しないため、物件番号のない長い文書でもページ数に比例する処理量）
+            parts = PROPERTY_SPLIT_PATTERN.split(tail + chunk)
+            rest = parts.pop()
+            if parts:
+                parts[0] = "".join(pending) + parts[0]
+                pending = []
+                for part in parts:
+                    yield from complete(part)
+            
+            cut = len(rest)
+            while cut and (rest[cut - 1] in ANCHOR_PREFIX_CHARS or rest[cut - 1].isspace()):
+                cut -= 1
+            pending.append(rest[:cut])
+            tail = rest[cut:]
+        
+        yield from complete("".join(pending) + tail)
+        
+        # 分割できなかった場合、全体を1つの物件として扱う
+        if block_count <= 1:
+            yield "".join(head_chunks)
     
-    def _extract_single_property(self, text: str, property_index: int) -> Optional[Dict[str, str]]:
-        """単一の物件ブロックから情報を抽出"""
+    def _extract_single_property(self, text: str, property_index: int,
+                                 layout_fields: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        """単一の物件ブロックから情報を抽出（layout_fieldsがあればその値を優先）"""
         property_info = {
             "property_index": str(property_index),
             "raw_text": text[:500]  # 先頭500文字を保存
         }
         
         extracted_count = 0
+        layout_fields = layout_fields or {}
+        
+        # レイアウトで全項目が取れていれば平文テキストへの正規表現は不要
+        if all(layout_fields.get(field) for field in self.field_extractor.fields):
+            matches = {}
+        else:
+            matches = self.field_extractor.extract(text)
         
-        for field, pattern in self.property_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
+        for field in self.field_extractor.fields:
+            match = matches.get(field)
+            if layout_fields.get(field):
+                property_info[field] = layout_fields[field]
+                extracted_count += 1
+            elif match:
                 if field == "rent":
                     # 賃料の数値を正規化
                     rent_str = match.group(1).replace(",", "")
@@ -144,12 +315,12 @@ class PDFAnalyzer:
         
         return None
     
-    def save_extracted_data(self, properties: List[Dict[str, str]], output_path: str) -> str:
-        """抽出データをCSVファイルに保存"""
-        if not properties:
+    def save_extracted_data(self, properties: Union[PropertyTable, List[Dict[str, str]]], output_path: str) -> str:
+        """抽出データ（PropertyTable または物件dictのリスト）をCSVファイルに保存"""
+        if not len(properties):
             return ""
         
-        df = pd.DataFrame(properties)
+        df = properties.to_frame() if isinstance(properties, PropertyTable) else pd.DataFrame(properties)
         
         # 列順序を整理
         column_order = [
@@ -168,8 +339,22 @@ class PDFAnalyzer:
         
         return str(output_file)
     
-    def analyze_multiple_pdfs(self, pdf_files: List) -> List[Dict[str, str]]:
-        """複数のPDFファイルを解析"""
+    def analyze_to_table(self, pdf_files: List, max_workers: Optional[int] = None,
+                         keep_raw_text: bool = False) -> PropertyTable:
+        """複数のPDFファイルを解析し、列指向の PropertyTable で返す（raw_text は既定で保持しない）"""
+        return PropertyTable.from_records(self.analyze_multiple_pdfs(pdf_files, max_workers), keep_raw_text)
+    
+    def analyze_multiple_pdfs(self, pdf_files: List, max_workers: Optional[int] = None) -> List[Dict[str, str]]:
+        """複数のPDFファイルを解析（max_workersが2以上ならプロセスプールで並列処理）"""
+        workers = max_workers if max_workers is not None else PDF_CONFIG["max_workers"]
+        
+        if workers <= 1 or not pdf_files:
+            return self._analyze_multiple_pdfs_sequential(pdf_files)
+        
+        return self._analyze_multiple_pdfs_parallel(pdf_files, workers)
+    
+    def _analyze_multiple_pdfs_sequential(self, pdf_files: List) -> List[Dict[str, str]]:
+        """複数のPDFファイルを1件ずつ解析"""
         all_properties = []
         
         for i, pdf_file in enumerate(pdf_files):
@@ -178,20 +363,153 @@ class PDFAnalyzer:
             # ファイル名を記録
             file_name = getattr(pdf_file, 'name', f'file_{i+1}')
             
-            # テキスト抽出
-            text = self.extract_text_from_pdf(pdf_file)
-            if not text.strip():
-                print(f"  警告: {file_name} からテキストを抽出できませんでした")
+            pdf_bytes = self._read_pdf_bytes(pdf_file)
+            cache_key = hash_pdf_bytes(pdf_bytes)
+            
+            if self.layout_extractor:
+                all_properties.extend(self._extract_file_properties_layout(pdf_bytes, file_name, cache_key))
                 continue
             
-            # 物件情報抽出
-            properties = self.extract_property_info(text)
+            # テキスト抽出
+            text = self._extract_text_cached(pdf_bytes, cache_key)
+            all_properties.extend(self._extract_file_properties(text, file_name, cache_key))
+        
+        return all_properties
+    
+    def _analyze_multiple_pdfs_parallel(self, pdf_files: List, max_workers: int) -> List[Dict[str, str]]:
+        """複数のPDFファイルをページ範囲単位でワーカープロセスに分散して解析"""
+        all_properties = []
+        pages_per_task = max(1, PDF_CONFIG["pages_per_task"])
+        
+        mp_context = multiprocessing.get_context(PDF_CONFIG["process_start_method"])
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            # 全ファイルのタスクを先に投入し、結果は元のファイル順で回収する
+            submitted = []
+            for i, pdf_file in enumerate(pdf_files):
+                file_name = getattr(pdf_file, 'name', f'file_{i+1}')
+                pdf_bytes = self._read_pdf_bytes(pdf_file)
+                cache_key = hash_pdf_bytes(pdf_bytes)
+                futures = []
+                
+                if self.layout_extractor:
+                    # レイアウトモードは物件情報のキャッシュがなければページ範囲ごとに解析
+                    # （投入時に取得した物件情報を回収時にそのまま使い、キャッシュは読み直さない）
+                    cached = self.cache.get_properties(cache_key)
+                    if cached is None:
+                        futures = [
+                            executor.submit(extract_layout_page_range, pdf_bytes, cache_key, start, end)
+                            for start, end in self._split_page_ranges(pdf_bytes, pages_per_task)
+                        ]
+                else:
+                    cached = self.cache.get_text(cache_key)
+                    if cached is None:
+                        futures = [
+                            executor.submit(_extract_page_range, pdf_bytes, start, end)
+                            for start, end in self._split_page_ranges(pdf_bytes, pages_per_task)
+                        ]
+                submitted.append((file_name, pdf_bytes, cache_key, cached, futures))
             
-            # ファイル名を各物件に追加
-            for prop in properties:
-                prop["source_file"] = file_name
+            for i, (file_name, pdf_bytes, cache_key, cached, futures) in enumerate(submitted):
+                print(f"PDF {i+1}/{len(submitted)} を処理中...")
+                
+                if self.layout_extractor:
+                    pages = None
+                    if futures:
+                        try:
+                            pages = [page for future in futures for page in future.result()]
+                        except Exception as e:
+                            print(f"  並列レイアウト解析に失敗: {e}")
+                    all_properties.extend(
+                        self._extract_file_properties_layout(pdf_bytes, file_name, cache_key, pages, cached)
+                    )
+                    continue
+                
+                text = cached
+                if text is None:
+                    try:
+                        page_texts = [page_text for future in futures for page_text in future.result()]
+                        text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+                        if text.strip():
+                            self.cache.put_text(cache_key, text)
+                    except Exception as e:
+                        # ワーカーで失敗した場合はPyPDF2フォールバック付きの逐次抽出に切り替え
+                        print(f"  並列抽出に失敗: {e}")
+                        text = self._extract_text_cached(pdf_bytes, cache_key)
+                
+                all_properties.extend(self._extract_file_properties(text, file_name, cache_key))
+        
+        return all_properties
+    
+    def _extract_file_properties(self, text: str, file_name: str, cache_key: str) -> List[Dict[str, str]]:
+        """1ファイル分のテキストから物件情報を抽出し、ファイル名を付与"""
+        if not text.strip():
+            print(f"  警告: {file_name} からテキストを抽出できませんでした")
+            return []
+        
+        # 物件情報抽出（パターンが変わっていなければキャッシュを利用）
+        properties = self.cache.get_properties(cache_key)
+        if properties is None:
+            properties = self.extract_property_info(text)
+            self.cache.put_properties(cache_key, properties)
+        
+        # ファイル名を各物件に追加
+        for prop in properties:
+            prop["source_file"] = file_name
+        
+        print(f"  {len(properties)}件の物件情報を抽出")
+        return properties
+    
+    def _extract_file_properties_layout(self, pdf_bytes: bytes, file_name: str, cache_key: str,
+                                        pages: Optional[List[Tuple[str, Dict[str, str]]]] = None,
+                                        properties: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        1ファイル分をレイアウト解析して物件情報を抽出し、ファイル名を付与
+        
+        pages（解析済みのページ）・properties（取得済みの物件情報）のどちらもなければキャッシュを確認
+        """
+        if properties is None and pages is None:
+            properties = self.cache.get_properties(cache_key)
+        
+        if properties is None:
+            if pages is None:
+                try:
+                    pages = self.layout_extractor.extract_pages(pdf_bytes, cache_key)
+                except Exception as e:
+                    # レイアウト解析できないPDFは平文テキストでの解析に切り替え
+                    print(f"  レイアウト解析に失敗: {e}")
+                    text = self._extract_text_cached(pdf_bytes, cache_key)
+                    return self._extract_file_properties(text, file_name, cache_key)
             
-            all_properties.extend(properties)
-            print(f"  {len(properties)}件の物件情報を抽出")
+            properties = self.extract_properties_from_layout(pages)
+            self.cache.put_properties(cache_key, properties)
+        
+        for prop in properties:
+            prop["source_file"] = file_name
+        
+        print(f"  {len(properties)}件の物件情報を抽出")
+        return properties
+    
+    def _read_pdf_bytes(self, pdf_file) -> bytes:
+        """パスまたはファイルオブジェクトからPDFのバイト列を取得"""
+        if isinstance(pdf_file, (str, Path)):
+            return Path(pdf_file).read_bytes()
+        
+        pdf_file.seek(0)
+        return pdf_file.read()
+    
+    def _split_page_ranges(self, pdf_bytes: bytes, pages_per_task: int) -> List[Tuple[int, Optional[int]]]:
+        """PDFをワーカーに渡すページ範囲に分割"""
+        try:
+            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+                page_count = len(pdf.pages)
+        except Exception:
+            # ページ数が取れない場合はファイル単位で渡し、失敗時のフォールバックに任せる
+            return [(0, None)]
+        
+        if page_count <= pages_per_task:
+            return [(0, None)]
         
-        return all_properties
\ No newline at end of file
+        return [
+            (start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
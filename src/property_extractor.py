@@ -3,8 +3,19 @@
 抽出された生データを物確用に最適化
 """
 import re
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Union
+from dataclasses import dataclass, fields
+import numpy as np
+import pandas as pd
+from src.address_normalizer import canonicalize_address
+from src.property_table import PropertyTable, map_unique
+
+# 全角英数字 → 半角の変換表（間取りの「１ＬＤＫ」など）
+FULLWIDTH_TRANSLATION = str.maketrans(
+    "０１２３４５６７８９ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ",
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+)
+AREA_NUMBER_PATTERN = re.compile(r"([0-9]+\.?[0-9]*)")
 
 @dataclass
 class PropertyInfo:
@@ -25,17 +36,17 @@ class PropertyInfo:
         """物確検索用キーワードリストを生成"""
         keywords = []
         
-        # 住所から検索キーワード抽出
+        # 住所から検索キーワード抽出（住所辞書で都道府県・市区町村・町域に分解）
         if self.address:
-            # 区までの住所を抽出（例：東京都新宿区）
-            address_match = re.search(r"([^市区町村]+[市区町村])", self.address)
-            if address_match:
-                keywords.append(address_match.group(1))
+            address = canonicalize_address(self.address)
+            
+            # 区までの住所（例：東京都新宿区）
+            if address.city:
+                keywords.append(address.prefecture + address.city)
             
-            # 町名を抽出（例：歌舞伎町）
-            town_match = re.search(r"([^0-9\-]+)[0-9\-]", self.address)
-            if town_match:
-                keywords.append(town_match.group(1))
+            # 区と町名（例：新宿区歌舞伎町）
+            if address.town:
+                keywords.append(address.city + address.town)
         
         # 駅名を抽出
         if self.station_info:
@@ -54,25 +65,26 @@ class PropertyInfo:
             keywords.append(self.layout)
         
         return keywords
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, str]) -> "PropertyInfo":
+        """dict（PropertyTable の1行など）から作成（足りない項目は空文字）"""
+        return cls(**{field.name: record.get(field.name, "") for field in fields(cls)})
 
 class PropertyExtractor:
     """物件情報を抽出・正規化するクラス"""
     
     def __init__(self):
         self.normalization_rules = self._init_normalization_rules()
+        # 除去パターンは一度だけコンパイル（適用順はルールの定義順）
+        self.compiled_remove_patterns = {
+            kind: [re.compile(pattern) for pattern in rules.get("remove_patterns", [])]
+            for kind, rules in self.normalization_rules.items()
+        }
     
     def _init_normalization_rules(self) -> Dict[str, Dict]:
         """正規化ルールを初期化"""
         return {
-            "address": {
-                "remove_patterns": [r"\s+", r"（[^）]*）"],  # 余分な空白、括弧内文字を除去
-                "replace_patterns": {
-                    "ー": "-",
-                    "−": "-",
-                    "番地": "",
-                    "号室": "",
-                }
-            },
             "station": {
                 "remove_patterns": [r"[「」『』]"],
                 "replace_patterns": {
@@ -86,10 +98,13 @@ class PropertyExtractor:
             }
         }
     
-    def normalize_properties(self, raw_properties: List[Dict[str, str]]) -> List[PropertyInfo]:
-        """生の物件データを正規化してPropertyInfoオブジェクトに変換"""
+    def normalize_properties(self, raw_properties: Union[PropertyTable, List[Dict[str, str]]]) -> List[PropertyInfo]:
+        """生の物件データ（PropertyTable または物件dictのリスト）を正規化してPropertyInfoオブジェクトに変換"""
         normalized_properties = []
         
+        if isinstance(raw_properties, PropertyTable):
+            raw_properties = raw_properties.iter_records()
+        
         for i, raw_prop in enumerate(raw_properties):
             try:
                 # PropertyInfoオブジェクトを作成
@@ -115,6 +130,54 @@ class PropertyExtractor:
         
         return normalized_properties
     
+    def normalize_table(self, raw_properties: Union[PropertyTable, List[Dict[str, str]]]) -> PropertyTable:
+        """
+        生の物件データを列単位でまとめて正規化し、PropertyTable で返す
+        
+        列ごとに値の種類を洗い出し（pandas.factorize）、正規化ルールは種類ごとに1回だけ適用して
+        NumPy の添字参照で全行に戻す（結果は normalize_properties と同じ、raw_text は保持しない）
+        """
+        if isinstance(raw_properties, PropertyTable):
+            frame = raw_properties.to_frame()
+        else:
+            frame = pd.DataFrame(list(raw_properties))
+        
+        def column(name: str) -> pd.Series:
+            if name not in frame.columns:
+                return pd.Series([""] * len(frame), index=frame.index, dtype=object)
+            return frame[name].astype(object).fillna("").astype(str)
+        
+        # 物件番号がなければ「ファイル名先頭3文字_連番」
+        source_files = column("source_file")
+        property_numbers = column("property_number").to_numpy(dtype=object)
+        source_prefixes = map_unique(source_files, lambda source_file: source_file[:3]).to_numpy(dtype=object)
+        property_ids = np.array([
+            number or f"{prefix}_{i + 1:03d}"
+            for i, (number, prefix) in enumerate(zip(property_numbers, source_prefixes))
+        ], dtype=object)
+        
+        normalized = pd.DataFrame({
+            "property_id": property_ids,
+            "address": map_unique(column("address"), self._normalize_address),
+            "rent": map_unique(column("rent"), self._normalize_rent),
+            "layout": map_unique(column("layout"), self._normalize_layout),
+            "area": map_unique(column("area"), self._normalize_area),
+            "station_info": map_unique(column("station"), self._normalize_station),
+            "walk_time": column("walk_time"),
+            "age": column("age"),
+            "management_fee": column("management_fee"),
+            "source_file": source_files,
+        }, index=frame.index)
+        return PropertyTable.from_frame(normalized)
+    
+    def _apply_rules(self, value: str, kind: str) -> str:
+        """除去パターン・置換ルールを1件の値に適用"""
+        for pattern in self.compiled_remove_patterns[kind]:
+            value = pattern.sub("", value)
+        for old, new in self.normalization_rules[kind].get("replace_patterns", {}).items():
+            value = value.replace(old, new)
+        return value.strip()
+    
     def _generate_property_id(self, raw_prop: Dict[str, str], index: int) -> str:
         """物件IDを生成"""
         # 元の物件番号がある場合はそれを使用
@@ -133,47 +196,24 @@ class PropertyExtractor:
         if not address:
             return ""
         
-        normalized = address
-        
-        # 不要パターンの除去
-        for pattern in self.normalization_rules["address"]["remove_patterns"]:
-            normalized = re.sub(pattern, "", normalized)
-        
-        # 置換ルールの適用
-        for old, new in self.normalization_rules["address"]["replace_patterns"].items():
-            normalized = normalized.replace(old, new)
-        
-        return normalized.strip()
+        # 都道府県・市区町村・町域・丁目・番地にそろえた正規形（建物名・部屋番号は含めない）
+        return canonicalize_address(address).text
     
     def _normalize_station(self, station_info: str) -> str:
         """駅情報を正規化"""
         if not station_info:
             return ""
         
-        normalized = station_info
-        
-        # 不要パターンの除去
-        for pattern in self.normalization_rules["station"]["remove_patterns"]:
-            normalized = re.sub(pattern, "", normalized)
-        
-        # 置換ルールの適用
-        for old, new in self.normalization_rules["station"]["replace_patterns"].items():
-            normalized = normalized.replace(old, new)
-        
-        return normalized.strip()
+        # 不要パターンの除去・置換ルールの適用
+        return self._apply_rules(station_info, "station")
     
     def _normalize_rent(self, rent: str) -> str:
         """賃料を正規化"""
         if not rent:
             return ""
         
-        normalized = rent
-        
         # カンマの除去
-        for pattern in self.normalization_rules["rent"]["remove_patterns"]:
-            normalized = re.sub(pattern, "", normalized)
-        
-        return normalized.strip()
+        return self._apply_rules(rent, "rent")
     
     def _normalize_layout(self, layout: str) -> str:
         """間取りを正規化"""
@@ -183,8 +223,8 @@ class PropertyExtractor:
         # 標準的な間取り形式に正規化（例：1K、2DK、3LDK）
         normalized = layout.upper().strip()
         
-        # 全角数字を半角に変換
-        normalized = normalized.translate(str.maketrans("０１２３４５６７８９", "0123456789"))
+        # 全角英数字を半角に変換
+        normalized = normalized.translate(FULLWIDTH_TRANSLATION)
         
         return normalized
     
@@ -194,16 +234,19 @@ class PropertyExtractor:
             return ""
         
         # 数値部分を抽出
-        area_match = re.search(r"([0-9]+\.?[0-9]*)", area)
+        area_match = AREA_NUMBER_PATTERN.search(area)
         if area_match:
             return f"{area_match.group(1)}㎡"
         
         return area
     
-    def create_search_combinations(self, properties: List[PropertyInfo]) -> List[Dict[str, str]]:
+    def create_search_combinations(self, properties: Union[PropertyTable, List[PropertyInfo]]) -> List[Dict[str, str]]:
         """物確検索用の組み合わせを作成"""
         search_combinations = []
         
+        if isinstance(properties, PropertyTable):
+            properties = (PropertyInfo.from_record(record) for record in properties.iter_records())
+        
         for prop in properties:
             keywords = prop.to_search_keywords()
             
@@ -229,8 +272,18 @@ class PropertyExtractor:
         
         return search_combinations
     
-    def filter_valid_properties(self, properties: List[PropertyInfo]) -> List[PropertyInfo]:
-        """有効な物件のみをフィルタリング"""
+    def filter_valid_properties(self, properties: Union[PropertyTable, List[PropertyInfo]]) -> Union[PropertyTable, List[PropertyInfo]]:
+        """有効な物件のみをフィルタリング（PropertyTable は列単位でまとめて判定）"""
+        if isinstance(properties, PropertyTable):
+            def present(column):
+                return (properties.column(column).astype(str) != "").to_numpy()
+            
+            valid = (present("address") | present("station_info")) & (present("rent") | present("layout"))
+            skipped = len(properties) - int(valid.sum())
+            if skipped:
+                print(f"無効な物件をスキップ: {skipped}件")
+            return properties.filter(valid)
+        
         valid_properties = []
         
         for prop in properties:
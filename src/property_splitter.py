@@ -0,0 +1,70 @@
+"""
+物件ブロック分割モジュール
+複数物件をまとめたマイソクのテキストを、全文を1回走査するだけで物件ごとのブロックに分割
+"""
+import re
+from typing import Dict, List, Set
+
+# PDFテキスト抽出時にページ間に挟む区切り文字（改ページ）
+PAGE_BREAK = "\f"
+
+# 行頭に現れる区切りの目印（名前付きグループ名が目印の種類）
+#   number: 物件番号（物件番号: 123、No.5、№12、P-001）
+#   header: 物件ごとに繰り返される見出し（【物件概要】、■募集概要 など）
+#   address / rent: 物件ごとに1回ずつ現れる項目名（2回目が出たら次の物件）
+BOUNDARY_ANCHORS: Dict[str, str] = {
+    "number": r"(?:物件(?:番号|No\.?|№)|No\.|№|P-)\s*[:：]?\s*[A-Za-z0-9][A-Za-z0-9\-]*",
+    "header": r"[■□●◆【\[]?\s*(?:物件概要|募集概要|物件情報|募集要項)\s*[】\]]?\s*$",
+    "address": r"(?:所在地|住所)[\s:：]*\S",
+    "rent": r"(?:賃料|家賃)[\s:：]*[0-9０-９]",
+}
+BOUNDARY_PATTERN = re.compile(
+    r"^[\s・●■□◆]*(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in BOUNDARY_ANCHORS.items()) + ")",
+    re.IGNORECASE
+)
+
+# ページの区切りで物件を確定してよい項目（揃っていなければ次ページに続く物件とみなす）
+COMPLETE_FIELDS = {"address", "rent"}
+
+
+class PropertySplitter:
+    """
+    物件ブロック分割
+
+    行を先頭から1回だけ走査し、次のいずれかで新しいブロックを開始する
+    - 物件番号・見出しの行（直前のブロックに物件番号か項目がある場合）
+    - 直前のブロックで既に出てきた項目名（所在地・賃料）の行
+    - 改ページ（直前のブロックの所在地・賃料が揃っている場合）
+    """
+
+    def split(self, text: str) -> List[str]:
+        """テキストを物件ブロックの一覧に分割（区切りがなければ全体で1ブロック）"""
+        blocks: List[str] = []
+        current: List[str] = []
+        seen: Set[str] = set()  # 現在のブロックに出てきた目印の種類
+
+        def flush():
+            block = "\n".join(current).strip()
+            if block:
+                blocks.append(block)
+            current.clear()
+            seen.clear()
+
+        for page_index, page_text in enumerate(text.split(PAGE_BREAK)):
+            if page_index and COMPLETE_FIELDS <= seen:
+                flush()
+
+            for line in page_text.splitlines():
+                match = BOUNDARY_PATTERN.match(line)
+                if match:
+                    anchor = match.lastgroup
+                    if anchor in ("number", "header"):
+                        if seen - {"header"} and (anchor == "number" or seen & COMPLETE_FIELDS):
+                            flush()
+                    elif anchor in seen:
+                        flush()
+                    seen.add(anchor)
+                current.append(line)
+
+        flush()
+        return blocks
@@ -0,0 +1,117 @@
+"""
+物件テーブルモジュール
+物件情報を列指向（pandas / NumPy）で保持し、間取り・駅・市区町村などの繰り返しの多い列はカテゴリ型で共有
+（物件ごとの dict / dataclass のリストに比べてメモリが少なく、絞り込みを列単位でまとめて実行できる）
+"""
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+import numpy as np
+import pandas as pd
+from src.address_normalizer import canonicalize_address
+
+# カテゴリ型で保持する列（値の種類が少なく、物件間で繰り返し出てくる列）
+CATEGORICAL_COLUMNS = ("layout", "station", "station_info", "city", "source_file")
+
+
+def map_unique(values: pd.Series, func: Callable[[str], str]) -> pd.Series:
+    """
+    列の値の種類ごとに1回だけ func を適用し、全行の結果を返す
+
+    値の種類は pandas.factorize（ハッシュ）で洗い出し、結果は NumPy の添字参照で全行に戻す
+    （同じ値が繰り返し出てくる列ほど、1行ずつ適用するより速い）
+    """
+    codes, uniques = pd.factorize(values)
+    mapped = np.array([func(value) for value in uniques], dtype=object)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def _city(address: str) -> str:
+    """住所の都道府県＋市区町村（例：東京都新宿区、神奈川県横浜市西区）"""
+    canonical = canonicalize_address(address)
+    return canonical.prefecture + canonical.city
+
+
+class PropertyTable:
+    """
+    列指向の物件テーブル
+
+    - 列は PDFAnalyzer の抽出結果・PropertyInfo の項目名そのまま（足りない列は空文字）
+    - address 列があれば市区町村の city 列を付加
+    - raw_text（抽出元テキストの先頭500文字）は keep_raw_text=True の場合のみ保持
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self._frame = frame
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], keep_raw_text: bool = False) -> "PropertyTable":
+        """dict または dataclass（PropertyInfo など）の並びからテーブルを作成"""
+        rows = [asdict(record) if is_dataclass(record) else dict(record) for record in records]
+        return cls.from_frame(pd.DataFrame(rows), keep_raw_text)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, keep_raw_text: bool = False) -> "PropertyTable":
+        """DataFrame からテーブルを作成（列の型をそろえ、カテゴリ列を変換）"""
+        frame = frame.copy()
+        if not keep_raw_text and "raw_text" in frame.columns:
+            frame = frame.drop(columns="raw_text")
+
+        for column in frame.columns:
+            frame[column] = frame[column].astype(object).fillna("").astype(str)
+        if "address" in frame.columns:
+            frame["city"] = map_unique(frame["address"], _city)
+
+        for column in CATEGORICAL_COLUMNS:
+            if column in frame.columns:
+                frame[column] = frame[column].astype("category")
+        return cls(frame.reset_index(drop=True))
+
+    @classmethod
+    def concat(cls, tables: Iterable["PropertyTable"]) -> "PropertyTable":
+        """複数のテーブルを縦に結合"""
+        frames = [table._frame for table in tables]
+        if not frames:
+            return cls(pd.DataFrame())
+        return cls.from_frame(pd.concat(frames, ignore_index=True), keep_raw_text=True)
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._frame.columns)
+
+    def column(self, name: str) -> pd.Series:
+        """列を取得（存在しない列は空文字の列）"""
+        if name in self._frame.columns:
+            return self._frame[name]
+        return pd.Series([""] * len(self._frame), index=self._frame.index, dtype=str)
+
+    def filter(self, mask) -> "PropertyTable":
+        """真偽値の列（Series・配列）で行を絞り込み"""
+        return PropertyTable(self._frame[np.asarray(mask, dtype=bool)].reset_index(drop=True))
+
+    def where(self, **equals: str) -> "PropertyTable":
+        """列の値が一致する行に絞り込み（例：where(city="東京都新宿区", layout="1K")）"""
+        mask = np.ones(len(self._frame), dtype=bool)
+        for name, value in equals.items():
+            mask &= (self.column(name) == value).to_numpy(dtype=bool)
+        return self.filter(mask)
+
+    def iter_records(self) -> Iterator[Dict[str, str]]:
+        """1行ずつ dict で返す（カテゴリ列も文字列）"""
+        columns = self.columns
+        for values in self._frame.astype(object).itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+
+    def records(self) -> List[Dict[str, str]]:
+        """全行を dict のリストで取得"""
+        return list(self.iter_records())
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame のコピーを取得（CSV・Excel 出力用）"""
+        return self._frame.copy()
+
+    def memory_usage(self) -> int:
+        """テーブルの使用メモリ（バイト）"""
+        return int(self._frame.memory_usage(deep=True).sum())
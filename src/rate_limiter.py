@@ -0,0 +1,136 @@
+"""
+リクエスト間隔制御モジュール
+サイトごとのトークンバケットで、固定スリープの代わりに平均リクエスト数を制限
+（HTTP 429・CAPTCHA・応答時間の悪化で減速し、正常応答が続けば徐々に回復）
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from config.settings import BUKKATSU_CONFIG
+
+
+class TokenBucket:
+    """
+    非同期トークンバケット
+
+    rate 個/秒でトークンが補充され、最大 capacity 個まで貯まる。
+    acquire() はトークンを1つ消費し、足りなければ補充されるまで待機する。
+    ジョブ・一括物確など別スレッドのイベントループからも共有されるため、状態の更新はロック内で行う。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """経過時間分のトークンを補充（ロックを保持した状態で呼ぶ）"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """トークンを1つ取得（必要なら待機）"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait_seconds)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    応答状況に応じて補充レートを自動調整するトークンバケット
+
+    - 開始時は max_rate（速く始める）
+    - HTTP 429・CAPTCHA検知で throttle_backoff 倍に減速し、溜まったトークンも破棄
+    - 応答時間が平均の latency_factor 倍を超えたら latency_backoff 倍に減速
+    - 正常応答ごとに recovery_step ずつ max_rate まで回復
+    """
+
+    def __init__(self, site: str, pacing: Optional[Dict[str, float]] = None, capacity: Optional[float] = None):
+        pacing = pacing or BUKKATSU_CONFIG["pacing"]
+        super().__init__(rate=pacing["max_rate"], capacity=capacity or BUKKATSU_CONFIG["request_burst"])
+        self.site = site
+        self.max_rate = pacing["max_rate"]
+        self.min_rate = pacing["min_rate"]
+        self.throttle_backoff = pacing["throttle_backoff"]
+        self.latency_backoff = pacing["latency_backoff"]
+        self.latency_factor = pacing["latency_factor"]
+        self.recovery_step = pacing["recovery_step"]
+        self.average_latency: Optional[float] = None
+        self.throttle_count = 0
+        self.slow_response_count = 0
+
+    @property
+    def current_rate(self) -> float:
+        """現在の補充レート（件/秒）"""
+        return self.rate
+
+    def record_response(self, latency: float):
+        """正常応答を記録（応答時間が悪化していれば減速、そうでなければ回復）"""
+        with self._lock:
+            slow = self.average_latency is not None and latency > self.average_latency * self.latency_factor
+            if slow:
+                self.slow_response_count += 1
+                self._set_rate(self.rate * self.latency_backoff)
+            else:
+                self._set_rate(self.rate + self.recovery_step)
+
+            if self.average_latency is None:
+                self.average_latency = latency
+            else:
+                self.average_latency = self.average_latency * 0.8 + latency * 0.2
+            rate = self.rate
+
+        if slow:
+            print(f"🐢 {self.site}: 応答時間悪化（{latency:.1f}秒）のため {rate:.2f}件/秒に減速")
+
+    def record_throttle(self, reason: str):
+        """アクセス制限（HTTP 429・CAPTCHAなど）を記録して減速"""
+        with self._lock:
+            self.throttle_count += 1
+            self._set_rate(self.rate * self.throttle_backoff)
+            self.tokens = 0
+            rate = self.rate
+        print(f"⚠️ {self.site}: {reason}を検知したため {rate:.2f}件/秒に減速")
+
+    def stats(self) -> Dict[str, float]:
+        """調整状況を取得"""
+        with self._lock:
+            return {
+                "current_rate": round(self.rate, 3),
+                "average_latency": round(self.average_latency or 0.0, 3),
+                "throttle_count": self.throttle_count,
+                "slow_response_count": self.slow_response_count,
+            }
+
+    def _set_rate(self, rate: float):
+        """補充レートを変更（ロックを保持した状態で呼ぶ）"""
+        self._refill()  # 変更前のレートで補充済みにしてから切り替える
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+
+_SITE_LIMITERS: Dict[str, AdaptiveRateLimiter] = {}
+_SITE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(site: str) -> AdaptiveRateLimiter:
+    """サイトごとに共有するレート制御を取得"""
+    with _SITE_LIMITERS_LOCK:
+        if site not in _SITE_LIMITERS:
+            _SITE_LIMITERS[site] = AdaptiveRateLimiter(site)
+        return _SITE_LIMITERS[site]
+
+
+def pacing_stats() -> Dict[str, Dict[str, float]]:
+    """全サイトの現在のレートと調整状況を取得"""
+    with _SITE_LIMITERS_LOCK:
+        limiters = list(_SITE_LIMITERS.items())
+    return {site: limiter.stats() for site, limiter in limiters}
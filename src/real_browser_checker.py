@@ -5,6 +5,10 @@ Chrome MCPを使用してITANDI・いえらぶBB・ATBB等に実際にログイ
 import time
 import re
 from typing import Dict, List, Optional, Any
+from src.address_normalizer import canonicalize_address
+from src.result_cache import SiteResultCache, property_fingerprint
+from src.single_flight import SingleFlight
+from src.site_search import SearchCancelled, search_cancelled
 
 # ログイン情報
 LOGIN_CREDENTIALS = {
@@ -30,13 +34,19 @@ LOGIN_CREDENTIALS = {
     }
 }
 
+# 同じ物件・サイトの物確が同時に要求された場合は1回だけ実行（プロセス内で共有）
+_site_check_flight = SingleFlight()
+
+
 class RealBrowserPropertyChecker:
     """実際のブラウザ自動化による物確システム"""
     
-    def __init__(self):
+    def __init__(self, force_refresh: bool = False, result_cache: Optional[SiteResultCache] = None):
         self.results = []
         self.property_data = None
         self.browser_available = True
+        self.force_refresh = force_refresh  # Trueならキャッシュを使わず再確認
+        self.result_cache = result_cache or SiteResultCache()
         
     def perform_bukkaku(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -51,15 +61,15 @@ class RealBrowserPropertyChecker:
         
         # 1. ITANDI物確
         print("🔍 ITANDI実際ログイン物確開始...")
-        itandi_result = self._check_itandi_real()
+        itandi_result = self.check_site('ITANDI')
         
         # 2. いえらぶBB物確
         print("🔍 いえらぶBB実際ログイン物確開始...")
-        ierabu_result = self._check_ierabu_real()
+        ierabu_result = self.check_site('いえらぶBB')
         
         # 3. ATBB物確
         print("🔍 ATBB実際ログイン物確開始...")
-        atbb_result = self._check_atbb_real()
+        atbb_result = self.check_site('ATBB')
         
         # 結果集約
         overall_found = any([
@@ -85,6 +95,66 @@ class RealBrowserPropertyChecker:
             'execution_time': time.time()
         }
     
+    def check_site(self, site_name: str) -> Dict[str, Any]:
+        """
+        サイトごとの物確（有効期間内の確認結果があればサイトにアクセスせず返す）
+        
+        同じ物件・サイトの物確が実行中なら、新たにブラウザを起動せず完了を待って結果を共有
+        
+        Args:
+            site_name: 'ITANDI'・'いえらぶBB'・'ATBB'
+        Returns:
+            物確結果（キャッシュから返した場合は cached_at に確認日時）
+        """
+        checks = {
+            'ITANDI': self._check_itandi_real,
+            'いえらぶBB': self._check_ierabu_real,
+            'ATBB': self._check_atbb_real,
+        }
+        fingerprint = property_fingerprint(self.property_data)
+        
+        if not self.force_refresh:
+            cached = self.result_cache.get(fingerprint, site_name)
+            if cached is not None:
+                print(f"💾 {site_name}: {cached['cached_at']}の確認結果を使用")
+                return cached
+        
+        def run_check():
+            result = checks[site_name]()
+            self.result_cache.put(fingerprint, site_name, result)
+            return result
+        
+        while True:
+            # 並列検索で打ち切られていれば（他サイトで確認済み・タイムアウト）ブラウザを起動しない
+            if search_cancelled():
+                return self._cancelled_result(site_name)
+            try:
+                result, shared = _site_check_flight.do((fingerprint, site_name), run_check)
+            except SearchCancelled:
+                # 共有していた物確が打ち切られた場合、自分の検索が打ち切られていなければ実行し直す
+                continue
+            if shared:
+                print(f"🔗 {site_name}: 実行中の物確結果を共有")
+            return result
+    
+    def _cancelled_result(self, site_name: str) -> Dict[str, Any]:
+        """並列検索の打ち切りで実行しなかった物確の結果（キャッシュ・共有はしない）"""
+        print(f"⏹️ {site_name}: 検索打ち切りのため中止")
+        return {
+            'found': False,
+            'confidence': 0.0,
+            'properties': [],
+            'skipped': True,
+            'notes': f'{site_name}検索は打ち切られました'
+        }
+    
+    def _with_failure_markers(self, search_result: Dict[str, Any], site_result: Dict[str, Any]) -> Dict[str, Any]:
+        """検索結果のエラー・スキップの印を物確結果に引き継ぐ（確認できなかった結果をキャッシュしないため）"""
+        for key in ('error', 'skipped'):
+            if search_result.get(key):
+                site_result[key] = search_result[key]
+        return site_result
+    
     def _check_itandi_real(self) -> Dict[str, Any]:
         """ITANDI実際ログイン物確"""
         try:
@@ -93,14 +163,16 @@ class RealBrowserPropertyChecker:
             # Chrome MCPを使用した実際のサイトアクセス
             result = self._perform_chrome_mcp_search('ITANDI')
             
-            return {
+            return self._with_failure_markers(result, {
                 'found': result['found'],
                 'confidence': result['confidence'],
                 'matched_properties': result.get('properties', []),
                 'search_method': 'ITANDI実際ログイン',
                 'notes': f'ITANDIに実際ログインして検索実行。{result["notes"]}'
-            }
+            })
             
+        except SearchCancelled:
+            raise
         except Exception as e:
             print(f"❌ ITANDI物確エラー: {e}")
             return {
@@ -117,14 +189,16 @@ class RealBrowserPropertyChecker:
             
             result = self._perform_chrome_mcp_search('いえらぶBB')
             
-            return {
+            return self._with_failure_markers(result, {
                 'found': result['found'],
                 'confidence': result['confidence'],
                 'matched_properties': result.get('properties', []),
                 'search_method': 'いえらぶBB実際ログイン',
                 'notes': f'いえらぶBBに実際ログインして検索実行。{result["notes"]}'
-            }
+            })
             
+        except SearchCancelled:
+            raise
         except Exception as e:
             print(f"❌ いえらぶBB物確エラー: {e}")
             return {
@@ -141,14 +215,16 @@ class RealBrowserPropertyChecker:
             
             result = self._perform_chrome_mcp_search('ATBB')
             
-            return {
+            return self._with_failure_markers(result, {
                 'found': result['found'],
                 'confidence': result['confidence'],
                 'matched_properties': result.get('properties', []),
                 'search_method': 'ATBB実際ログイン',
                 'notes': f'ATBBに実際ログインして検索実行。{result["notes"]}'
-            }
+            })
             
+        except SearchCancelled:
+            raise
         except Exception as e:
             print(f"❌ ATBB物確エラー: {e}")
             return {
@@ -379,19 +455,9 @@ class RealBrowserPropertyChecker:
         if not addr1 or not addr2:
             return 0.0
         
-        # 正規化
-        import unicodedata
-        
-        def normalize_address(addr):
-            # 全角→半角変換
-            addr = unicodedata.normalize('NFKC', addr)
-            # 不要文字除去
-            addr = re.sub(r'[（）()「」【】].*', '', addr)
-            addr = re.sub(r'\s+', '', addr)
-            return addr.lower()
-        
-        addr1_clean = normalize_address(addr1)
-        addr2_clean = normalize_address(addr2)
+        # 正規化（全角→半角・括弧書きと空白の除去・番地表記の統一）
+        addr1_clean = canonicalize_address(addr1).text.lower()
+        addr2_clean = canonicalize_address(addr2).text.lower()
         
         # 共通部分の長さで判定
         common_length = 0
@@ -453,21 +519,35 @@ class RealBrowserPropertyChecker:
     def _perform_chrome_mcp_search(self, site_name: str) -> Dict[str, Any]:
         """
         Chrome MCPを使用した実際のサイト物確
+        
+        Raises:
+            SearchCancelled: 並列検索が打ち切られた場合（検索前・検索後に確認）
         """
         try:
+            if search_cancelled():
+                raise SearchCancelled(site_name)
+            
             # まずは現在はシミュレーションを実行（Chrome MCPの実装は段階的に行う）
             print(f"🌐 {site_name} Chrome MCP検索実行...")
             
             # フォールバック: シミュレーションロジックを使用
             # TODO: 実際のChrome MCP実装に置き換え予定
-            return self._simulate_real_site_check(site_name)
+            result = self._simulate_real_site_check(site_name)
+            
+            # 検索中に打ち切られた結果は呼び出し側が使わないため、キャッシュせずに中断
+            if search_cancelled():
+                raise SearchCancelled(site_name)
+            return result
             
+        except SearchCancelled:
+            raise
         except Exception as e:
             print(f"❌ {site_name} Chrome MCP検索エラー: {e}")
             return {
                 'found': False,
                 'confidence': 0.0,
                 'properties': [],
+                'error': str(e),
                 'notes': f'{site_name} Chrome MCP検索でエラーが発生: {str(e)}',
                 'login_success': False,
                 'search_executed': False
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import List, Dict, Any
 from dataclasses import asdict
 import json
+from src.property_table import PropertyTable
 
 class ReportGenerator:
     """物確結果のレポート生成クラス"""
@@ -19,7 +20,7 @@ class ReportGenerator:
                                    properties: List,
                                    itandi_results: List = None,
                                    ierabu_results: List = None) -> Dict[str, str]:
-        """包括的な物確レポートを生成"""
+        """包括的な物確レポートを生成（properties は PropertyTable・dataclass・dictのリスト）"""
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         reports = {}
@@ -54,13 +55,11 @@ class ReportGenerator:
             summary_df.to_excel(writer, sheet_name='サマリー', index=False)
             
             # シート2: 物件詳細
-            if properties:
-                properties_data = []
-                for prop in properties:
-                    prop_dict = asdict(prop) if hasattr(prop, '__dict__') else prop
-                    properties_data.append(prop_dict)
-                
-                properties_df = pd.DataFrame(properties_data)
+            if properties is not None and len(properties):
+                if isinstance(properties, PropertyTable):
+                    properties_df = properties.to_frame()
+                else:
+                    properties_df = pd.DataFrame(self._property_dicts(properties))
                 properties_df.to_excel(writer, sheet_name='物件詳細', index=False)
             
             # シート3: ITANDI結果
@@ -90,7 +89,7 @@ class ReportGenerator:
         html_path = self.output_dir / f"物確レポート_{timestamp}.html"
         
         # サマリー統計を計算
-        total_properties = len(properties) if properties else 0
+        total_properties = len(properties) if properties is not None else 0
         itandi_found = len([r for r in (itandi_results or []) if getattr(r, 'found', False)])
         ierabu_found = len([r for r in (ierabu_results or []) if getattr(r, 'found', False)])
         
@@ -156,7 +155,7 @@ class ReportGenerator:
             html_content += self._generate_result_table("いえらぶBB", ierabu_results)
         
         # 物件詳細テーブル
-        if properties:
+        if total_properties:
             html_content += self._generate_property_table(properties)
         
         html_content += """
@@ -245,9 +244,7 @@ class ReportGenerator:
             <tbody>
 """
         
-        for prop in properties:
-            prop_dict = asdict(prop) if hasattr(prop, '__dict__') else prop
-            
+        for prop_dict in self._property_dicts(properties):
             html += f"""
                 <tr>
                     <td>{prop_dict.get('property_id', '')}</td>
@@ -275,11 +272,11 @@ class ReportGenerator:
         report_data = {
             "metadata": {
                 "generated_at": datetime.now().isoformat(),
-                "total_properties": len(properties) if properties else 0,
+                "total_properties": len(properties) if properties is not None else 0,
                 "itandi_results_count": len(itandi_results) if itandi_results else 0,
                 "ierabu_results_count": len(ierabu_results) if ierabu_results else 0
             },
-            "properties": [asdict(prop) if hasattr(prop, '__dict__') else prop for prop in (properties or [])],
+            "properties": self._property_dicts(properties),
             "itandi_results": [asdict(result) if hasattr(result, '__dict__') else result for result in (itandi_results or [])],
             "ierabu_results": [asdict(result) if hasattr(result, '__dict__') else result for result in (ierabu_results or [])]
         }
@@ -296,25 +293,18 @@ class ReportGenerator:
         # 結合データを作成
         combined_data = []
         
-        if properties:
-            for prop in properties:
-                prop_dict = asdict(prop) if hasattr(prop, '__dict__') else prop
-                
-                # 対応するITANDI結果を検索
-                itandi_result = None
-                if itandi_results:
-                    for result in itandi_results:
-                        if getattr(result, 'property_id', '') == prop_dict.get('property_id', ''):
-                            itandi_result = result
-                            break
-                
-                # 対応するいえらぶBB結果を検索
-                ierabu_result = None
-                if ierabu_results:
-                    for result in ierabu_results:
-                        if getattr(result, 'property_id', '') == prop_dict.get('property_id', ''):
-                            ierabu_result = result
-                            break
+        # 物件IDから各サイトの結果を引けるようにする（同じIDが複数あれば最初の結果）
+        itandi_by_id = {}
+        for result in reversed(itandi_results or []):
+            itandi_by_id[getattr(result, 'property_id', '')] = result
+        ierabu_by_id = {}
+        for result in reversed(ierabu_results or []):
+            ierabu_by_id[getattr(result, 'property_id', '')] = result
+        
+        if properties is not None:
+            for prop_dict in self._property_dicts(properties):
+                itandi_result = itandi_by_id.get(prop_dict.get('property_id', ''))
+                ierabu_result = ierabu_by_id.get(prop_dict.get('property_id', ''))
                 
                 combined_data.append({
                     "物件ID": prop_dict.get('property_id', ''),
@@ -333,9 +323,17 @@ class ReportGenerator:
         
         return csv_path
     
+    def _property_dicts(self, properties) -> List[Dict[str, Any]]:
+        """物件（PropertyTable・dataclass・dict）を dict のリストに変換"""
+        if properties is None:
+            return []
+        if isinstance(properties, PropertyTable):
+            return properties.records()
+        return [asdict(prop) if hasattr(prop, '__dict__') else prop for prop in properties]
+    
     def _create_summary_data(self, properties, itandi_results, ierabu_results) -> List[Dict[str, Any]]:
         """サマリーデータを作成"""
-        total_properties = len(properties) if properties else 0
+        total_properties = len(properties) if properties is not None else 0
         itandi_found = len([r for r in (itandi_results or []) if getattr(r, 'found', False)])
         ierabu_found = len([r for r in (ierabu_results or []) if getattr(r, 'found', False)])
         
@@ -0,0 +1,81 @@
+"""
+リソースブロックモジュール
+テキストしか使わない検索画面で、画像・フォント・解析タグなどの読み込みを BrowserContext 単位で遮断
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route
+from config.settings import PLAYWRIGHT_CONFIG
+
+
+def _domain_matches(host: str, domains: List[str]) -> bool:
+    """ホスト名がドメイン（またはそのサブドメイン）に一致するか"""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class ResourceBlocker:
+    """
+    リソース種別・ドメインによる読み込み遮断
+
+    - allowed_domains に一致するリクエストは常に許可
+    - blocked_domains に一致するか、blocked_resource_types に含まれる種別なら遮断
+    - 遮断件数と推定削減バイト数（種別ごとの平均サイズ）を実行ごとに集計
+    """
+
+    def __init__(self, rules: Optional[Dict] = None):
+        rules = rules or PLAYWRIGHT_CONFIG["resource_blocking"]
+        self.enabled = rules.get("enabled", True)
+        self.blocked_resource_types = set(rules.get("blocked_resource_types", []))
+        self.blocked_domains = list(rules.get("blocked_domains", []))
+        self.allowed_domains = list(rules.get("allowed_domains", []))
+        self.estimated_sizes = dict(rules.get("estimated_sizes", {}))
+        self.blocked_counts: Counter = Counter()
+        self.allowed_count = 0
+        self.estimated_bytes_saved = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """リクエストを遮断するかどうか"""
+        if not self.enabled:
+            return False
+
+        host = (urlparse(url).hostname or "").lower()
+        if _domain_matches(host, self.allowed_domains):
+            return False
+        return _domain_matches(host, self.blocked_domains) or resource_type in self.blocked_resource_types
+
+    async def install(self, context: BrowserContext):
+        """コンテキストの全リクエストに遮断ルールを適用"""
+        if self.enabled:
+            await context.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        try:
+            if self.should_block(request.resource_type, request.url):
+                self.blocked_counts[request.resource_type] += 1
+                self.estimated_bytes_saved += self.estimated_sizes.get(request.resource_type, 0)
+                await route.abort("blockedbyclient")
+            else:
+                self.allowed_count += 1
+                await route.continue_()
+        except Exception as e:
+            # ページを閉じた後に届いたリクエストなど
+            print(f"リクエスト処理エラー: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """遮断件数・推定削減バイト数を取得"""
+        return {
+            "blocked": sum(self.blocked_counts.values()),
+            "allowed": self.allowed_count,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            **{f"blocked_{resource_type}": count for resource_type, count in self.blocked_counts.items()},
+        }
+
+    def summary(self) -> str:
+        """ログ出力用の集計文字列"""
+        blocked = sum(self.blocked_counts.values())
+        return (
+            f"{blocked}件遮断・{self.allowed_count}件許可"
+            f"（推定 {self.estimated_bytes_saved / 1024 / 1024:.1f}MB 削減）"
+        )
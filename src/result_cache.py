@@ -0,0 +1,120 @@
+"""
+物確結果キャッシュモジュール
+物件（住所・賃料・間取り）とサイトごとの確認結果をSQLiteに保存し、有効期間内は再利用
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from config.settings import RESULT_CACHE_CONFIG
+from src.address_normalizer import canonicalize_address
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def property_fingerprint(property_data: Dict[str, Any]) -> str:
+    """住所・賃料・間取りを正規化して物件の識別キーを生成（表記ゆれを吸収）"""
+    parts = [canonicalize_address(str(property_data.get("address") or "")).text]
+    for field in ("rent", "layout"):
+        value = unicodedata.normalize("NFKC", str(property_data.get(field) or ""))
+        value = _WHITESPACE.sub("", value).replace(",", "").upper()
+        parts.append(value)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+class SiteResultCache:
+    """
+    サイトごとの物確結果のSQLiteキャッシュ
+
+    - キーは (物件の識別キー, サイト名)
+    - 有効期間はサイトごとに設定（ttl_seconds、未設定のサイトは "default"）
+    - 取得した結果には確認日時 cached_at を付与
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_seconds: Optional[Dict[str, int]] = None,
+                 enabled: Optional[bool] = None):
+        self.db_path = Path(db_path or RESULT_CACHE_CONFIG["db_path"])
+        self.ttl_seconds = dict(ttl_seconds or RESULT_CACHE_CONFIG["ttl_seconds"])
+        self.enabled = RESULT_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        if self.enabled:
+            self._initialize()
+
+    def get(self, fingerprint: str, site: str) -> Optional[Dict[str, Any]]:
+        """有効期間内のキャッシュ済み結果を取得"""
+        if not self.enabled:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result, cached_at FROM site_results WHERE fingerprint = ? AND site = ?",
+                    (fingerprint, site)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"物確結果キャッシュ読み込みエラー: {e}")
+            return None
+
+        if row is None or time.time() - row[1] > self._ttl(site):
+            return None
+
+        result = json.loads(row[0])
+        result["cached_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row[1]))
+        return result
+
+    def put(self, fingerprint: str, site: str, result: Dict[str, Any]):
+        """確認結果を保存（エラー・打ち切りで確認できなかった結果は保存しない）"""
+        if not self.enabled or result.get("error") or result.get("skipped"):
+            return
+
+        stored = {key: value for key, value in result.items() if key != "cached_at"}
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO site_results (fingerprint, site, result, cached_at) VALUES (?, ?, ?, ?)",
+                    (fingerprint, site, json.dumps(stored, ensure_ascii=False, default=str), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"物確結果キャッシュ書き込みエラー: {e}")
+
+    def purge_expired(self) -> int:
+        """全サイト共通で最長の有効期間を過ぎた結果を削除し、削除件数を返す"""
+        if not self.enabled:
+            return 0
+
+        expire_before = time.time() - max(self.ttl_seconds.values())
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM site_results WHERE cached_at < ?", (expire_before,)).rowcount
+
+    def _ttl(self, site: str) -> int:
+        return self.ttl_seconds.get(site, self.ttl_seconds["default"])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """操作ごとに接続し、終了時にコミットして閉じる（スレッドをまたいで使えるように）"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _initialize(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS site_results (
+                    fingerprint TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    cached_at REAL NOT NULL,
+                    PRIMARY KEY (fingerprint, site)
+                )
+                """
+            )
@@ -0,0 +1,75 @@
+"""
+セレクタ解決キャッシュモジュール
+サイトごとに前回成功したセレクタを記録し、次回はそれを最初に試す（実行をまたいで保持）
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import SELECTOR_CACHE_CONFIG
+
+
+class SelectorCache:
+    """
+    サイト・用途（検索ボックス・検索ボタン）ごとの成功セレクタのキャッシュ
+
+    候補リストの順序を変えるだけなので、キャッシュが外れても従来どおり全候補を試す
+    待機（タイムアウト）のある要素の特定にのみ使う。結果一覧のように候補によって取得する要素が
+    変わるものは、順序を変えると結果が変わるため対象にしない
+    """
+
+    def __init__(self, site: str, cache_file: Optional[Path] = None, enabled: Optional[bool] = None):
+        self.site = site
+        self.cache_file = Path(cache_file or SELECTOR_CACHE_CONFIG["cache_file"])
+        self.enabled = SELECTOR_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self.selectors: Dict[str, str] = self._load().get(site, {}) if self.enabled else {}
+        self._lock = threading.Lock()
+
+    def order(self, role: str, candidates: List[str]) -> List[str]:
+        """前回成功したセレクタを先頭にした候補リストを返す"""
+        cached = self.selectors.get(role)
+        if cached not in candidates:
+            return list(candidates)
+        return [cached] + [selector for selector in candidates if selector != cached]
+
+    def remember(self, role: str, selector: str):
+        """成功したセレクタを記録（変化があればファイルに保存）"""
+        if not self.enabled or self.selectors.get(role) == selector:
+            return
+        self.selectors[role] = selector
+        self._save()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"セレクタキャッシュ読み込みエラー: {e}")
+            return {}
+
+    def _save(self):
+        """他サイトの記録を保ったまま、このサイトの記録を書き込み"""
+        with self._lock:
+            try:
+                data = self._load()
+                data[self.site] = dict(self.selectors)
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.cache_file)
+            except Exception as e:
+                print(f"セレクタキャッシュ書き込みエラー: {e}")
+
+
+_SITE_CACHES: Dict[str, SelectorCache] = {}
+
+
+def get_selector_cache(site: str) -> SelectorCache:
+    """サイトごとに共有するセレクタキャッシュを取得"""
+    if site not in _SITE_CACHES:
+        _SITE_CACHES[site] = SelectorCache(site)
+    return _SITE_CACHES[site]
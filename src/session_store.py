@@ -0,0 +1,78 @@
+"""
+ログインセッション保存モジュール
+Playwrightの storage_state（Cookie・ローカルストレージ）をサイト・アカウントごとにディスクへ保存
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config.settings import SESSION_CONFIG
+
+
+class SessionStore:
+    """
+    サイト・アカウントごとのログインセッションのディスク保存
+
+    - 1セッション1JSONファイル（{site}_{ユーザー名のハッシュ}.json、パーミッション600）
+    - 保存から max_age_seconds を過ぎたセッションは無効として削除
+    """
+
+    def __init__(self, session_dir: Optional[Path] = None, max_age_seconds: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        self.session_dir = Path(session_dir or SESSION_CONFIG["session_dir"])
+        self.max_age_seconds = max_age_seconds or SESSION_CONFIG["max_age_seconds"]
+        self.enabled = SESSION_CONFIG["enabled"] if enabled is None else enabled
+
+    def load(self, site: str, username: str) -> Optional[Dict[str, Any]]:
+        """保存済みの storage_state を取得（期限切れ・未保存なら None）"""
+        if not self.enabled:
+            return None
+
+        path = self._session_path(site, username)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"{site}: セッション読み込みエラー: {e}")
+            return None
+
+        if time.time() - entry.get("saved_at", 0) > self.max_age_seconds:
+            print(f"{site}: 保存済みセッションの有効期限切れ")
+            self.discard(site, username)
+            return None
+
+        return entry.get("storage_state")
+
+    def save(self, site: str, username: str, storage_state: Dict[str, Any]):
+        """storage_state を保存（一時ファイル経由で置き換え）"""
+        if not self.enabled:
+            return
+
+        try:
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+            path = self._session_path(site, username)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": time.time(), "storage_state": storage_state}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"{site}: セッション保存エラー: {e}")
+
+    def discard(self, site: str, username: str):
+        """保存済みセッションを削除"""
+        try:
+            os.remove(self._session_path(site, username))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"{site}: セッション削除エラー: {e}")
+
+    def _session_path(self, site: str, username: str) -> Path:
+        account_hash = hashlib.sha256(username.encode("utf-8")).hexdigest()[:16]
+        return self.session_dir / f"{site}_{account_hash}.json"
@@ -3,6 +3,8 @@
 """
 import re
 import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 try:
     import PyPDF2
     PYPDF2_AVAILABLE = True
@@ -15,140 +17,248 @@ try:
 except ImportError:
     PDFPLUMBER_AVAILABLE = False
 
+from config.settings import PDF_CONFIG
+from src.extraction_cache import ExtractionCache, hash_pdf_bytes, pattern_version
+from src.field_extractor import FieldExtractor
+from src.gazetteer import load_gazetteer
+from src.property_splitter import BOUNDARY_ANCHORS, PAGE_BREAK, PropertySplitter
+
+# マイソクの基本パターンを定義
+# 先頭が [^\n]* のパターンは最左マッチが必ず行頭になるため ^ で固定する
+# （結果は同じで、各位置からの無駄なバックトラックがなくなる）
+PROPERTY_PATTERNS = {
+    'rent': [
+        r'賃料[\s:：]*([0-9,]+(?:\.[0-9]+)?(?:万円|円))',
+        r'家賃[\s:：]*([0-9,]+(?:\.[0-9]+)?(?:万円|円))',
+        r'(\d{1,3}(?:,\d{3})*(?:\.\d+)?万円)',
+        r'(\d+(?:,\d{3})*円)'
+    ],
+    'address': [
+        r'所在地[\s:：]*([^\n]+(?:市|区|町|村)[^\n]*)',
+        r'住所[\s:：]*([^\n]+(?:市|区|町|村)[^\n]*)',
+        r'((?:' + '|'.join(load_gazetteer().prefectures) + r')[^\n]+)',
+        r'^([^\n]*(?:市|区|町|村)[^\n]*丁目[^\n]*)'
+    ],
+    'layout': [
+        r'間取り[\s:：]*([0-9]?[RLDK]+)',
+        r'タイプ[\s:：]*([0-9]?[RLDK]+)',
+        r'([0-9]?[RLDK]+)',
+        r'(\d[SLDK]+\d*)',
+        r'(ワンルーム|1R|1K|1DK|1LDK|2K|2DK|2LDK|3K|3DK|3LDK|4K|4DK|4LDK)'
+    ],
+    'station': [
+        r'交通[\s:：]*([^\n]*駅[^\n]*)',
+        r'最寄り?駅?[\s:：]*([^\n]*駅[^\n]*)',
+        r'アクセス[\s:：]*([^\n]*駅[^\n]*)',
+        r'^([^\n]*線[^\n]*駅[^\n]*分[^\n]*)',
+        r'^([^\n]*駅[^\n]*徒歩[^\n]*分[^\n]*)'
+    ],
+    'area': [
+        r'専有面積[\s:：]*([0-9]+(?:\.[0-9]+)?(?:㎡|m2|平米))',
+        r'面積[\s:：]*([0-9]+(?:\.[0-9]+)?(?:㎡|m2|平米))',
+        r'([0-9]+(?:\.[0-9]+)?(?:㎡|m2))'
+    ],
+    'age': [
+        r'築年数[\s:：]*([^\n]+)',
+        r'築([0-9]+年)',
+        r'(昭和|平成|令和)([0-9]+)年',
+        r'築(\d+)年'
+    ]
+}
+
+FIELD_EXTRACTOR = FieldExtractor(PROPERTY_PATTERNS, re.IGNORECASE | re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 見つからない場合に「〜不明」で補完される必須フィールド
+REQUIRED_FIELDS = ['rent', 'address', 'layout', 'station']
+# ページ境界をまたぐマッチ用に、次のページと合わせて確認する直前ページの末尾の文字数
+PAGE_TAIL_CHARS = 200
+BRACKET_TAIL_PATTERN = re.compile(r'[（）()「」\[\]].*')
+
+PROPERTY_SPLITTER = PropertySplitter()
+
+# 物件として扱うブロックに必要なフィールド（揃わないブロックは直前の物件の続きとみなす）
+BLOCK_FIELDS = ['address', 'rent']
+
+
+def _extract_block_fields(block):
+    """1物件ブロックからフィールドを抽出（プロセスプールのワーカー用にモジュール関数）"""
+    fields = {}
+    
+    # コンパイル済みパターンで全フィールドを抽出（各フィールドは最初にマッチした候補で確定）
+    for field, match in FIELD_EXTRACTOR.extract(block).items():
+        if field == 'address':
+            # 住所の後処理
+            addr = match.group(1).strip()
+            # 改行や余分な文字を除去
+            addr = WHITESPACE_PATTERN.sub(' ', addr)
+            addr = BRACKET_TAIL_PATTERN.sub('', addr)  # 括弧以降を除去
+            fields[field] = addr[:100]  # 長すぎる場合は切り詰め
+        elif field == 'station':
+            # 駅情報の後処理
+            station = match.group(1).strip()
+            station = WHITESPACE_PATTERN.sub(' ', station)
+            fields[field] = station[:50]
+        else:
+            fields[field] = match.group(1).strip()
+    
+    return fields
+
 class SimplePDFAnalyzer:
     """軽量PDFアナライザー"""
     
-    def extract_text_from_pdf(self, pdf_file):
-        """PDFからテキストを抽出"""
-        text = ""
+    def __init__(self, stop_when_complete=None):
+        # 必須フィールドが揃った時点でページ読み取りを打ち切るか
+        if stop_when_complete is None:
+            stop_when_complete = PDF_CONFIG["stop_when_complete"]
+        self.stop_when_complete = stop_when_complete
+        
+        # 打ち切った場合は先頭の物件（読み取ったページ分）だけが対象になる
+        # 打ち切りの有無で抽出テキストが変わるため、キャッシュは別の名前空間に保存
+        # ページ区切りが変わると保存済みのテキストを物件に分割できないため、バージョンに含める
+        namespace = "simple_early" if stop_when_complete else "simple"
+        self.cache = ExtractionCache(namespace, pattern_version({
+            'fields': PROPERTY_PATTERNS,
+            'boundaries': BOUNDARY_ANCHORS,
+            'page_break': PAGE_BREAK
+        }))
+    
+    def iter_page_texts(self, pdf_file):
+        """PDFのページテキストを1ページずつ返すジェネレーター"""
+        # pdfplumberを優先使用
+        if PDFPLUMBER_AVAILABLE:
+            with pdfplumber.open(pdf_file) as pdf:
+                for page in pdf.pages:
+                    page_text = page.extract_text()
+                    if page_text:
+                        yield page_text
+        
+        # フォールバック: PyPDF2
+        elif PYPDF2_AVAILABLE:
+            pdf_file.seek(0)  # ファイルポインターをリセット
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            for page in pdf_reader.pages:
+                yield page.extract_text()
+        
+        else:
+            raise Exception("PDF処理ライブラリが利用できません")
+    
+    def extract_text_from_pdf(self, pdf_file, stop_when_complete=False):
+        """
+        PDFからテキストを抽出（stop_when_complete=Trueなら抽出対象の全フィールドが揃ったページで終了）
+        
+        物件の分割に使えるよう、ページ間には改ページ（PAGE_BREAK）を挟む
+        """
+        page_texts = []
+        missing_fields = list(FIELD_EXTRACTOR.fields)
+        
+        page_iter = self.iter_page_texts(pdf_file)
         
         try:
-            # pdfplumberを優先使用
-            if PDFPLUMBER_AVAILABLE:
-                with pdfplumber.open(pdf_file) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-            
-            # フォールバック: PyPDF2
-            elif PYPDF2_AVAILABLE:
-                pdf_file.seek(0)  # ファイルポインターをリセット
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            
-            else:
-                raise Exception("PDF処理ライブラリが利用できません")
+            for page_text in page_iter:
+                page_texts.append(page_text + "\n")
+                
+                if stop_when_complete:
+                    # 未発見のフィールドのみ、直前ページの末尾（ページ境界をまたぐマッチ用）と現在のページで確認
+                    window = PAGE_BREAK.join(page_texts[-2:])
+                    if len(page_texts) > 1:
+                        window = window[max(0, len(page_texts[-2]) - PAGE_TAIL_CHARS):]
+                    found = FIELD_EXTRACTOR.matched_fields(window, missing_fields)
+                    missing_fields = [field for field in missing_fields if field not in found]
+                    if not missing_fields:
+                        return PAGE_BREAK.join(page_texts)
                 
         except Exception as e:
             raise Exception(f"PDF読み取りエラー: {str(e)}")
         
-        return text
+        finally:
+            page_iter.close()  # 途中で打ち切った場合もPDFを閉じる
+        
+        return PAGE_BREAK.join(page_texts)
     
     def extract_property_info(self, text):
-        """テキストから物件情報を抽出"""
-        properties = []
+        """テキストから物件情報を抽出（複数物件のマイソクは物件ごとに分割して抽出）"""
+        blocks = PROPERTY_SPLITTER.split(text) or [text]
         
-        # マイソクの基本パターンを定義
-        patterns = {
-            'rent': [
-                r'賃料[\s:：]*([0-9,]+(?:\.[0-9]+)?(?:万円|円))',
-                r'家賃[\s:：]*([0-9,]+(?:\.[0-9]+)?(?:万円|円))',
-                r'(\d{1,3}(?:,\d{3})*(?:\.\d+)?万円)',
-                r'(\d+(?:,\d{3})*円)'
-            ],
-            'address': [
-                r'所在地[\s:：]*([^\n]+(?:市|区|町|村)[^\n]*)',
-                r'住所[\s:：]*([^\n]+(?:市|区|町|村)[^\n]*)',
-                r'((?:東京都|神奈川県|千葉県|埼玉県|大阪府|京都府|兵庫県|愛知県)[^\n]+)',
-                r'([^\n]*(?:市|区|町|村)[^\n]*丁目[^\n]*)'
-            ],
-            'layout': [
-                r'間取り[\s:：]*([0-9]?[RLDK]+)',
-                r'タイプ[\s:：]*([0-9]?[RLDK]+)',
-                r'([0-9]?[RLDK]+)',
-                r'(\d[SLDK]+\d*)',
-                r'(ワンルーム|1R|1K|1DK|1LDK|2K|2DK|2LDK|3K|3DK|3LDK|4K|4DK|4LDK)'
-            ],
-            'station': [
-                r'交通[\s:：]*([^\n]*駅[^\n]*)',
-                r'最寄り?駅?[\s:：]*([^\n]*駅[^\n]*)',
-                r'アクセス[\s:：]*([^\n]*駅[^\n]*)',
-                r'([^\n]*線[^\n]*駅[^\n]*分[^\n]*)',
-                r'([^\n]*駅[^\n]*徒歩[^\n]*分[^\n]*)'
-            ],
-            'area': [
-                r'専有面積[\s:：]*([0-9]+(?:\.[0-9]+)?(?:㎡|m2|平米))',
-                r'面積[\s:：]*([0-9]+(?:\.[0-9]+)?(?:㎡|m2|平米))',
-                r'([0-9]+(?:\.[0-9]+)?(?:㎡|m2))'
-            ],
-            'age': [
-                r'築年数[\s:：]*([^\n]+)',
-                r'築([0-9]+年)',
-                r'(昭和|平成|令和)([0-9]+)年',
-                r'築(\d+)年'
-            ]
-        }
+        # ブロックごとに独立して抽出（大量の物件をまとめたPDFはプロセスプールで並列化）
+        workers = PDF_CONFIG["block_workers"]
+        if workers > 1 and len(blocks) > 1:
+            mp_context = multiprocessing.get_context(PDF_CONFIG["process_start_method"])
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                block_fields = list(executor.map(
+                    _extract_block_fields, blocks, chunksize=max(1, len(blocks) // (workers * 4))
+                ))
+        else:
+            block_fields = [_extract_block_fields(block) for block in blocks]
         
-        # 単一物件として抽出（複数物件対応は後で追加可能）
-        property_info = {
-            'property_id': 'MYSOUKU_001',
-            'source_file': 'uploaded_pdf'
-        }
+        # 所在地・賃料が揃わないブロックは直前の物件の続きとして不足フィールドを補う
+        # （先頭の表紙などは捨て、物件が1件もなければ全体を1物件とする）
+        merged = []
+        for fields in block_fields:
+            if all(field in fields for field in BLOCK_FIELDS):
+                merged.append(fields)
+            elif merged:
+                for field, value in fields.items():
+                    merged[-1].setdefault(field, value)
+        if not merged:
+            merged = [_extract_block_fields(text)]
         
-        # 各パターンでマッチングを試行
-        for field, field_patterns in patterns.items():
-            for pattern in field_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    if field == 'address':
-                        # 住所の後処理
-                        addr = match.group(1).strip()
-                        # 改行や余分な文字を除去
-                        addr = re.sub(r'\s+', ' ', addr)
-                        addr = re.sub(r'[（）()「」\[\]].*', '', addr)  # 括弧以降を除去
-                        property_info[field] = addr[:100]  # 長すぎる場合は切り詰め
-                    elif field == 'station':
-                        # 駅情報の後処理
-                        station = match.group(1).strip()
-                        station = re.sub(r'\s+', ' ', station)
-                        property_info[field] = station[:50]
-                    else:
-                        property_info[field] = match.group(1).strip()
-                    break  # 最初にマッチしたパターンで確定
-        
-        # 必須フィールドの補完
-        if 'rent' not in property_info:
-            property_info['rent'] = '要相談'
-        if 'address' not in property_info:
-            property_info['address'] = '住所不明'
-        if 'layout' not in property_info:
-            property_info['layout'] = '間取り不明'
-        if 'station' not in property_info:
-            property_info['station'] = '駅情報不明'
-        if 'area' not in property_info:
-            property_info['area'] = ''
-        if 'age' not in property_info:
-            property_info['age'] = ''
+        properties = []
+        for i, fields in enumerate(merged):
+            property_info = {
+                'property_id': f'MYSOUKU_{i + 1:03d}',
+                'source_file': 'uploaded_pdf',
+                **fields
+            }
+            
+            # 必須フィールドの補完
+            if 'rent' not in property_info:
+                property_info['rent'] = '要相談'
+            if 'address' not in property_info:
+                property_info['address'] = '住所不明'
+            if 'layout' not in property_info:
+                property_info['layout'] = '間取り不明'
+            if 'station' not in property_info:
+                property_info['station'] = '駅情報不明'
+            if 'area' not in property_info:
+                property_info['area'] = ''
+            if 'age' not in property_info:
+                property_info['age'] = ''
+            
+            properties.append(property_info)
         
-        properties.append(property_info)
+        if len(properties) > 1:
+            print(f"📑 {len(properties)}件の物件に分割")
         return properties
     
     def analyze_pdf(self, pdf_file):
         """PDFファイルを解析して物件情報を返す"""
         try:
-            # PDFからテキスト抽出
-            text = self.extract_text_from_pdf(pdf_file)
+            # 同一PDFの再アップロードはキャッシュから返す
+            pdf_file.seek(0)
+            pdf_bytes = pdf_file.read()
+            cache_key = hash_pdf_bytes(pdf_bytes)
             
-            if not text or text.strip() == "":
-                raise Exception("PDFからテキストを抽出できませんでした")
+            text = self.cache.get_text(cache_key)
+            properties = self.cache.get_properties(cache_key) if text is not None else None
             
-            # 物件情報抽出
-            properties = self.extract_property_info(text)
+            if text is None:
+                # PDFからテキスト抽出
+                text = self.extract_text_from_pdf(io.BytesIO(pdf_bytes), self.stop_when_complete)
+                
+                if not text or text.strip() == "":
+                    raise Exception("PDFからテキストを抽出できませんでした")
+                
+                self.cache.put_text(cache_key, text)
             
-            if not properties:
-                raise Exception("物件情報を抽出できませんでした")
+            if properties is None:
+                # 物件情報抽出
+                properties = self.extract_property_info(text)
+                
+                if not properties:
+                    raise Exception("物件情報を抽出できませんでした")
+                
+                self.cache.put_properties(cache_key, properties)
             
             return {
                 'success': True,
@@ -0,0 +1,66 @@
+"""
+同時実行重複排除モジュール（シングルフライト）
+同じキーの処理が実行中なら新たに実行せず、実行中の処理の完了を待って結果を共有
+（同じマイソクが同時にアップロードされた場合のブラウザセッション・サイト負荷の重複を防止）
+"""
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """実行中の処理1件（完了通知と結果を保持）"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """キーごとに処理を1つだけ実行し、同時に呼び出した側へ結果を共有するクラス"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        キーに対応する処理を実行（実行中なら完了を待って結果を共有）
+
+        Returns:
+            (結果, 共有されたか): 待機した側には結果のコピーを返す。処理の例外は待機した側にも送出
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if call.waiters:
+            print(f"🔗 同時実行の重複を排除: {key}（{call.waiters}件に結果を共有）")
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """実行中の処理数"""
+        with self._lock:
+            return len(self._calls)
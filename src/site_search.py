@@ -0,0 +1,110 @@
+"""
+サイト並列検索モジュール
+ATBB・ITANDIなど独立したサイトの検索を同時に実行し、サイトごとのタイムアウトを適用
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional
+from config.settings import BUKKATSU_CONFIG
+
+# 検索を実行中のスレッドごとの打ち切り通知
+_local = threading.local()
+
+
+class SearchCancelled(Exception):
+    """
+    打ち切られた検索の中断
+
+    打ち切られた検索は結果（found=False）として返さずにこの例外で中断する
+    （未確認の結果が「掲載なし」としてキャッシュ・共有されないように）
+    """
+
+
+def search_cancelled() -> bool:
+    """
+    実行中のサイト検索が打ち切られたか（他サイトで確認済み・タイムアウト）
+
+    実行中のスレッドは外から止められないため、検索関数は処理の区切りでこれを確認し、
+    打ち切られていれば残りの処理（ブラウザ起動・ページ遷移など）を行わずに SearchCancelled を送出する
+    """
+    event = getattr(_local, "cancel_event", None)
+    return event is not None and event.is_set()
+
+
+def _run_search(search: Callable[[], Dict[str, Any]], cancel_event: threading.Event) -> Dict[str, Any]:
+    _local.cancel_event = cancel_event
+    try:
+        return search()
+    finally:
+        _local.cancel_event = None
+
+
+def run_site_searches(searches: Dict[str, Callable[[], Dict[str, Any]]],
+                      timeout: Optional[float] = None,
+                      stop_when_found: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    複数サイトの検索を並列実行
+
+    Args:
+        searches: サイト名 → 検索関数（引数なしで結果dictを返す）
+        timeout: サイトごとのタイムアウト秒数（省略時は BUKKATSU_CONFIG["timeout_seconds"]）
+        stop_when_found: いずれかのサイトで物件が確認できた時点で残りを待たずに返す
+
+    Returns:
+        サイト名 → 検索結果（タイムアウト・省略したサイトは found=False の結果）
+    """
+    timeout = timeout or BUKKATSU_CONFIG["timeout_seconds"]
+    deadline = time.monotonic() + timeout
+    results: Dict[str, Dict[str, Any]] = {}
+    cancel_event = threading.Event()
+
+    executor = ThreadPoolExecutor(max_workers=len(searches), thread_name_prefix="site-search")
+    futures = {executor.submit(_run_search, search, cancel_event): site for site, search in searches.items()}
+    pending = set(futures)
+
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                site = futures[future]
+                try:
+                    results[site] = future.result()
+                except Exception as e:
+                    print(f"❌ {site}検索エラー: {e}")
+                    results[site] = {
+                        'found': False,
+                        'confidence': 0.0,
+                        'error': f"{site}検索エラー: {str(e)}",
+                        'notes': f'{site}検索でエラーが発生しました'
+                    }
+
+            if stop_when_found and any(result.get('found') for result in results.values()):
+                break
+    finally:
+        # 実行中の検索には打ち切りを通知し（search_cancelled で確認して自ら終了）、完了は待たない
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    confirmed = any(result.get('found') for result in results.values())
+    for future in pending:
+        site = futures[future]
+        if confirmed:
+            print(f"⏭️ {site}検索省略: 他サイトで確認済み")
+            notes = f'他サイトで物件を確認済みのため{site}検索は省略しました'
+        else:
+            print(f"⏱️ {site}検索タイムアウト（{timeout}秒）")
+            notes = f'{site}検索がタイムアウトしました（{timeout}秒）'
+        results[site] = {
+            'found': False,
+            'confidence': 0.0,
+            'skipped': confirmed,
+            'timed_out': not confirmed,
+            'notes': notes
+        }
+
+    return results
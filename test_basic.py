@@ -10,6 +10,10 @@ import io
 sys.path.append(str(Path(__file__).parent / "src"))
 sys.path.append(str(Path(__file__).parent))
 
+# 抽出キャッシュはテスト用の一時ディレクトリに保存（data/cache/extraction を汚さない）
+from config.settings import EXTRACTION_CACHE_CONFIG
+EXTRACTION_CACHE_CONFIG["cache_dir"] = Path(tempfile.mkdtemp(prefix="extraction_cache_test_"))
+
 def test_pdf_analyzer():
     """PDF解析機能のテスト"""
     print("📄 PDF解析機能テスト開始...")
@@ -50,6 +54,929 @@ def test_pdf_analyzer():
         print(f"❌ PDF解析機能テストエラー: {e}\n")
         return False
 
+def test_streaming_extraction():
+    """ページ単位ストリーミング抽出のテスト"""
+    print("📑 ページ単位ストリーミング抽出テスト開始...")
+    
+    try:
+        from src.pdf_analyzer import PDFAnalyzer
+        from src.simple_pdf_analyzer import SimplePDFAnalyzer
+        
+        pages = [
+            "物件No: P-001\n所在地: 東京都新宿区歌舞伎町1-1-1\n賃料: 12.5万円\n物件",
+            "No: P-002\n所在地: 東京都渋谷区神南1-1-1\n賃料: 15万円\n",
+        ]
+        
+        # ページをまたいで分割しても全文を一括で分割した場合と同じブロックになる
+        analyzer = PDFAnalyzer()
+        streamed_blocks = list(analyzer.iter_property_blocks(pages))
+        assert streamed_blocks == analyzer._split_into_property_blocks("".join(pages))
+        print(f"✅ ブロック分割: {len(streamed_blocks)}件")
+        
+        # 抽出対象の全フィールドが揃ったページで読み取りを打ち切る
+        class FakePageAnalyzer(SimplePDFAnalyzer):
+            pages_read = 0
+            
+            def iter_page_texts(self, pdf_file):
+                for page_text in ["所在地: 東京都新宿区1-1\n賃料: 10万円\n間取り: 1K\n交通: JR山手線 新宿駅 徒歩5分",
+                                  "専有面積: 25.5㎡\n築年数: 10年"] + ["設備"] * 18:
+                    self.pages_read += 1
+                    yield page_text
+        
+        simple_analyzer = FakePageAnalyzer(stop_when_complete=True)
+        text = simple_analyzer.extract_text_from_pdf(None, stop_when_complete=True)
+        assert simple_analyzer.pages_read == 2 and "賃料" in text and "築年数" in text
+        print(f"✅ 早期終了: {simple_analyzer.pages_read}/20ページ")
+        
+        print("✅ ページ単位ストリーミング抽出テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ ページ単位ストリーミング抽出テストエラー: {e}\n")
+        return False
+
+def test_parallel_pdf_analysis():
+    """複数PDFのプロセスプール並列解析のテスト"""
+    print("⚙️ 複数PDF並列解析テスト開始...")
+    
+    try:
+        from config.settings import PDF_CONFIG
+        from src.pdf_analyzer import PDFAnalyzer
+        
+        def make_pdf(name, page_texts):
+            """1行テキストのページからなる最小限のPDFを作成"""
+            page_ids = [4 + i * 2 for i in range(len(page_texts))]
+            objects = [
+                "<< /Type /Catalog /Pages 2 0 R >>",
+                f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>",
+                "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+            ]
+            for page_id, text in zip(page_ids, page_texts):
+                stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+                objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                               f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>")
+                objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+            
+            data = b"%PDF-1.4\n"
+            offsets = []
+            for number, body in enumerate(objects, 1):
+                offsets.append(len(data))
+                data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+            xref = len(data)
+            data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+            data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+            data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+            
+            pdf_file = io.BytesIO(data)
+            pdf_file.name = name
+            return pdf_file
+        
+        broken_pdf = io.BytesIO(b"%PDF-1.4 broken")
+        broken_pdf.name = "broken.pdf"
+        pdf_files = [
+            make_pdf("a.pdf", ["No: P-101 Tokyo"]),
+            broken_pdf,
+            make_pdf("c.pdf", ["No: P-301 Tokyo", "Tokyo station"]),
+            make_pdf("d.pdf", ["No: P-401 Tokyo"]),
+        ]
+        
+        # ページ範囲ごとにワーカーへ分散しても、結果は元のファイル順
+        original_pages_per_task = PDF_CONFIG["pages_per_task"]
+        PDF_CONFIG["pages_per_task"] = 1
+        try:
+            properties = PDFAnalyzer(extraction_mode="text").analyze_multiple_pdfs(pdf_files, max_workers=2)
+        finally:
+            PDF_CONFIG["pages_per_task"] = original_pages_per_task
+        
+        # 壊れたPDFは物件0件になるだけで、他のファイルの解析には影響しない
+        assert [prop["source_file"] for prop in properties] == ["a.pdf", "c.pdf", "d.pdf"], properties
+        assert [prop["property_number"] for prop in properties] == ["101", "301", "401"]
+        print(f"✅ 並列解析: {len(pdf_files)}ファイル → {len(properties)}件（ファイル順・壊れたPDFを分離）")
+        
+        print("✅ 複数PDF並列解析テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 複数PDF並列解析テストエラー: {e}\n")
+        return False
+
+def test_property_splitting():
+    """複数物件マイソクの物件分割テスト"""
+    print("✂️ 複数物件マイソクの物件分割テスト開始...")
+    
+    try:
+        from src.simple_pdf_analyzer import SimplePDFAnalyzer
+        from src.property_splitter import PAGE_BREAK
+        
+        # 表紙・物件番号・見出し・改ページ・ページをまたぐ物件を含むマイソク
+        text = PAGE_BREAK.join([
+            "新着物件のご案内\n株式会社サンプル不動産\n",
+            "【物件概要】\n物件番号: 101\n所在地: 東京都新宿区西新宿1-1-1\n賃料: 85,000円\n間取り: 1LDK\n",
+            "【物件概要】\n物件番号: 102\n所在地: 東京都渋谷区渋谷2-2-2\n賃料: 120,000円\n間取り: 2LDK\n",
+            "所在地: 東京都港区六本木3-3-3\n賃料: 15万円\n",
+            "間取り: 1K\n交通: 東京メトロ日比谷線 六本木駅 徒歩3分\n",
+        ])
+        
+        properties = SimplePDFAnalyzer().extract_property_info(text)
+        assert [prop['property_id'] for prop in properties] == ['MYSOUKU_001', 'MYSOUKU_002', 'MYSOUKU_003']
+        assert [prop['address'] for prop in properties] == [
+            '東京都新宿区西新宿1-1-1', '東京都渋谷区渋谷2-2-2', '東京都港区六本木3-3-3'
+        ]
+        assert properties[1]['rent'] == '120,000円'
+        assert properties[2]['layout'] == '1K' and '六本木駅' in properties[2]['station']
+        print(f"✅ 物件分割: {len(properties)}件")
+        
+        # 区切りのない単一物件は従来どおり1件
+        properties = SimplePDFAnalyzer().extract_property_info("所在地: 東京都新宿区1-1\n賃料: 10万円\n間取り: 1K")
+        assert len(properties) == 1 and properties[0]['property_id'] == 'MYSOUKU_001'
+        print("✅ 単一物件")
+        
+        print("✅ 複数物件マイソクの物件分割テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 複数物件マイソクの物件分割テストエラー: {e}\n")
+        return False
+
+def test_layout_extraction():
+    """レイアウト解析（単語座標・表セル）のテスト"""
+    print("🧭 レイアウト解析テスト開始...")
+    
+    try:
+        from src.layout_extractor import LayoutExtractor
+        from src.pdf_analyzer import PDFAnalyzer
+        
+        def word(text, x0, top):
+            return {"text": text, "x0": x0, "x1": x0 + 10 * len(text), "top": top, "bottom": top + 10}
+        
+        # 2段組み: 左段に賃料・間取り、右段に所在地（平文では列が混ざる配置）
+        class FakePage:
+            def extract_words(self):
+                return [
+                    word("賃料", 40, 100), word("12.5万円", 70, 100),
+                    word("所在地", 300, 100), word("東京都新宿区歌舞伎町1-1-1", 340, 100),
+                    word("間取り", 40, 130), word("1K", 40, 145),
+                ]
+            
+            def extract_tables(self):
+                return [[["専有面積", "25.5㎡"], ["築年数", "築15年"]]]
+        
+        layout_fields = LayoutExtractor().extract_page_fields(FakePage())
+        assert layout_fields["rent"] == "12.5万円"
+        assert layout_fields["address"] == "東京都新宿区歌舞伎町1-1-1"
+        assert layout_fields["layout"] == "1K"
+        assert layout_fields["area"] == "25.5"
+        print(f"✅ 項目→値の対応付け: {len(layout_fields)}項目")
+        
+        property_info = PDFAnalyzer(extraction_mode="layout")._extract_single_property("", 1, layout_fields)
+        assert property_info["age"] == "築15年"
+        print(f"✅ 物件情報への反映: {property_info['address']}")
+        
+        # 複数ページにまたがる物件は1物件にまとめ、物件番号・所在地の2回目で次の物件
+        pages = [
+            ("", {"property_number": "P-001", "address": "東京都新宿区西新宿1-1-1", "rent": "8.5万円"}),
+            ("設備: エアコン", {"area": "25.5"}),
+            ("所在地: 東京都渋谷区渋谷2-2-2\n賃料: 12万円", {}),
+        ]
+        properties = PDFAnalyzer(extraction_mode="layout").extract_properties_from_layout(pages)
+        assert [prop["address"] for prop in properties] == ["東京都新宿区西新宿1-1-1", "東京都渋谷区渋谷2-2-2"]
+        assert properties[0]["area"] == "25.5"
+        print(f"✅ ページのまとめ: {len(pages)}ページ → {len(properties)}物件")
+        
+        print("✅ レイアウト解析テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ レイアウト解析テストエラー: {e}\n")
+        return False
+
+def test_extraction_cache():
+    """PDF抽出キャッシュ機能のテスト"""
+    print("🗄️ PDF抽出キャッシュ機能テスト開始...")
+    
+    try:
+        from src.extraction_cache import ExtractionCache, hash_pdf_bytes
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_key = hash_pdf_bytes(b"%PDF-1.4 dummy")
+            cache = ExtractionCache("test", "v1", cache_dir=temp_dir)
+            
+            assert cache.get_text(cache_key) is None
+            cache.put_text(cache_key, "所在地: 東京都新宿区")
+            cache.put_properties(cache_key, [{"address": "東京都新宿区"}])
+            
+            assert cache.get_text(cache_key) == "所在地: 東京都新宿区"
+            assert cache.get_properties(cache_key) == [{"address": "東京都新宿区"}]
+            print(f"✅ キャッシュヒット: {cache.stats()}")
+            
+            # パターン・テキスト形式の変更（バージョン違い）ではテキスト・物件情報とも無効化
+            new_cache = ExtractionCache("test", "v2", cache_dir=temp_dir)
+            assert new_cache.get_properties(cache_key) is None
+            assert new_cache.get_text(cache_key) is None
+            
+            # 新しいバージョンで物件情報だけを保存しても、古いバージョンのテキストは引き継がない
+            new_cache.put_properties(cache_key, [{"address": "東京都渋谷区"}])
+            assert new_cache.get_properties(cache_key) == [{"address": "東京都渋谷区"}]
+            assert new_cache.get_text(cache_key) is None
+            print("✅ バージョン変更による無効化")
+            
+            # サイズ上限を超えたら古いエントリから削除
+            small_cache = ExtractionCache("lru", "v1", cache_dir=temp_dir, max_size_bytes=1)
+            small_cache.put_text("a" * 64, "テキスト")
+            assert small_cache.get_text("a" * 64) is None
+            print("✅ サイズ上限によるLRU削除")
+        
+        print("✅ PDF抽出キャッシュ機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ PDF抽出キャッシュ機能テストエラー: {e}\n")
+        return False
+
+def test_job_manager():
+    """バックグラウンドジョブ管理機能のテスト"""
+    print("⏳ バックグラウンドジョブ管理機能テスト開始...")
+    
+    try:
+        from src.job_manager import JobManager
+        
+        manager = JobManager(max_workers=1)
+        
+        def sample_job(report, value):
+            report("step1", {"value": value})
+            return {"doubled": value * 2}
+        
+        def failing_job(report):
+            raise ValueError("解析失敗")
+        
+        job_id = manager.submit(sample_job, 21)
+        failed_id = manager.submit(failing_job)
+        manager.executor.shutdown(wait=True)
+        
+        job = manager.get(job_id)
+        assert job["status"] == "completed"
+        assert job["steps"] == {"step1": {"value": 21}}
+        assert job["result"] == {"doubled": 42}
+        print("✅ ジョブ完了と途中結果の取得")
+        
+        failed = manager.get(failed_id)
+        assert failed["status"] == "failed"
+        assert "解析失敗" in failed["error"]
+        assert manager.get("unknown") is None
+        print("✅ 失敗ジョブのエラー記録")
+        
+        print("✅ バックグラウンドジョブ管理機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ バックグラウンドジョブ管理機能テストエラー: {e}\n")
+        return False
+
+def test_site_search():
+    """サイト並列検索機能のテスト"""
+    print("🌐 サイト並列検索機能テスト開始...")
+    
+    try:
+        import threading
+        import time
+        from src.site_search import run_site_searches, search_cancelled
+        
+        def slow_search(found, delay):
+            def search():
+                time.sleep(delay)
+                return {'found': found, 'confidence': 0.9 if found else 0.0}
+            return search
+        
+        # 並列実行: 合計ではなく最も遅いサイト程度の時間で完了
+        start = time.time()
+        results = run_site_searches({
+            'ATBB': slow_search(False, 0.3),
+            'ITANDI': slow_search(False, 0.3),
+        })
+        elapsed = time.time() - start
+        assert not results['ATBB']['found'] and not results['ITANDI']['found']
+        assert elapsed < 0.55, elapsed
+        print(f"✅ 並列実行: {elapsed:.2f}秒")
+        
+        # 一方で確認できたら他方を待たずに返す
+        start = time.time()
+        results = run_site_searches({
+            'ATBB': slow_search(True, 0.05),
+            'ITANDI': slow_search(False, 2.0),
+        })
+        assert results['ATBB']['found']
+        assert results['ITANDI']['skipped']
+        assert time.time() - start < 1.0
+        print("✅ 確認済み時の早期終了")
+        
+        # サイトごとのタイムアウト
+        results = run_site_searches({'ATBB': slow_search(False, 2.0)}, timeout=0.1)
+        assert results['ATBB']['timed_out'] and not results['ATBB']['found']
+        print("✅ タイムアウト処理")
+        
+        # 打ち切られた検索は処理の区切りで打ち切りに気づいて終了する
+        stopped = threading.Event()
+        
+        def cooperative_search():
+            for _ in range(200):
+                if search_cancelled():
+                    stopped.set()
+                    return {'found': False}
+                time.sleep(0.01)
+            return {'found': False}
+        
+        run_site_searches({'ATBB': cooperative_search}, timeout=0.05)
+        assert stopped.wait(1.0)
+        print("✅ 打ち切った検索の終了")
+        
+        print("✅ サイト並列検索機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ サイト並列検索機能テストエラー: {e}\n")
+        return False
+
+def test_shared_browser_pool():
+    """常駐ブラウザプールのテスト"""
+    print("🧹 常駐ブラウザプールテスト開始...")
+    
+    try:
+        import asyncio
+        import threading
+        import src.browser_pool as browser_pool
+        
+        class FakePool:
+            created = 0
+            closed = 0
+            
+            def __init__(self):
+                FakePool.created += 1
+            
+            async def start(self):
+                pass
+            
+            async def close(self):
+                FakePool.closed += 1
+        
+        async def use_pool():
+            pool = await browser_pool.get_browser_pool()
+            await asyncio.sleep(0)
+            return pool, threading.current_thread().name
+        
+        async def call():
+            return await browser_pool.in_browser_pool(use_pool())
+        
+        async def concurrent_calls():
+            return await asyncio.gather(call(), call())
+        
+        original_pool_class = browser_pool.BrowserPool
+        browser_pool.BrowserPool = FakePool
+        try:
+            # asyncio.run ごとにループが変わっても、プールは常駐ループで1回だけ起動して使い回す
+            results = [asyncio.run(call()) for _ in range(3)]
+            results.extend(asyncio.run(concurrent_calls()))
+            assert FakePool.created == 1 and FakePool.closed == 0
+            assert len({id(pool) for pool, _ in results}) == 1
+            assert all(thread_name == "browser-pool" for _, thread_name in results)
+            print(f"✅ {len(results)}回の呼び出しでプール起動{FakePool.created}回")
+            
+            # 常駐ループ以外からは使えない
+            try:
+                asyncio.run(browser_pool.get_browser_pool())
+                assert False, "常駐ループ以外からプールを取得できています"
+            except RuntimeError:
+                pass
+            
+            # プロセス終了時（atexit）に1回だけ終了
+            browser_pool.close_browser_pool()
+            assert FakePool.closed == 1 and browser_pool._POOL is None
+        finally:
+            browser_pool.close_browser_pool()
+            browser_pool.BrowserPool = original_pool_class
+        print(f"✅ プール終了: {FakePool.closed}回")
+        
+        print("✅ 常駐ブラウザプールテスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 常駐ブラウザプールテストエラー: {e}\n")
+        return False
+
+def test_rate_limiter():
+    """トークンバケットによるリクエスト間隔制御のテスト"""
+    print("🪣 リクエスト間隔制御テスト開始...")
+    
+    try:
+        import asyncio
+        import time
+        from src.rate_limiter import AdaptiveRateLimiter, TokenBucket
+        
+        async def acquire_many(bucket, count):
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+            return time.monotonic() - start
+        
+        # バースト分は即時、それ以降は rate 個/秒
+        elapsed = asyncio.run(acquire_many(TokenBucket(rate=20, capacity=2), 6))
+        assert 0.15 <= elapsed < 0.5, elapsed
+        print(f"✅ 6リクエスト（20個/秒・バースト2）: {elapsed:.2f}秒")
+        
+        # アクセス制限で減速し、正常応答で回復（上限・下限の範囲内）
+        pacing = {
+            "max_rate": 2.0, "min_rate": 0.1, "throttle_backoff": 0.5,
+            "latency_backoff": 0.8, "latency_factor": 2.0, "recovery_step": 0.5
+        }
+        limiter = AdaptiveRateLimiter("test", pacing)
+        assert limiter.current_rate == 2.0
+        limiter.record_throttle("HTTP 429")
+        assert limiter.current_rate == 1.0
+        limiter.record_response(1.0)
+        assert limiter.current_rate == 1.5
+        limiter.record_response(5.0)  # 平均の2倍超
+        assert abs(limiter.current_rate - 1.2) < 1e-9
+        for _ in range(10):
+            limiter.record_throttle("CAPTCHA")
+        assert limiter.current_rate == 0.1
+        print(f"✅ 自動調整: {limiter.stats()}")
+        
+        print("✅ リクエスト間隔制御テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ リクエスト間隔制御テストエラー: {e}\n")
+        return False
+
+def test_session_store():
+    """ログインセッション保存機能のテスト"""
+    print("🔑 ログインセッション保存機能テスト開始...")
+    
+    try:
+        import json
+        import os
+        import time
+        from src.session_store import SessionStore
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(session_dir=temp_dir, max_age_seconds=60)
+            state = {"cookies": [{"name": "sid", "value": "abc"}], "origins": []}
+            
+            assert store.load("itandi", "user@example.com") is None
+            store.save("itandi", "user@example.com", state)
+            assert store.load("itandi", "user@example.com") == state
+            assert store.load("itandi", "other@example.com") is None
+            print("✅ サイト・アカウントごとの保存と読み込み")
+            
+            # 同じサイトを複数スレッドから同時に保存しても、ファイルはいずれか1件の完全な内容
+            import threading
+            states = [{"cookies": [{"name": f"sid{i}", "value": "x" * 20000}], "origins": []} for i in range(8)]
+            threads = [threading.Thread(target=store.save, args=("ierabu", "user@example.com", state))
+                       for state in states]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            assert store.load("ierabu", "user@example.com") in states
+            assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+            print("✅ 同時保存")
+            
+            # 保存から有効期限を過ぎたセッションは破棄
+            path = store._session_path("itandi", "user@example.com")
+            expired_store = SessionStore(session_dir=temp_dir, max_age_seconds=1)
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["saved_at"] = time.time() - 10
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            assert expired_store.load("itandi", "user@example.com") is None
+            assert not os.path.exists(path)
+            print("✅ 有効期限切れセッションの破棄")
+        
+        print("✅ ログインセッション保存機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ ログインセッション保存機能テストエラー: {e}\n")
+        return False
+
+def test_selector_cache():
+    """セレクタ解決キャッシュ機能のテスト"""
+    print("🎯 セレクタ解決キャッシュ機能テスト開始...")
+    
+    try:
+        from src.selector_cache import SelectorCache
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file = Path(temp_dir) / "selectors.json"
+            candidates = ['#search', '.search-input', 'input[name="keyword"]']
+            
+            cache = SelectorCache("ierabu", cache_file=cache_file)
+            assert cache.order("search_box", candidates) == candidates
+            cache.remember("search_box", 'input[name="keyword"]')
+            SelectorCache("itandi", cache_file=cache_file).remember("search_box", '#search')
+            
+            # 別インスタンス（次回実行）でも成功セレクタが先頭になる
+            reloaded = SelectorCache("ierabu", cache_file=cache_file)
+            assert reloaded.order("search_box", candidates) == ['input[name="keyword"]', '#search', '.search-input']
+            assert SelectorCache("itandi", cache_file=cache_file).order("search_box", candidates)[0] == '#search'
+            print("✅ 成功セレクタの保存と優先")
+            
+            # 候補にないセレクタは無視
+            assert reloaded.order("search_box", ['#other']) == ['#other']
+            print("✅ 候補外キャッシュの無視")
+        
+        print("✅ セレクタ解決キャッシュ機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ セレクタ解決キャッシュ機能テストエラー: {e}\n")
+        return False
+
+def test_resource_blocker():
+    """リソース遮断ルールのテスト"""
+    print("🚫 リソース遮断ルールテスト開始...")
+    
+    try:
+        from src.resource_blocker import ResourceBlocker
+        
+        blocker = ResourceBlocker({
+            "blocked_resource_types": ["image", "font"],
+            "blocked_domains": ["google-analytics.com"],
+            "allowed_domains": ["cdn.itandibb.com"],
+        })
+        
+        assert blocker.should_block("image", "https://itandibb.com/photo.jpg")
+        assert blocker.should_block("script", "https://www.google-analytics.com/analytics.js")
+        assert not blocker.should_block("document", "https://itandibb.com/search")
+        assert not blocker.should_block("image", "https://cdn.itandibb.com/icon.png")
+        assert not blocker.should_block("script", "https://not-google-analytics.com/a.js")
+        print("✅ 種別・ドメインによる判定")
+        
+        disabled = ResourceBlocker({"enabled": False, "blocked_resource_types": ["image"]})
+        assert not disabled.should_block("image", "https://itandibb.com/photo.jpg")
+        print("✅ 無効化設定")
+        
+        print("✅ リソース遮断ルールテスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ リソース遮断ルールテストエラー: {e}\n")
+        return False
+
+def start_itandi_fixture_server():
+    """ITANDI検索APIの代わりに使うローカルのフィクスチャサーバーを起動（(サーバー, ベースURL)を返す）"""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+    
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if "itandi_session=valid" not in self.headers.get("Cookie", ""):
+                self._send(401, {"error": "unauthorized"})
+                return
+            
+            keyword = parse_qs(urlparse(self.path).query).get("keyword", [""])[0]
+            if keyword == "混雑":
+                self._send(429, {"error": "too many requests"})
+            elif keyword == "該当なし":
+                self._send(200, {"rooms": [], "total_count": 0})
+            else:
+                self._send(200, {
+                    "rooms": [{"url": "/rent_rooms/123", "rent": "8.5万円", "status": "募集中"}],
+                    "total_count": 1
+                })
+        
+        def _send(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def test_itandi_api_client():
+    """ITANDI HTTP検索クライアントのテスト（フィクスチャサーバー使用）"""
+    print("🔌 ITANDI HTTP検索クライアントテスト開始...")
+    
+    server = None
+    try:
+        import asyncio
+        from src.itandi_api_client import ITANDIApiClient
+        
+        server, base_url = start_itandi_fixture_server()
+        storage_state = {"cookies": [{"name": "itandi_session", "value": "valid", "domain": "127.0.0.1", "path": "/"}]}
+        client = ITANDIApiClient.from_storage_state(
+            storage_state, search_endpoint=f"{base_url}/api/search", config={"site_url": base_url}
+        )
+        
+        result = client.search("東京都新宿区 1K", "PROP_001")
+        assert result.found and result.availability_status == "vacant"
+        assert result.listing_url == f"{base_url}/rent_rooms/123"
+        assert result.rent_displayed == "8.5万円"
+        print("✅ 検索結果の変換")
+        
+        assert not client.search("該当なし").found
+        assert "429" in client.search("混雑").error_message
+        
+        logged_out = ITANDIApiClient(search_endpoint=f"{base_url}/api/search")
+        assert "セッション" in logged_out.search("東京都新宿区").error_message
+        print("✅ 結果なし・アクセス制限・未ログインの処理")
+        
+        combos = [{"property_id": f"PROP_{i:03d}", "keywords": "東京都新宿区"} for i in range(3)]
+        results = asyncio.run(client.search_many(combos, concurrency=3))
+        assert [r.property_id for r in results] == ["PROP_000", "PROP_001", "PROP_002"]
+        assert all(r.found for r in results)
+        print("✅ 並列検索")
+        
+        print("✅ ITANDI HTTP検索クライアントテスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ ITANDI HTTP検索クライアントテストエラー: {e}\n")
+        return False
+    finally:
+        if server:
+            server.shutdown()
+
+def test_cloud_checker_fanout():
+    """クラウド版物確の並列実行テスト"""
+    print("☁️ クラウド版物確 並列実行テスト開始...")
+    
+    try:
+        import asyncio
+        import time
+        from types import SimpleNamespace
+        from src.cloud_checker import CloudPropertyChecker
+        
+        class SlowCloudChecker(CloudPropertyChecker):
+            """各サイトの検索に0.1秒かかるチェッカー"""
+            def search_itandi(self, property_info):
+                time.sleep(0.1)
+                return super().search_itandi(property_info)
+            
+            def search_ierabu(self, property_info):
+                time.sleep(0.1)
+                return super().search_ierabu(property_info)
+            
+            def search_suumo(self, property_info):
+                time.sleep(0.1)
+                return super().search_suumo(property_info)
+        
+        properties = [
+            SimpleNamespace(
+                property_id=f"PROP_{i:03d}", address="東京都新宿区西新宿1丁目",
+                rent="8.5万円", layout="1K", station_info="新宿駅徒歩5分"
+            )
+            for i in range(12)
+        ]
+        
+        # 逐次なら 12物件 × 3サイト × 0.1秒 = 3.6秒
+        start = time.time()
+        results = SlowCloudChecker().perform_bukkatsu_check(properties)
+        elapsed = time.time() - start
+        assert [r['property_id'] for r in results] == [p.property_id for p in properties]
+        assert set(results[0]) == {'property_id', 'property', 'itandi', 'ierabu', 'suumo', 'overall_found'}
+        assert elapsed < 1.5, elapsed
+        print(f"✅ 12物件×3サイト: {elapsed:.2f}秒（入力順で返却）")
+        
+        # 同じ物件が複数回含まれていても入力順、実行中のイベントループ内からも呼び出せる
+        repeated = [properties[1], properties[0], properties[1]]
+        
+        async def call_in_loop():
+            return CloudPropertyChecker().perform_bukkatsu_check(repeated)
+        
+        results = asyncio.run(call_in_loop())
+        assert [r['property_id'] for r in results] == ['PROP_001', 'PROP_000', 'PROP_001']
+        print("✅ 重複物件・イベントループ内からの呼び出し")
+        
+        print("✅ クラウド版物確 並列実行テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ クラウド版物確 並列実行テストエラー: {e}\n")
+        return False
+
+def test_result_cache():
+    """物確結果キャッシュ機能のテスト"""
+    print("💾 物確結果キャッシュ機能テスト開始...")
+    
+    try:
+        from src.result_cache import SiteResultCache, property_fingerprint
+        from src.real_browser_checker import RealBrowserPropertyChecker
+        
+        # 空白・全角半角の表記ゆれは同じ物件として扱う
+        fingerprint = property_fingerprint({"address": "東京都新宿区 西新宿１－１", "rent": "85,000", "layout": "１ＬＤＫ"})
+        assert fingerprint == property_fingerprint({"address": "東京都新宿区西新宿1-1", "rent": "85000", "layout": "1LDK"})
+        assert fingerprint != property_fingerprint({"address": "東京都新宿区西新宿1-2", "rent": "85000", "layout": "1LDK"})
+        print("✅ 物件識別キーの正規化")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "site_results.sqlite3"
+            cache = SiteResultCache(db_path=db_path, ttl_seconds={"ATBB": 3600, "default": 0}, enabled=True)
+            
+            assert cache.get(fingerprint, "ATBB") is None
+            cache.put(fingerprint, "ATBB", {"found": True, "confidence": 0.9})
+            cached = cache.get(fingerprint, "ATBB")
+            assert cached["found"] is True and cached["cached_at"]
+            print(f"✅ キャッシュヒット: {cached['cached_at']}")
+            
+            # 有効期間切れ・エラー結果は再利用しない
+            cache.put(fingerprint, "ITANDI", {"found": True, "confidence": 0.9})
+            assert cache.get(fingerprint, "ITANDI") is None
+            cache.put(fingerprint, "いえらぶBB", {"found": False, "error": "タイムアウト"})
+            assert cache.get(fingerprint, "いえらぶBB") is None
+            print("✅ 有効期間切れ・エラー結果の除外")
+            
+            # 物確時はキャッシュを優先し、force_refresh では再確認
+            checker = RealBrowserPropertyChecker(result_cache=cache)
+            checker.property_data = {"address": "東京都新宿区西新宿1-1", "rent": "85000", "layout": "1LDK"}
+            checker._check_atbb_real = lambda: {"found": False, "confidence": 0.0}
+            assert checker.check_site("ATBB")["found"] is True
+            
+            checker.force_refresh = True
+            assert checker.check_site("ATBB")["found"] is False
+            assert cache.get(fingerprint, "ATBB")["found"] is False
+            print("✅ force_refresh による再確認")
+            
+            # タイムアウトで打ち切られたサイトの結果は「掲載なし」として保存しない
+            import threading
+            import time
+            from src.site_search import run_site_searches, search_cancelled
+            
+            def wait_until_cancelled(site_name):
+                while not search_cancelled():
+                    time.sleep(0.01)
+                return {"found": False, "confidence": 0.0, "properties": [], "notes": "未確認"}
+            
+            finished = threading.Event()
+            
+            def timed_out_search():
+                try:
+                    return checker.check_site("ITANDI")
+                finally:
+                    finished.set()
+            
+            cache = SiteResultCache(db_path=Path(temp_dir) / "timeout.sqlite3", ttl_seconds={"default": 3600}, enabled=True)
+            checker = RealBrowserPropertyChecker(result_cache=cache)
+            checker.property_data = {"address": "東京都新宿区西新宿1-1", "rent": "85000", "layout": "1LDK"}
+            checker._simulate_real_site_check = wait_until_cancelled
+            results = run_site_searches({"ITANDI": timed_out_search}, timeout=0.05)
+            assert results["ITANDI"]["timed_out"] and finished.wait(2.0)
+            assert cache.get(fingerprint, "ITANDI") is None
+            cache.put(fingerprint, "ITANDI", {"found": False, "skipped": True})
+            assert cache.get(fingerprint, "ITANDI") is None
+            print("✅ 打ち切られた検索結果の除外")
+            
+            # 検索中の例外は error 付きの結果になり、「掲載なし」として保存しない
+            def failing_search(site_name):
+                raise RuntimeError("ログイン失敗")
+            
+            checker._simulate_real_site_check = failing_search
+            result = checker.check_site("ATBB")
+            assert result["found"] is False and result["error"] == "ログイン失敗"
+            assert cache.get(fingerprint, "ATBB") is None
+            print("✅ 検索エラー結果の除外")
+        
+        print("✅ 物確結果キャッシュ機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 物確結果キャッシュ機能テストエラー: {e}\n")
+        return False
+
+def test_single_flight():
+    """同時実行重複排除機能のテスト"""
+    print("🔗 同時実行重複排除機能テスト開始...")
+    
+    try:
+        import threading
+        import time
+        from src.single_flight import SingleFlight
+        
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_check():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"found": True}
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow_check))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while flight._calls["key"].waiters < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        assert len(calls) == 1
+        assert len(results) == 5 and all(result == {"found": True} for result, _ in results)
+        assert sum(1 for _, shared in results if shared) == 4
+        assert flight.in_flight() == 0
+        print(f"✅ 5件の同時呼び出しで実行は{len(calls)}回")
+        
+        # 完了後は新たに実行し、例外は呼び出し側に送出
+        def failing_check():
+            raise RuntimeError("ログイン失敗")
+        
+        try:
+            flight.do("key", failing_check)
+            assert False, "例外が送出されていません"
+        except RuntimeError:
+            pass
+        assert flight.do("key", lambda: {"found": False}) == ({"found": False}, False)
+        print("✅ 完了後の再実行・例外の送出")
+        
+        print("✅ 同時実行重複排除機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 同時実行重複排除機能テストエラー: {e}\n")
+        return False
+
+def test_batch_processor():
+    """一括物確機能のテスト"""
+    print("📦 一括物確機能テスト開始...")
+    
+    try:
+        import zipfile
+        from src.batch_processor import BatchLimitError, BatchProcessor, expand_batch_uploads
+        
+        # zip内のPDFを展開し、PDF以外は除外
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("day/b.pdf", b"%PDF-b")
+            zf.writestr("day/memo.txt", "メモ")
+        pdfs, skipped = expand_batch_uploads([("a.pdf", b"%PDF-a"), ("day.zip", archive.getvalue()), ("x.doc", b"")])
+        assert [name for name, _ in pdfs] == ["a.pdf", "day.zip/b.pdf"]
+        assert len(skipped) == 2
+        print(f"✅ アップロード展開: PDF {len(pdfs)}件・除外 {len(skipped)}件")
+        
+        # PDF数・合計サイズの上限は展開しながら確認
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for index in range(5):
+                zf.writestr(f"p{index}.pdf", b"%PDF" + b"0" * 1000)
+        for limits in ({"max_files": 3}, {"max_total_bytes": 2500}):
+            try:
+                expand_batch_uploads([("many.zip", archive.getvalue())], **limits)
+                assert False, f"上限超過が検出されていません: {limits}"
+            except BatchLimitError as e:
+                print(f"✅ 上限超過を検出: {e}")
+        
+        # a.pdf と b.pdf に同じ物件が掲載されている場合は1回だけ物確
+        extracted = {
+            "a.pdf": [{"address": "東京都新宿区西新宿1-1", "rent": "85000", "layout": "1LDK"},
+                      {"address": "東京都渋谷区渋谷2-2", "rent": "120000", "layout": "2LDK"}],
+            "day.zip/b.pdf": [{"address": "東京都新宿区 西新宿１－１", "rent": "85,000", "layout": "1LDK"},
+                              {"address": "住所不明", "rent": "要相談", "layout": "間取り不明"},
+                              {"address": "住所不明", "rent": "要相談", "layout": "間取り不明"}],
+        }
+        checked_addresses = []
+        
+        def fake_extract(file_name, pdf_bytes):
+            return {"file": file_name, "success": True, "properties": extracted[file_name], "error": None}
+        
+        def fake_check(property_data):
+            checked_addresses.append(property_data["address"])
+            return {"ATBB": {"found": "渋谷" in property_data["address"]}, "ITANDI": {"found": False}}
+        
+        processor = BatchProcessor(fake_check, extract=fake_extract, extract_workers=1, check_concurrency=2)
+        events = list(processor.run(pdfs))
+        
+        assert events[-1]["event"] == "done"
+        summary = events[-1]["summary"]
+        # 抽出できなかった物件（住所不明など）は重複扱いせず個別に物確
+        assert summary["properties"] == 5 and summary["unique_properties"] == 4 and summary["duplicates"] == 1
+        assert summary["checked"] == 4 and summary["found"] == 1
+        assert len(checked_addresses) == 4
+        placeholder_keys = [event["fingerprint"] for event in events
+                            if event["event"] == "checked" and event["property"]["address"] == "住所不明"]
+        assert sorted(placeholder_keys) == ["day.zip/b.pdf#1", "day.zip/b.pdf#2"]
+        assert sum(1 for event in events if event["event"] == "extracted") == 2
+        print(f"✅ 重複除外・物確: {summary}")
+        
+        print("✅ 一括物確機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 一括物確機能テストエラー: {e}\n")
+        return False
+
 def test_property_extractor():
     """物件情報抽出・正規化機能のテスト"""
     print("🔧 物件情報抽出・正規化機能テスト開始...")
@@ -101,6 +1028,172 @@ def test_property_extractor():
         print(f"❌ 物件情報抽出・正規化機能テストエラー: {e}\n")
         return False
 
+def test_property_table():
+    """列指向物件テーブル機能のテスト"""
+    print("🧮 列指向物件テーブル機能テスト開始...")
+    
+    try:
+        from src.property_table import PropertyTable
+        from src.property_extractor import PropertyExtractor
+        from src.report_generator import ReportGenerator
+        
+        raw_properties = [
+            {'property_number': f'P-{i:03d}', 'address': f'東京都{city}1-{i}', 'rent': '12.5万円',
+             'layout': layout, 'station': 'JR山手線「新宿」駅', 'source_file': 'test.pdf', 'raw_text': 'テキスト' * 100}
+            for i, (city, layout) in enumerate([('新宿区歌舞伎町', '1K'), ('渋谷区神南', '2LDK'), ('新宿区西新宿', '1K')])
+        ]
+        raw_properties.append({'property_number': 'P-999', 'address': '', 'rent': '', 'layout': '', 'station': ''})
+        
+        # raw_text は保持せず、間取り・市区町村などはカテゴリ型
+        table = PropertyTable.from_records(raw_properties)
+        assert len(table) == 4 and 'raw_text' not in table.columns
+        assert str(table.column('layout').dtype) == 'category'
+        assert len(table.where(city='東京都新宿区', layout='1K')) == 2
+        print(f"✅ テーブル作成: {len(table)}件 {table.memory_usage()}バイト")
+        
+        # 正規化・有効物件の絞り込み・検索組み合わせ
+        extractor = PropertyExtractor()
+        normalized = extractor.normalize_table(table)
+        valid = extractor.filter_valid_properties(normalized)
+        assert len(valid) == 3
+        assert valid.records()[0]['property_id'] == 'P-000'
+        assert extractor.create_search_combinations(valid)
+        print(f"✅ 正規化・絞り込み: {len(valid)}件")
+        
+        # レポート生成
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_files = ReportGenerator(temp_dir).generate_comprehensive_report(valid, [], [])
+            csv_text = Path(report_files['csv']).read_text(encoding='utf-8-sig')
+            assert csv_text.count('\n') == 4
+            print(f"✅ レポート生成: {len(report_files)}種類")
+        
+        print("✅ 列指向物件テーブル機能テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 列指向物件テーブル機能テストエラー: {e}\n")
+        return False
+
+def test_batch_normalization():
+    """列単位の一括正規化のテスト"""
+    print("⚡ 列単位の一括正規化テスト開始...")
+    
+    try:
+        import time
+        from dataclasses import asdict
+        from src.property_extractor import PropertyExtractor
+        
+        samples = [
+            {'property_number': 'P-001', 'address': '東京都新宿区 西新宿1ー1（ビル名）', 'rent': '85,000円',
+             'layout': '１ｌｄｋ', 'area': '約25.5m2', 'station': 'JR山手線「新宿」駅前徒歩5分', 'source_file': 'abc.pdf'},
+            {'address': '東京都渋谷区神南1−2番地 101号室', 'rent': '12.5万円', 'layout': ' 2dk ', 'area': '広い',
+             'station': '『渋谷』駅徒歩3分', 'source_file': 'xyz.pdf'},
+            {'address': '', 'rent': '', 'layout': '', 'station': ''},
+        ]
+        raw_properties = [dict(samples[i % len(samples)]) for i in range(30000)]
+        
+        extractor = PropertyExtractor()
+        start = time.time()
+        expected = extractor.normalize_properties(raw_properties)
+        loop_seconds = time.time() - start
+        
+        start = time.time()
+        table = extractor.normalize_table(raw_properties)
+        table_seconds = time.time() - start
+        
+        # 1件ずつ正規化した結果と一致（raw_text・city 列を除く）
+        assert [
+            {key: value for key, value in record.items() if key != 'city'} for record in table.records()
+        ] == [
+            {key: value for key, value in asdict(prop).items() if key != 'raw_text'} for prop in expected
+        ]
+        assert table.records()[0]['layout'] == '1LDK'
+        print(f"✅ {len(table)}件: 1件ずつ {loop_seconds:.2f}秒 / 列単位 {table_seconds:.2f}秒")
+        
+        print("✅ 列単位の一括正規化テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 列単位の一括正規化テストエラー: {e}\n")
+        return False
+
+def test_address_normalizer():
+    """住所正規化（LRUキャッシュ）のテスト"""
+    print("🏠 住所正規化テスト開始...")
+    
+    try:
+        from src.address_normalizer import AddressNormalizer, CanonicalAddress
+        
+        normalizer = AddressNormalizer(cache_size=3)
+        
+        # 表記ゆれ（全角・空白・括弧書き・番地表記・丁目の漢数字）は同じ正規形
+        variants = [
+            '東京都新宿区西新宿１丁目１番１号（新宿ビル）',
+            '東京都新宿区 西新宿1-1-1',
+            '東京都新宿区西新宿一丁目1ー1 101号室',
+        ]
+        expected = CanonicalAddress('東京都', '新宿区', '西新宿', '1', '1-1')
+        for address in variants:
+            assert normalizer.canonicalize(address) == expected, address
+        assert expected.text == '東京都新宿区西新宿1-1-1'
+        
+        # 政令市の区・郡部の町村
+        assert normalizer.canonicalize('神奈川県横浜市西区みなとみらい2-3-5').city == '横浜市西区'
+        assert normalizer.canonicalize('埼玉県北足立郡伊奈町小室1234') == \
+            CanonicalAddress('埼玉県', '北足立郡伊奈町', '小室', '', '1234')
+        
+        # 2回目以降はキャッシュから返し、件数は上限まで（古い住所から追い出す）
+        normalizer.canonicalize('神奈川県横浜市西区みなとみらい2-3-5')
+        stats = normalizer.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 5, stats
+        assert stats['size'] == 3 and stats['max_size'] == 3
+        print(f"✅ キャッシュ: ヒット {stats['hits']}件 / ミス {stats['misses']}件")
+        
+        print("✅ 住所正規化テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 住所正規化テストエラー: {e}\n")
+        return False
+
+def test_gazetteer():
+    """住所辞書（トライ木の最長一致）のテスト"""
+    print("🗾 住所辞書テスト開始...")
+    
+    try:
+        from src.gazetteer import Gazetteer, load_gazetteer
+        from src.address_normalizer import parse_address
+        from src.property_extractor import PropertyInfo
+        
+        gazetteer = Gazetteer([('東京都', '府中市'), ('広島県', '府中市'), ('神奈川県', '横浜市'),
+                               ('神奈川県', '横浜市保土ケ谷区'), ('埼玉県', '北足立郡伊奈町')])
+        assert gazetteer.match_prefecture('神奈川県横浜市') == ('神奈川県', 4)
+        # 政令市は区まで最長一致、ヶ・ケの表記ゆれは同じ文字として照合
+        assert gazetteer.match_city('横浜市保土ヶ谷区岩井町', prefecture='神奈川県') == ('横浜市保土ケ谷区', 8)
+        assert gazetteer.match_city('横浜市中区', prefecture='神奈川県') == ('横浜市', 3)
+        # 郡名を省いた町村は都道府県が分かる場合のみ照合
+        assert gazetteer.match_city('伊奈町小室', prefecture='埼玉県') == ('北足立郡伊奈町', 3)
+        assert gazetteer.match_city('伊奈町小室') == ('', 0)
+        
+        # 同梱の辞書: 名前に市・町・村を含む市も正しく区切る
+        assert len(load_gazetteer().prefectures) == 47
+        assert parse_address('三重県四日市市諏訪町1-5').city == '四日市市'
+        assert parse_address('東京都東村山市本町2丁目3-4').city == '東村山市'
+        assert parse_address('奈良県大和郡山市北郡山町').city == '大和郡山市'
+        # 辞書にない市区町村は表記から推定
+        assert parse_address('北海道北見市北1条西2丁目').city == '北見市'
+        
+        keywords = PropertyInfo.from_record({'address': '東京都新宿区歌舞伎町1-1-1'}).to_search_keywords()
+        assert keywords == ['東京都新宿区', '新宿区歌舞伎町'], keywords
+        print(f"✅ 検索キーワード: {keywords}")
+        
+        print("✅ 住所辞書テスト完了\n")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 住所辞書テストエラー: {e}\n")
+        return False
+
 def test_credentials():
     """ログイン情報管理機能のテスト"""
     print("🔑 ログイン情報管理機能テスト開始...")
@@ -220,7 +1313,28 @@ def main():
     
     # 各機能のテスト
     test_results.append(test_pdf_analyzer())
+    test_results.append(test_streaming_extraction())
+    test_results.append(test_parallel_pdf_analysis())
+    test_results.append(test_property_splitting())
+    test_results.append(test_layout_extraction())
+    test_results.append(test_extraction_cache())
+    test_results.append(test_job_manager())
+    test_results.append(test_site_search())
+    test_results.append(test_shared_browser_pool())
+    test_results.append(test_rate_limiter())
+    test_results.append(test_session_store())
+    test_results.append(test_selector_cache())
+    test_results.append(test_resource_blocker())
+    test_results.append(test_itandi_api_client())
+    test_results.append(test_cloud_checker_fanout())
+    test_results.append(test_result_cache())
+    test_results.append(test_single_flight())
+    test_results.append(test_batch_processor())
     test_results.append(test_property_extractor())
+    test_results.append(test_property_table())
+    test_results.append(test_batch_normalization())
+    test_results.append(test_address_normalizer())
+    test_results.append(test_gazetteer())
     test_results.append(test_credentials())
     test_results.append(test_report_generator())
     